@@ -0,0 +1,248 @@
+# Алгоритмы над diktyonphi.Graph без рекурсии: работают и на очень глубоких графах.
+from collections import deque
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional
+
+from diktyonphi import Graph, GraphType
+
+_DONE = object()
+
+
+def iter_simple_paths(g: Graph, start_id: Hashable, end_id: Hashable,
+                      max_depth: Optional[int] = None, max_paths: Optional[int] = None,
+                      cutoff: Optional[Callable[[List[Hashable]], bool]] = None,
+                      avoid: Optional[Iterable[Hashable]] = None) -> Iterator[List[Hashable]]:
+    """
+    Lazily yield all simple paths (no repeated node) from start_id to end_id.
+
+    Depth-first search with an explicit stack of neighbour iterators and a set
+    of nodes on the current path, so there is no recursion limit, no copying of
+    the path on every step and membership checks are O(1). Paths are produced
+    one at a time; stop iterating to stop the search.
+
+    :param g: Graph (or anything with the same node()/neighbor_ids interface).
+    :param start_id: ID of the first node.
+    :param end_id: ID of the last node.
+    :param max_depth: Maximum number of edges in a path.
+    :param max_paths: Stop after this many paths.
+    :param cutoff: Called with the current path (do not modify it) whenever it is
+        extended by a node, end_id included; returning True stops exploring from
+        that node (for end_id: the path is not yielded).
+    :param avoid: IDs of nodes no path may enter (e.g. an already walked
+        prefix), the search never steps on them; start_id is not checked.
+    :return: Iterator of paths, every path a new list of node IDs.
+    """
+    if max_paths is not None and max_paths <= 0:
+        return
+    if start_id == end_id:
+        yield [start_id]
+        return
+    if start_id not in g:
+        return
+
+    path = [start_id]
+    # запрещённые узлы просто лежат во множестве пути с самого начала
+    on_path = {start_id}
+    if avoid is not None:
+        on_path.update(avoid)
+    stack = [iter(g.node(start_id).neighbor_ids)]
+    found = 0
+    while stack:
+        neighbor = next(stack[-1], _DONE)
+        if neighbor is _DONE:
+            # все соседи последнего узла просмотрены -> возвращаемся на шаг назад
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+        if neighbor in on_path:
+            continue
+        if neighbor == end_id:
+            # путь до конца имеет len(path) рёбер: глубину и cutoff проверяем и для последнего узла
+            if max_depth is not None and len(path) > max_depth:
+                continue
+            result = path + [neighbor]
+            if cutoff is not None and cutoff(result):
+                continue
+            yield result
+            found += 1
+            if max_paths is not None and found >= max_paths:
+                return
+            continue
+        path.append(neighbor)
+        on_path.add(neighbor)
+        # глубина len(path) - 1 уже максимальная или пользователь отсёк ветку -> не идём дальше
+        if (max_depth is not None and len(path) > max_depth) or (cutoff is not None and cutoff(path)):
+            on_path.discard(path.pop())
+            continue
+        stack.append(iter(g.node(neighbor).neighbor_ids))
+
+
+def find_cycle(g: Graph) -> Optional[List[Hashable]]:
+    """
+    Find a cycle with an iterative depth-first search in O(V + E).
+
+    In a directed graph the cycle follows edge directions. In an undirected
+    graph going back over the edge just used does not count, so a cycle needs
+    at least three nodes (or a self-loop).
+
+    :return: Nodes of one cycle ``[v0, v1, ..., vk]`` (with an edge vk -> v0),
+        or None if the graph is acyclic.
+    """
+    undirected = g.type == GraphType.UNDIRECTED
+    # узел в on_stack -> его позиция в path (текущая ветка обхода, "серые" узлы)
+    on_stack: Dict[Hashable, int] = {}
+    finished = set()
+    for root in g.node_ids():
+        if root in finished:
+            continue
+        path = [root]
+        on_stack[root] = 0
+        stack = [iter(g.node(root).neighbor_ids)]
+        while stack:
+            neighbor = next(stack[-1], _DONE)
+            node_id = path[-1]
+            if neighbor is _DONE:
+                stack.pop()
+                finished.add(node_id)
+                del on_stack[path.pop()]
+                continue
+            if neighbor in on_stack:
+                # в неориентированном графе ребро назад к родителю - это не цикл
+                if undirected and len(path) > 1 and neighbor == path[-2]:
+                    continue
+                return path[on_stack[neighbor]:]
+            if neighbor in finished:
+                continue
+            on_stack[neighbor] = len(path)
+            path.append(neighbor)
+            stack.append(iter(g.node(neighbor).neighbor_ids))
+    return None
+
+
+def topological_sort(g: Graph) -> List[Hashable]:
+    """
+    Order the nodes of a directed acyclic graph so every edge goes forward (Kahn's algorithm, O(V + E)).
+
+    In-degrees come from the graph's predecessor index.
+
+    :return: Node IDs in topological order.
+    :raises ValueError: If the graph is undirected or has a cycle (the message shows one).
+    """
+    if g.type != GraphType.DIRECTED:
+        raise ValueError("Topological order is defined only for directed graphs")
+    in_degree = {}
+    ready = deque()
+    for node in g:
+        in_degree[node.id] = node.in_degree
+        if node.in_degree == 0:
+            ready.append(node.id)
+    order = []
+    while ready:
+        node_id = ready.popleft()
+        order.append(node_id)
+        for neighbor in g.node(node_id).neighbor_ids:
+            in_degree[neighbor] -= 1
+            if in_degree[neighbor] == 0:
+                ready.append(neighbor)
+    if len(order) < len(in_degree):
+        raise ValueError(f"Graph has a cycle: {find_cycle(g)}")
+    return order
+
+
+def strongly_connected_components(g: Graph) -> List[List[Hashable]]:
+    """
+    Strongly connected components by Tarjan's algorithm, iterative, O(V + E).
+
+    For an undirected graph these are its connected components.
+
+    :return: List of components (lists of node IDs) in reverse topological
+        order of the condensation (a component comes before the ones that reach it).
+    """
+    index: Dict[Hashable, int] = {}
+    low: Dict[Hashable, int] = {}
+    on_stack = set()
+    stack: List[Hashable] = []
+    components = []
+    for root in g.node_ids():
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(g.node(root).neighbor_ids))]
+        while work:
+            node_id, neighbors = work[-1]
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    index[neighbor] = low[neighbor] = len(index)
+                    stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    # "рекурсивный вызов": кладём соседа на вершину и продолжим с ним
+                    work.append((neighbor, iter(g.node(neighbor).neighbor_ids)))
+                    break
+                if neighbor in on_stack:
+                    low[node_id] = min(low[node_id], index[neighbor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node_id])
+                if low[node_id] == index[node_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node_id:
+                            break
+                    components.append(component)
+    return components
+
+
+def kosaraju_components(g: Graph) -> List[List[Hashable]]:
+    """
+    Strongly connected components by Kosaraju's algorithm, iterative, O(V + E).
+
+    The second pass runs over a ReversedView, so the transposed graph costs no
+    extra memory. Gives the same components as strongly_connected_components().
+
+    :return: List of components (lists of node IDs) in topological order of the condensation.
+    """
+    from views import ReversedView
+
+    # 1. порядок завершения DFS по исходному графу
+    finished: List[Hashable] = []
+    seen = set()
+    for root in g.node_ids():
+        if root in seen:
+            continue
+        seen.add(root)
+        path = [root]
+        stack = [iter(g.node(root).neighbor_ids)]
+        while stack:
+            neighbor = next(stack[-1], _DONE)
+            if neighbor is _DONE:
+                stack.pop()
+                finished.append(path.pop())
+            elif neighbor not in seen:
+                seen.add(neighbor)
+                path.append(neighbor)
+                stack.append(iter(g.node(neighbor).neighbor_ids))
+
+    # 2. обход обращённого графа в обратном порядке завершения
+    reverse = ReversedView(g)
+    assigned = set()
+    components = []
+    for root in reversed(finished):
+        if root in assigned:
+            continue
+        assigned.add(root)
+        component = [root]
+        stack = [root]
+        while stack:
+            for neighbor in reverse.node(stack.pop()).neighbor_ids:
+                if neighbor not in assigned:
+                    assigned.add(neighbor)
+                    component.append(neighbor)
+                    stack.append(neighbor)
+        components.append(component)
+    return components
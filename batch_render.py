@@ -0,0 +1,55 @@
+# Пакетный рендер многих графов: ограниченное число одновременных процессов dot и таймауты.
+import asyncio
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+from diktyonphi import Graph
+
+
+class RenderResult(NamedTuple):
+    """Outcome of rendering one graph of a batch: either ``data`` or ``error`` is set."""
+    graph: Graph
+    data: Optional[bytes]
+    error: Optional[BaseException]
+
+
+async def render_many_async(graphs: Iterable[Graph], fmt: str = "svg", engine: str = "dot",
+                            max_concurrency: int = 4, timeout: Optional[float] = 60.0,
+                            filenames: Optional[Sequence[str]] = None) -> List[RenderResult]:
+    """
+    Render many graphs with at most ``max_concurrency`` Graphviz processes at a time.
+
+    One failing or timed-out graph does not stop the others; its error is
+    returned in its RenderResult instead.
+
+    :param graphs: Graphs to render.
+    :param fmt: Graphviz output format.
+    :param engine: Layout engine.
+    :param max_concurrency: Maximum number of Graphviz processes running at once.
+    :param timeout: Seconds per graph before its process is killed, None for no limit.
+    :param filenames: Optional output file per graph (same order); images are also returned.
+    :return: RenderResult for every graph, in input order.
+    """
+    graphs = list(graphs)
+    if filenames is not None and len(filenames) != len(graphs):
+        raise ValueError("filenames must have one entry per graph")
+    limit = asyncio.Semaphore(max_concurrency)
+
+    async def one(i: int, g: Graph) -> RenderResult:
+        async with limit:
+            try:
+                data = await g.render_async(fmt, engine, timeout=timeout)
+                if filenames is not None:
+                    with open(filenames[i], "wb") as f:
+                        f.write(data)
+                return RenderResult(g, data, None)
+            except Exception as e:
+                return RenderResult(g, None, e)
+
+    return await asyncio.gather(*(one(i, g) for i, g in enumerate(graphs)))
+
+
+def render_many(graphs: Iterable[Graph], fmt: str = "svg", engine: str = "dot",
+                max_concurrency: int = 4, timeout: Optional[float] = 60.0,
+                filenames: Optional[Sequence[str]] = None) -> List[RenderResult]:
+    """Blocking wrapper around render_many_async (for code without an event loop)."""
+    return asyncio.run(render_many_async(graphs, fmt, engine, max_concurrency, timeout, filenames))
@@ -1,4 +1,5 @@
 from colorize import ColorGraph, GraphType, load_preprocessing, make_graph, colorize, first_not_used
+from loaders import load_adjacency_json
 
 '''Направленная версия грфа со странами
 Мы здесь ничего не импортируем с главного файла, потому что в колорайз уже импортировано все из него.'''
@@ -12,10 +13,8 @@ def my_set_node_color(g, node_id):
     neighbors_colors += [g.node(n)["color"] for n in g.node(node_id).neighbor_ids]
 
     # Цвета соседей, у которых есть ребро к node_id (обратное направление)
-    # просто типа смотрим соседи ли, если да, то добавляем его в список neighbors_colors и красим
-    for other_node_id in g.node_ids():
-        if node_id in g.node(other_node_id).neighbor_ids:
-            neighbors_colors.append(g.node(other_node_id)["color"])
+    # граф сам хранит входящие рёбра, так что не нужно перебирать все узлы - O(in-degree) вместо O(V)
+    neighbors_colors += [g.node(n)["color"] for n in g.node(node_id).predecessor_ids]
 
     # Убираем None (ещё не раскрашенных)
     # Создаётся новый список, в который войдут только те элементы из neighbors_colors, которые НЕ равны None
@@ -30,20 +29,8 @@ import colorize
 colorize.set_node_color = my_set_node_color
 
 if __name__ == "__main__":
-    # Загружаем данные из json (без изменений)
-    data = load_preprocessing("eu_sousede.json")
-
-    # Создаём направленный граф
-    g = ColorGraph(GraphType.DIRECTED)
-
-    # Добавляем узлы и ребра из данных
-    for state in data.keys():
-        node = g.add_node(state)
-        node["color"] = None
-    for state in data.keys():
-        for neighbor in data[state]:
-            if not g.node(state).is_edge_to(neighbor):
-                g.add_edge(state, neighbor)
+    # Загружаем json потоком сразу в направленный граф (узлы сразу с color = None)
+    g = load_adjacency_json("eu_sousede.json", ColorGraph(GraphType.DIRECTED), {"color": None})
 
     # Раскрашиваем граф с учётом новой функции set_node_color
     colorize.colorize(g)
@@ -16,10 +16,8 @@ def my_set_node_color(g, node_id):
     # Исходящие рёбра (соседи, на которых указывает node_id)
     neighbors_colors += [g.node(n)["color"] for n in g.node(node_id).neighbor_ids]
 
-    # Входящие рёбра (соседи, у которых есть ребро к node_id)
-    for other_node_id in g.node_ids():
-        if node_id in g.node(other_node_id).neighbor_ids:
-            neighbors_colors.append(g.node(other_node_id)["color"])
+    # Входящие рёбра (соседи, у которых есть ребро к node_id) - берём из обратного индекса графа
+    neighbors_colors += [g.node(n)["color"] for n in g.node(node_id).predecessor_ids]
 
     neighbors_colors = [c for c in neighbors_colors if c is not None]
     g.node(node_id)["color"] = first_not_used(neighbors_colors)
@@ -1,9 +1,16 @@
 # Импорт аннотаций типов, встроенная хуйня
-from typing import Dict, List, Iterable
+from typing import Any, Callable, Dict, Hashable, List, Iterable, Iterator, NamedTuple, Optional, Set, Tuple
+from array import array
+from collections import deque
+import enum
+import heapq
 # Импорт графа и его типа из другого файла
-from diktyonphi import Graph, GraphType
+from diktyonphi import DuplicatePolicy, Graph, GraphType, Node
 # Импорт работы с JSON-форматом
 import json
+# потоковая загрузка графа из файла
+from loaders import load_adjacency_json
+from compact import CompactGraph, edge_arrays
 
 # Класс ColorGraph наследуется от базового класса Graph
 # и добавляет функциональность для раскрашивания узлов графа при визуализации в формате DOT
@@ -17,41 +24,129 @@ class ColorGraph(Graph):
         типа "Прежде чем делать свою инициализацию в классе ColorGraph, сначала выполни стандартную инициализацию из родительского класса Graph"
         типа нам в этой строке нужно именно создание типа графа'''
         super().__init__(type)
-    
+        # узлы, которые появились или получили новое ребро после последней раскраски
+        # (dict вместо set, чтобы сохранить порядок добавления)
+        self._dirty: Dict[Hashable, None] = {}
+
+    @staticmethod
+    def color_name(color: int) -> str:
+        """
+        Graphviz colour of colour number ``color``: the PALETTE entry, and past
+        the palette an HSV colour with its own hue, so two different numbers
+        never render the same.
+        """
+        if 0 <= color < len(ColorGraph.PALETTE):
+            return ColorGraph.PALETTE[color]
+        # шаг по золотому сечению раскидывает оттенки равномерно и не повторяется
+        hue = (color * 0.618033988749895) % 1.0
+        return f"{hue:.6f} 0.600 0.950"
+
+    def _create_node(self, node_id: Hashable, attrs: Optional[Dict[str, Any]] = None) -> Node:
+        node = super()._create_node(node_id, attrs)
+        self._dirty[node_id] = None
+        return node
+
+    def _put_edge(self, src_id: Hashable, target_id: Hashable, attrs: Dict[str, Any]) -> None:
+        super()._put_edge(src_id, target_id, attrs)
+        self._dirty[src_id] = None
+        self._dirty[target_id] = None
+
+    def _drop_node(self, node_id: Hashable) -> None:
+        # удалённый узел перекрашивать не нужно (удаление рёбер конфликтов не создаёт)
+        super()._drop_node(node_id)
+        self._dirty.pop(node_id, None)
+
+    def _color_of(self, node_id: Hashable) -> Any:
+        return self.node(node_id)._attrs.get("color")
 
-    def to_dot(self, label_attr:str ="label", weight_attr:str = "weight") -> str:
-        #TODO převezmete kód z Graph a změníte
-        # lines.append(f'    "{node_id}" [label="{label}"];')
-        lines = []
-        name = "G"
-        connector = "->" if self.type == GraphType.DIRECTED else "--"
-
-        lines.append(f'digraph {name} {{' if self.type == GraphType.DIRECTED else f'graph {name} {{')
-
-        # Nodes
-        for node_id in self.node_ids():
-            node = self.node(node_id)
-            label = node[label_attr] if label_attr in node._attrs else str(node_id)
-            # THERE IS THE CHANGES !!!!!!!!!!!!!!!
-            # Цвет заливки узла. Берётся из палитры PALETTE по индексу node['color'].
-            # Например, если node['color'] = 1 → PALETTE[1] = "red".
-            lines.append(f'''    "{node_id}" [label="{label}",style=filled, 
-                                 fillcolor={ColorGraph.PALETTE[node['color']]}];''')
-
-        # Edges
-        seen = set()
-        for node_id in self.node_ids():
-            node = self.node(node_id)
-            for dst_id in node.neighbor_ids:
-                if self.type == GraphType.UNDIRECTED and (dst_id, node_id) in seen:
+    def _kempe_recolor(self, node_id: Hashable, max_chain: int) -> Optional[Set[Hashable]]:
+        """
+        Try to give node_id one of the colours already used around it by
+        swapping a two-colour (Kempe) chain. node_id must be uncoloured.
+
+        :return: Nodes whose colour changed (including node_id), or None if no swap works.
+        """
+        by_color: Dict[Any, List[Hashable]] = {}
+        for neighbour in self.node(node_id).all_neighbor_ids:
+            if neighbour != node_id:
+                by_color.setdefault(self._color_of(neighbour), []).append(neighbour)
+        by_color.pop(None, None)
+        for a in sorted(by_color):
+            for b in sorted(by_color):
+                if a == b:
+                    continue
+                # компонента подграфа из цветов a и b, в которой лежат a-соседи узла
+                chain = set(by_color[a])
+                queue = deque(chain)
+                while queue and len(chain) <= max_chain:
+                    current = queue.popleft()
+                    for other in self.node(current).all_neighbor_ids:
+                        if other not in chain and other != node_id and self._color_of(other) in (a, b):
+                            chain.add(other)
+                            queue.append(other)
+                # если в цепочку попал b-сосед, после обмена он станет a -> не подходит
+                if len(chain) > max_chain or any(n in chain for n in by_color[b]):
                     continue
-                seen.add((node_id, dst_id))
-                edge = node.to(dst_id)
-                label = edge[weight_attr] if weight_attr in edge._attrs else ""
-                lines.append(f'    "{node_id}" {connector} "{dst_id}" [label="{label}"];')
+                for current in chain:
+                    current_node = self.node(current)
+                    current_node["color"] = b if current_node["color"] == a else a
+                self.node(node_id)["color"] = a
+                return chain | {node_id}
+        return None
+
+    def recolor(self, max_chain: int = 1000) -> Set[Hashable]:
+        """
+        Repair the colouring after nodes/edges were added, touching only the
+        nodes involved (new nodes and endpoints of new edges).
+
+        An uncoloured node, or a node in conflict with a neighbour, gets the
+        smallest free colour. Only if that colour is not used anywhere in the
+        graph yet, a Kempe chain swap is tried first so the number of colours
+        stays the same. The rest of the colouring is left as it is.
+
+        :param max_chain: Largest Kempe chain that is still swapped.
+        :return: Set of node IDs whose colour changed.
+        """
+        changed: Set[Hashable] = set()
+        dirty, self._dirty = self._dirty, {}
+        # цвета, которые уже есть в графе (собираются один раз, только если понадобятся)
+        used: Optional[Set[Any]] = None
+        for node_id in dirty:
+            if node_id not in self:
+                continue
+            color = self._color_of(node_id)
+            neighbour_colors = [self._color_of(n) for n in self.node(node_id).all_neighbor_ids
+                                if n != node_id]
+            if color is not None and color not in neighbour_colors:
+                continue
+            self.node(node_id)["color"] = None
+            free = first_not_used(neighbour_colors)
+            if used is None:
+                used = {self._color_of(n) for n in self.node_ids()}
+            # цвет, которого в графе ещё нет -> сначала пробуем обойтись имеющимися (Kempe swap);
+            # уже используемый цвет просто берём, соседей не трогаем
+            swapped = None
+            if free not in used:
+                swapped = self._kempe_recolor(node_id, max_chain)
+            if swapped is None:
+                self.node(node_id)["color"] = free
+                used.add(free)
+                swapped = {node_id}
+            changed |= {n for n in swapped if n != node_id} | (
+                {node_id} if self._color_of(node_id) != color else set())
+        return changed
 
-        lines.append("}")
-        return "\n".join(lines)
+    def dot_node_attrs(self, node: Node, label_attr: str = "label") -> Dict[str, Any]:
+        # THERE IS THE CHANGES !!!!!!!!!!!!!!!
+        # вместо копии всего to_dot переопределяем только стиль узла
+        # Цвет заливки узла. Берётся из палитры PALETTE по индексу node['color'].
+        # Например, если node['color'] = 1 → PALETTE[1] = "red"; дальше палитры - см. color_name.
+        attrs = super().dot_node_attrs(node, label_attr)
+        color = node._attrs.get("color")
+        if color is not None:
+            attrs["style"] = "filled"
+            attrs["fillcolor"] = ColorGraph.color_name(color) if isinstance(color, int) else color
+        return attrs
 
 # загружает файл eu_sousede.json
 # при входе даем название файла или  путь к JSON-файлу
@@ -77,31 +172,25 @@ def make_graph(data: Dict[str, List[str]]) -> Graph:
     # Выбрана реализация ColorGraph (наследник Graph), чтобы позже можно было раскрашивать узлы
     g = ColorGraph(GraphType.UNDIRECTED)
 
-    # создаем Node
-    for state in data.keys():
-        # Добавляет узел с ID = название штата
-        node = g.add_node(state)
-        # Инициализирует атрибут цвета (пока не задан)
-        node["color"] = None
+    # создаем все Node одной пачкой, атрибут цвета пока не задан
+    g.add_nodes_from(data.keys(), {"color": None})
 
-    # добавление ребер
-    for state in data.keys():
-        for neighbour in data[state]:
-            # is_edge_to является функцией в классе Node в файле diktyonphi.py
-            if not g.node(state).is_edge_to(neighbour):
-                g.add_edge(state, neighbour)
+    # добавление ребер тоже пачкой: сосед A-B встречается в данных дважды (у A и у B),
+    # SKIP просто пропускает уже существующее ребро вместо проверки is_edge_to на каждом шаге
+    g.add_edges_from(((state, neighbour) for state in data for neighbour in data[state]),
+                     on_duplicate=DuplicatePolicy.SKIP)
     return g
 
-#FIXME: možná příliš brutal force
 # Функция находит первый недостающий цвет (число) в переданном наборе colors.
-# итерационно рассматриваем цвета
+# итерационно рассматриваем цвета, проверка через множество - O(k) вместо O(k²)
 # на выходе получаем число
 def first_not_used(colors: Iterable[int]) -> int:
+    used = set(colors)
     # Проверяем от 0 до N
-    for i in range(len(colors) + 1):
-        # Если числа нет в списке
-        if i not in colors:
-            return i
+    i = 0
+    while i in used:
+        i += 1
+    return i
 
 # Функция находит узел с максимальной степенью исхода (количество исходящих рёбер) среди заданного набора узлов графа.
 # принимает  объект графа
@@ -119,46 +208,233 @@ def get_max_degree_node(g: Graph, nodes: Iterable[str]) -> str:
 def set_node_color(g: Graph, node: str) -> None:
     '''Сбор цветов соседей, ИМЕННО ТУТ МЫ ПРИДУМЫВАЕМ ЦИФРЫ ЦВЕТАМ !!!!!!!!!!!!!!1
         Создаёт список color_of_neighbours, содержащий цвета всех соседних узлов
-        g.node(node).neighbor_nodes — возвращает все соседние узлы для текущего node
-        neighbor_nodes - является функцией из класса Node из файла dictyonphi.py
+        g.node(node).all_neighbor_ids — возвращает всех соседей текущего node (в обе стороны)
+        all_neighbor_ids - является функцией из класса Node из файла dictyonphi.py
         
         Например, если узел "A" имеет соседей ["B", "C"] с цветами 1 и 0, то colors = [1, 0]'''
-    color_of_neighbours = [neighbour_node["color"]  for neighbour_node
-                             in g.node(node).neighbor_nodes]
+    # all_neighbor_ids - у направленного графа учитываем и входящие рёбра
+    color_of_neighbours = [g.node(neighbour)["color"] for neighbour
+                           in g.node(node).all_neighbor_ids]
     
     #Выбор уникального цвета
     # вызываем функцию first_not_used и передаем переменную color_of_neighbours
     g.node(node)["color"] = first_not_used(color_of_neighbours)
 
+class ColoringReport(NamedTuple):
+    """Result of validate_coloring()."""
+    valid: bool
+    conflicts: List[Tuple[Hashable, Hashable]]  # рёбра, у которых оба конца одного цвета
+    num_colors: int
+    histogram: Dict[Any, int]  # цвет -> сколько узлов им покрашено
+
+
+def _color_codes(g: Graph, ids: List[Hashable], attr: str) -> Tuple[Any, Dict[Any, int]]:
+    """
+    Colours of all nodes (in ``ids`` order) as integer codes plus code -> colour mapping.
+    A typed int column of a CompactGraph is used directly.
+    """
+    if isinstance(g, CompactGraph):
+        column = g._node_store.columns.get(attr)
+        if column is not None and column.typecode == "q":
+            return column.data, None
+    codes: Dict[Any, int] = {}
+    values = array("q", (codes.setdefault(g.node(node_id)._attrs.get(attr), len(codes))
+                         for node_id in ids))
+    return values, {code: color for color, code in codes.items()}
+
+
+def validate_coloring(g: Graph, attr: str = "color", early_exit: bool = False,
+                      ignore_self_loops: bool = False) -> ColoringReport:
+    """
+    Check that no edge connects two nodes of the same colour.
+
+    Works on flat arrays of node colours and edge endpoints (edge arrays are
+    cached until the graph structure changes); with NumPy installed all edges
+    are compared at once. Uncoloured nodes (None) count as one colour.
+
+    :param g: Coloured graph.
+    :param attr: Node attribute holding the colour.
+    :param early_exit: Stop at the first conflicting block of edges (the report then
+        lists only conflicts found so far).
+    :param ignore_self_loops: Do not report self-loops as conflicts.
+    :return: ColoringReport with the conflicting edges, number of colours and histogram.
+    """
+    ids, src, dst = edge_arrays(g)
+    colors, names = _color_codes(g, ids, attr)
+    conflicts: List[Tuple[Hashable, Hashable]] = []
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is not None:
+        c = np.frombuffer(colors, dtype=np.int64)
+        s = np.frombuffer(src, dtype=np.int64)
+        d = np.frombuffer(dst, dtype=np.int64)
+        # при early_exit сравниваем блоками, чтобы не проходить весь граф
+        block = 1 << 16 if early_exit else max(len(s), 1)
+        for start in range(0, len(s), block):
+            bs, bd = s[start:start + block], d[start:start + block]
+            mask = c[bs] == c[bd]
+            if ignore_self_loops:
+                mask &= bs != bd
+            hits = np.flatnonzero(mask)
+            conflicts.extend((ids[bs[k]], ids[bd[k]]) for k in hits.tolist())
+            if early_exit and conflicts:
+                break
+        values, counts = np.unique(c, return_counts=True)
+        histogram = dict(zip(values.tolist(), counts.tolist()))
+    else:
+        for u, v in zip(src, dst):
+            if colors[u] == colors[v] and not (ignore_self_loops and u == v):
+                conflicts.append((ids[u], ids[v]))
+                if early_exit:
+                    break
+        histogram = {}
+        for code in colors:
+            histogram[code] = histogram.get(code, 0) + 1
+
+    if names is not None:
+        histogram = {names[code]: count for code, count in histogram.items()}
+    return ColoringReport(not conflicts, conflicts, len(histogram), histogram)
+
+
 # THAT'S MINE. прямо проверяет «есть ли у соседей одинаковый цвет» или нет.
 def check_coloring_conflicts(g: Graph) -> bool:
+    # теперь через validate_coloring: плоские массивы вместо neighbor_nodes, останов на первом конфликте
+    return validate_coloring(g, early_exit=True).valid
+
+
+class ColoringStrategy(enum.Enum):
+    """Order in which colorize() picks the next node."""
+    LARGEST_FIRST = 0  # по убыванию степени (как было раньше)
+    SMALLEST_LAST = 1  # обратный порядок вырождения (degeneracy ordering)
+    DSATUR = 2         # узел с наибольшим числом разных цветов у соседей
+
+
+def _coloring_degree(g: Graph, node_id: Hashable) -> int:
+    """Number of distinct nodes adjacent to node_id in either direction."""
+    node = g.node(node_id)
+    if g.type == GraphType.UNDIRECTED:
+        return node.out_degree
+    return sum(1 for _ in node.all_neighbor_ids)
+
+
+def _largest_first_order(g: Graph) -> Iterator[Hashable]:
+    """Nodes by decreasing degree (bucket sort, O(V))."""
+    buckets: List[List[Hashable]] = []
     for node_id in g.node_ids():
-        node_color = g.node(node_id)["color"]
-        for neighbor in g.node(node_id).neighbor_nodes:
-            if node_color == neighbor["color"]:
-                return False  # Есть конфликт — соседние узлы одного цвета
-    return True  # Конфликтов нет
-
-# это жадный алгоритм раскраски графа, где узлы раскрашиваются по одному, начиная с самых "связанных".
-def colorize(g: Graph):
-    # Создаётся множество colorless из ID всех узлов графа
-    colorless = set(g.node_ids())
-    # цикл выполняется пока все узлы не будут раскрашены
-    while colorless:
-        print(colorless)
-        # Выбор узла для раскраски. Сверху расписана эта функция. Передаем g, созданный в функции make_graph, и само множество, созданное тут
-        next_state = get_max_degree_node(g, colorless)
-        set_node_color(g, next_state)
-        print(next_state, g.node(next_state)["color"])
-        # и сразу удаляем узел из списка 
-        colorless.remove(next_state)
+        degree = _coloring_degree(g, node_id)
+        while len(buckets) <= degree:
+            buckets.append([])
+        buckets[degree].append(node_id)
+    for bucket in reversed(buckets):
+        yield from bucket
+
+
+def _smallest_last_order(g: Graph) -> List[Hashable]:
+    """
+    Smallest-last (degeneracy) order: repeatedly remove a node of minimum
+    remaining degree, colour in the reverse order of removal. O(V + E) with a
+    bucket queue.
+    """
+    degree = {node_id: _coloring_degree(g, node_id) for node_id in g.node_ids()}
+    buckets: List[Dict[Hashable, None]] = [{} for _ in range(max(degree.values(), default=0) + 1)]
+    for node_id, d in degree.items():
+        buckets[d][node_id] = None
+    removed = set()
+    order = []
+    low = 0
+    for _ in range(len(degree)):
+        # минимальная степень может уменьшиться максимум на 1 за шаг
+        low = max(low - 1, 0)
+        while not buckets[low]:
+            low += 1
+        node_id = next(iter(buckets[low]))
+        del buckets[low][node_id]
+        removed.add(node_id)
+        order.append(node_id)
+        for neighbour in g.node(node_id).all_neighbor_ids:
+            if neighbour in removed:
+                continue
+            d = degree[neighbour]
+            del buckets[d][neighbour]
+            degree[neighbour] = d - 1
+            buckets[d - 1][neighbour] = None
+    order.reverse()
+    return order
+
+
+def colorize(g: Graph, strategy: ColoringStrategy = ColoringStrategy.LARGEST_FIRST,
+             quiet: bool = False, progress: Optional[Callable[[int, int], None]] = None) -> int:
+    """
+    Greedy graph colouring: every node gets the smallest colour not used by its
+    neighbours (via set_node_color), nodes are taken in the order given by the strategy.
+
+    :param g: Graph whose nodes get the "color" attribute.
+    :param strategy: LARGEST_FIRST, SMALLEST_LAST or DSATUR.
+    :param quiet: Do not print every coloured node.
+    :param progress: Called as ``progress(done, total)`` about every 1 % of nodes and at the end.
+    :return: Number of colours used.
+    """
+    total = len(g)
+    step = max(total // 100, 1)
+    done = 0
+    colors = set()
+
+    def colored(node_id):
+        nonlocal done
+        color = g.node(node_id)["color"]
+        colors.add(color)
+        done += 1
+        if not quiet:
+            print(node_id, color)
+        if progress is not None and (done % step == 0 or done == total):
+            progress(done, total)
+        return color
+
+    if strategy == ColoringStrategy.DSATUR:
+        # куча с "ленивым" удалением: (-насыщенность, -степень, порядковый номер, узел)
+        saturation: Dict[Hashable, set] = {node_id: set() for node_id in g.node_ids()}
+        degree = {node_id: _coloring_degree(g, node_id) for node_id in saturation}
+        heap = [(0, -d, i, node_id) for i, (node_id, d) in enumerate(degree.items())]
+        heapq.heapify(heap)
+        counter = len(heap)
+        while heap:
+            sat, _, _, node_id = heapq.heappop(heap)
+            if node_id not in saturation or -sat != len(saturation[node_id]):
+                continue  # устаревшая запись
+            del saturation[node_id]
+            set_node_color(g, node_id)
+            color = colored(node_id)
+            # насыщенность обновляется только у соседей только что раскрашенного узла
+            for neighbour in g.node(node_id).all_neighbor_ids:
+                neighbour_colors = saturation.get(neighbour)
+                if neighbour_colors is not None and color not in neighbour_colors:
+                    neighbour_colors.add(color)
+                    heapq.heappush(heap, (-len(neighbour_colors), -degree[neighbour], counter, neighbour))
+                    counter += 1
+    else:
+        if strategy == ColoringStrategy.SMALLEST_LAST:
+            order = _smallest_last_order(g)
+        else:
+            order = _largest_first_order(g)
+        for next_state in order:
+            set_node_color(g, next_state)
+            colored(next_state)
+
+    # весь граф раскрашен заново -> для recolor() больше нечего проверять
+    if isinstance(g, ColorGraph):
+        g._dirty.clear()
+    return len(colors)
 
 # для запуска кода отсюда
 if __name__ == "__main__":
-    # выше функция, которая работает с файлом json
-    data = load_preprocessing("eu_sousede.json")
-    # передаем файл json этой функции, которая превращает все в граф для раскраски
-    g = make_graph(data)
+    # читаем json потоком прямо в граф для раскраски (без промежуточного словаря,
+    # соседи, которых нет среди ключей, отбрасываются так же, как в load_preprocessing)
+    g = load_adjacency_json("eu_sousede.json", ColorGraph(GraphType.UNDIRECTED), {"color": None})
+
+    colorize(g)
 
     # ⬇️ Добавляем новую страну вручную
     atlantis = g.add_node("Atlantis")
@@ -170,8 +446,9 @@ if __name__ == "__main__":
     for neighbor in ["Germany", "France"]:
         if not g.node("Atlantis").is_edge_to(neighbor):
             g.add_edge("Atlantis", neighbor)
-    
-    colorize(g)
+
+    # не раскрашиваем весь граф заново, а чиним только то, что сломали новые рёбра
+    print("Recolored:", g.recolor())
 
     # от меня для функции выше по проверке цветов
     if check_coloring_conflicts(g):
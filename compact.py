@@ -0,0 +1,519 @@
+# Компактное (CSR) хранение графа: вместо словаря соседей у каждого узла
+# держим несколько плоских массивов на весь граф.
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, MutableMapping
+from operator import itemgetter
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple, Type
+
+from diktyonphi import _NO_ATTRS, Graph, GraphStats, GraphType, Node
+
+# маркер "у этого узла/ребра такого атрибута нет"
+MISSING = object()
+
+
+class Column:
+    """
+    One attribute stored for every node (or edge record) of a compact graph.
+
+    Columns whose values are all ``int`` or all ``float`` are kept in a typed
+    ``array``; anything else (mixed types, strings, missing values) falls back
+    to a plain list. Writing a value that does not fit the typed array
+    converts the column to a list.
+    """
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def from_values(cls, values: List[Any]) -> 'Column':
+        """Build a column, picking the most compact representation for the values."""
+        if values and all(type(v) is int for v in values):
+            try:
+                return cls(array("q", values))
+            except OverflowError:
+                pass
+        elif values and all(type(v) is float for v in values):
+            return cls(array("d", values))
+        return cls(list(values))
+
+    @property
+    def typecode(self) -> Optional[str]:
+        """Typecode of the backing array ('q' or 'd'), None for list columns."""
+        data = self.data
+        if isinstance(data, list):
+            return None
+        return data.typecode if isinstance(data, array) else data.format
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, i: int) -> Any:
+        return self.data[i]
+
+    def _fits(self, val: Any) -> bool:
+        typecode = self.typecode
+        return typecode is not None and type(val) is (int if typecode == "q" else float)
+
+    def __setitem__(self, i: int, val: Any) -> None:
+        if self._fits(val):
+            try:
+                self.data[i] = val
+                return
+            except (OverflowError, TypeError):
+                # переполнение или массив только для чтения
+                pass
+        if not isinstance(self.data, list):
+            # значение не влезает в типизированный массив -> переходим на список
+            self.data = self.data.tolist()
+        self.data[i] = val
+
+    def append(self, val: Any) -> None:
+        """Append a value for a newly added record."""
+        if isinstance(self.data, array) and self._fits(val):
+            try:
+                self.data.append(val)
+                return
+            except OverflowError:
+                pass
+        if not isinstance(self.data, list):
+            self.data = self.data.tolist()
+        self.data.append(val)
+
+    def pop(self) -> Any:
+        """Remove the value of the last record and return it."""
+        if not isinstance(self.data, (list, array)):
+            # memoryview отображённого файла
+            self.data = self.data.tolist()
+        return self.data.pop()
+
+
+class ColumnStore:
+    """Set of named columns sharing the same number of records."""
+
+    def __init__(self, size: int = 0):
+        self.size = size
+        self.columns: Dict[str, Column] = {}
+
+    @classmethod
+    def from_dicts(cls, dicts: List[Dict[str, Any]]) -> 'ColumnStore':
+        """Transpose a list of attribute dicts into columns."""
+        store = cls(len(dicts))
+        names: Dict[str, None] = {}
+        for attrs in dicts:
+            names.update(dict.fromkeys(attrs))
+        for name in names:
+            store.columns[name] = Column.from_values([attrs.get(name, MISSING) for attrs in dicts])
+        return store
+
+    def get(self, i: int, name: str) -> Any:
+        """Return the value of ``name`` for record ``i``, raising KeyError if absent."""
+        val = self.columns[name][i]
+        if val is MISSING:
+            raise KeyError(name)
+        return val
+
+    def set(self, i: int, name: str, val: Any) -> None:
+        """Set the value of ``name`` for record ``i``, creating the column if needed."""
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = Column([MISSING] * self.size)
+        column[i] = val
+
+    def delete(self, i: int, name: str) -> None:
+        """Remove ``name`` from record ``i``."""
+        self.get(i, name)
+        self.columns[name][i] = MISSING
+
+    def names_at(self, i: int) -> Iterator[str]:
+        """Iterate over the attribute names present on record ``i``."""
+        for name, column in self.columns.items():
+            if column[i] is not MISSING:
+                yield name
+
+    def remove(self, i: int) -> None:
+        """Remove record ``i``; the last record takes its place (index ``i``), so nothing is shifted."""
+        last = self.size - 1
+        for column in self.columns.values():
+            if i != last:
+                column[i] = column[last]
+            column.pop()
+        self.size = last
+
+    def append(self, attrs: Dict[str, Any]) -> int:
+        """Add a new record with the given attributes and return its index."""
+        i = self.size
+        self.size += 1
+        for column in self.columns.values():
+            column.append(MISSING)
+        for name, val in attrs.items():
+            self.set(i, name, val)
+        return i
+
+
+class ColumnAttrs(MutableMapping):
+    """Dict-like view of one record of a ColumnStore, used as ``Node._attrs`` / ``Edge._attrs``."""
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: ColumnStore, index: int):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self._store.get(self._index, key)
+
+    def __setitem__(self, key: str, val: Any) -> None:
+        self._store.set(self._index, key, val)
+
+    def __delitem__(self, key: str) -> None:
+        self._store.delete(self._index, key)
+
+    def __contains__(self, key: object) -> bool:
+        column = self._store.columns.get(key)
+        return column is not None and column[self._index] is not MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return self._store.names_at(self._index)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> Dict[str, Any]:
+        """Return the attributes as a regular dict."""
+        return dict(self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class _CSRNeighbors(Mapping):
+    """
+    Read-only replacement of ``Node._neighbors`` for a node of CompactGraph.
+
+    Maps destination id -> edge attributes, exactly like the dict of a regular
+    node, but reads the row ``targets[offsets[i]:offsets[i+1]]`` of the CSR.
+    The same class over the reversed CSR serves as ``Node._predecessors``.
+    """
+    __slots__ = ("_graph", "_row", "_offsets", "_targets", "_edge_ids")
+
+    def __init__(self, graph: 'CompactGraph', row: int, offsets, targets, edge_ids):
+        self._graph = graph
+        self._row = row
+        self._offsets = offsets
+        self._targets = targets
+        self._edge_ids = edge_ids
+
+    def _slot(self, dest_id: Hashable) -> int:
+        # строки CSR отсортированы по индексу цели -> бинарный поиск
+        j = self._graph._index_of(dest_id)
+        if j < 0:
+            return -1
+        start, end = self._offsets[self._row], self._offsets[self._row + 1]
+        k = bisect_left(self._targets, j, start, end)
+        return k if k < end and self._targets[k] == j else -1
+
+    def __getitem__(self, dest_id: Hashable) -> ColumnAttrs:
+        k = self._slot(dest_id)
+        if k < 0:
+            raise KeyError(dest_id)
+        return ColumnAttrs(self._graph._edge_store, self._edge_ids[k])
+
+    def __contains__(self, dest_id: object) -> bool:
+        return self._slot(dest_id) >= 0
+
+    def __iter__(self) -> Iterator[Hashable]:
+        ids = self._graph._ids
+        targets = self._targets
+        for k in range(self._offsets[self._row], self._offsets[self._row + 1]):
+            yield ids[targets[k]]
+
+    def __len__(self) -> int:
+        return self._offsets[self._row + 1] - self._offsets[self._row]
+
+
+def symmetric_csr(g: Graph) -> Tuple[List[Hashable], array, array]:
+    """
+    Build plain CSR arrays of the graph with edge direction ignored.
+
+    Every row lists the distinct neighbours of a node in both directions
+    (sorted by index, without self-loops). This is the adjacency graph
+    colouring works on.
+
+    :return: (ids, offsets, targets) - node ids by index, row offsets, neighbour indexes.
+    """
+    ids = list(g.node_ids())
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    offsets = array("q", [0])
+    targets = array("q")
+    for i, node_id in enumerate(ids):
+        row = {index[u] for u in g.node(node_id).all_neighbor_ids}
+        row.discard(i)
+        targets.extend(sorted(row))
+        offsets.append(len(targets))
+    return ids, offsets, targets
+
+
+def edge_arrays(g: Graph) -> Tuple[List[Hashable], array, array]:
+    """
+    Return every edge as a pair of node indexes: ``(ids, src, dst)``.
+
+    Undirected edges appear once. The arrays are cached on the graph and
+    rebuilt only after its structure changes, so repeated calls are cheap.
+    """
+    cached = g._edge_arrays_cache
+    if cached is not None and cached[0] == g._structure_version:
+        return cached[1]
+    if isinstance(g, CompactGraph):
+        ids, offsets, targets = g._ids, g._offsets, g._targets
+        src = array("q")
+        dst = array("q")
+        undirected = g.type == GraphType.UNDIRECTED
+        for i in range(len(ids)):
+            for k in range(offsets[i], offsets[i + 1]):
+                if not undirected or targets[k] >= i:
+                    src.append(i)
+                    dst.append(targets[k])
+    else:
+        ids = list(g.node_ids())
+        index = {node_id: i for i, node_id in enumerate(ids)}
+        src = array("q")
+        dst = array("q")
+        for src_id, dst_id in g.edges():
+            src.append(index[src_id])
+            dst.append(index[dst_id])
+    g._edge_arrays_cache = (g._structure_version, (ids, src, dst))
+    return ids, src, dst
+
+
+class CompactGraph(Graph):
+    """
+    Read-only graph stored in compressed sparse row (CSR) form.
+
+    Node ids are interned to dense integers ``0..n-1`` (in the order of the
+    source graph), the adjacency is two arrays ``offsets`` (n+1) and
+    ``targets`` (one entry per stored direction of an edge), and node / edge
+    attributes live in columns. Undirected edges keep a single attribute
+    record shared by both directions.
+
+    ``Node``, ``Edge``, ``neighbor_ids``, ``to()`` and friends work as on a
+    regular ``Graph``; neighbours are reported in node order. Attributes may be
+    changed, the structure may not - use ``thaw()`` to get a mutable copy.
+    """
+
+    def __init__(self, type: GraphType, ids: List[Hashable], offsets, targets, edge_ids,
+                 node_store: ColumnStore, edge_store: ColumnStore,
+                 index: Optional[Mapping[Hashable, int]] = None):
+        """
+        Initialize a compact graph from already built CSR arrays.
+
+        :param type: GraphType.DIRECTED or GraphType.UNDIRECTED
+        :param ids: Node ids, position in the list is the node index.
+        :param offsets: Row offsets into ``targets`` (length ``len(ids) + 1``).
+        :param targets: Destination node index for every stored edge direction.
+        :param edge_ids: Edge attribute record for every entry of ``targets``.
+        :param node_store: Node attribute columns (one record per node).
+        :param edge_store: Edge attribute columns (one record per edge).
+        :param index: Node id -> index lookup, a dict built from ``ids`` if None.
+        """
+        super().__init__(type)
+        self._ids = ids
+        self._index: Mapping[Hashable, int] = (
+            index if index is not None else {node_id: i for i, node_id in enumerate(ids)})
+        self._offsets = offsets
+        self._targets = targets
+        self._edge_ids = edge_ids
+        self._node_store = node_store
+        self._edge_store = edge_store
+        # обратный CSR (входящие рёбра) строится лениво, при первом запросе
+        self._reverse: Optional[tuple] = None
+        # структура не меняется -> статистику считаем один раз, при первом запросе
+        self._stats: Optional[GraphStats] = None
+
+    @classmethod
+    def from_graph(cls, g: Graph) -> 'CompactGraph':
+        """Build the compact representation of an existing graph."""
+        ids = list(g.node_ids())
+        index = {node_id: i for i, node_id in enumerate(ids)}
+        offsets = array("q", [0])
+        targets = array("q")
+        edge_ids = array("q")
+        records: List[Dict[str, Any]] = []
+        # неориентированное ребро хранит один и тот же dict у обоих концов -> одна запись
+        # (у рёбер без атрибутов общий пустой словарь -> их различаем по концам)
+        record_of: Dict[Any, int] = {}
+        undirected = g.type == GraphType.UNDIRECTED
+        for i, node in enumerate(g):
+            row = sorted(((index[dst_id], attrs) for dst_id, attrs in node._neighbors.items()),
+                         key=itemgetter(0))
+            for j, attrs in row:
+                if attrs is not _NO_ATTRS:
+                    key = id(attrs)
+                else:
+                    key = (min(i, j), max(i, j)) if undirected else (i, j)
+                record = record_of.get(key)
+                if record is None:
+                    record = record_of[key] = len(records)
+                    records.append(attrs)
+                targets.append(j)
+                edge_ids.append(record)
+            offsets.append(len(targets))
+        node_store = ColumnStore.from_dicts([node._attrs for node in g])
+        return cls(g.type, ids, offsets, targets, edge_ids, node_store,
+                   ColumnStore.from_dicts(records))
+
+    def _index_of(self, node_id: Hashable) -> int:
+        """Return the dense index of a node id, or -1 if it is not in the graph."""
+        return self._index.get(node_id, -1)
+
+    def _reverse_csr(self) -> tuple:
+        """Return (offsets, targets, edge_ids) of the transposed adjacency, building it once."""
+        if self._reverse is None:
+            n = len(self._ids)
+            offsets = array("q", bytes(8 * (n + 1)))
+            for j in self._targets:
+                offsets[j + 1] += 1
+            for i in range(n):
+                offsets[i + 1] += offsets[i]
+            fill = array("q", offsets[:n])
+            sources = array("q", bytes(8 * len(self._targets)))
+            edge_ids = array("q", bytes(8 * len(self._targets)))
+            # источники идут по возрастанию, поэтому строки обратного CSR сразу отсортированы
+            for i in range(n):
+                for k in range(self._offsets[i], self._offsets[i + 1]):
+                    j = self._targets[k]
+                    sources[fill[j]] = i
+                    edge_ids[fill[j]] = self._edge_ids[k]
+                    fill[j] += 1
+            self._reverse = (offsets, sources, edge_ids)
+        return self._reverse
+
+    def _make_node(self, i: int) -> Node:
+        """Create a (throwaway) Node object for the node with index ``i``."""
+        node = Node(self, self._ids[i], ColumnAttrs(self._node_store, i))
+        node._neighbors = _CSRNeighbors(self, i, self._offsets, self._targets, self._edge_ids)
+        if self.type == GraphType.UNDIRECTED:
+            node._predecessors = node._neighbors
+        else:
+            node._predecessors = _CSRNeighbors(self, i, *self._reverse_csr())
+        return node
+
+    def __contains__(self, node_id: Hashable) -> bool:
+        return self._index_of(node_id) >= 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[Node]:
+        return (self._make_node(i) for i in range(len(self._ids)))
+
+    def node_ids(self) -> Iterator[Hashable]:
+        return iter(self._ids)
+
+    def node(self, node_id: Hashable) -> Node:
+        i = self._index_of(node_id)
+        if i < 0:
+            raise KeyError(node_id)
+        return self._make_node(i)
+
+    def edges(self, data: bool | str = False, default: Any = None) -> Iterator[tuple]:
+        """Iterate over all edges straight from the CSR arrays, see Graph.edges()."""
+        ids, offsets, targets, edge_ids = self._ids, self._offsets, self._targets, self._edge_ids
+        store = self._edge_store
+        column = store.columns.get(data) if isinstance(data, str) else None
+        undirected = self.type == GraphType.UNDIRECTED
+        for i, src_id in enumerate(ids):
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                # неориентированное ребро лежит в CSR дважды, берём копию с j >= i
+                if undirected and j < i:
+                    continue
+                if data is False:
+                    yield (src_id, ids[j])
+                elif data is True:
+                    yield (src_id, ids[j], ColumnAttrs(store, edge_ids[k]))
+                else:
+                    val = column[edge_ids[k]] if column is not None else MISSING
+                    yield (src_id, ids[j], default if val is MISSING else val)
+
+    def add_node(self, node_id: Hashable, attrs: Optional[Dict[str, Any]] = None) -> Node:
+        raise TypeError("CompactGraph is read-only, use thaw() to get a mutable Graph")
+
+    def add_edge(self, src_id: Hashable, dst_id: Hashable, attrs: Optional[Dict[str, Any]] = None):
+        raise TypeError("CompactGraph is read-only, use thaw() to get a mutable Graph")
+
+    def _create_node(self, node_id: Hashable, attrs: Optional[Dict[str, Any]] = None) -> Node:
+        raise TypeError("CompactGraph is read-only, use thaw() to get a mutable Graph")
+
+    def _set_edge(self, src_id: Hashable, target_id: Hashable, attrs: Dict[str, Any]) -> None:
+        raise TypeError("CompactGraph is read-only, use thaw() to get a mutable Graph")
+
+    def _put_edge(self, src_id: Hashable, target_id: Hashable, attrs: Dict[str, Any]) -> None:
+        raise TypeError("CompactGraph is read-only, use thaw() to get a mutable Graph")
+
+    def remove_edge(self, src_id: Hashable, dst_id: Hashable) -> None:
+        raise TypeError("CompactGraph is read-only, use thaw() to get a mutable Graph")
+
+    def snapshot(self) -> Graph:
+        raise TypeError("CompactGraph does not support snapshots, its structure is immutable already")
+
+    def remove_node(self, node_id: Hashable) -> None:
+        raise TypeError("CompactGraph is read-only, use thaw() to get a mutable Graph")
+
+    def _drop_edge(self, src_id: Hashable, target_id: Hashable) -> None:
+        raise TypeError("CompactGraph is read-only, use thaw() to get a mutable Graph")
+
+    def _drop_node(self, node_id: Hashable) -> None:
+        raise TypeError("CompactGraph is read-only, use thaw() to get a mutable Graph")
+
+    def compact(self) -> 'CompactGraph':
+        return self
+
+    def thaw(self, graph_class: Type[Graph] = Graph) -> Graph:
+        """
+        Return a regular mutable graph with the same nodes, edges and attributes.
+
+        :param graph_class: Class of the returned graph (e.g. ColorGraph).
+        """
+        g = graph_class(self.type)
+        ids = self._ids
+        for i, node_id in enumerate(ids):
+            g.add_node(node_id, dict(ColumnAttrs(self._node_store, i)) or None)
+        for i, node_id in enumerate(ids):
+            for k in range(self._offsets[i], self._offsets[i + 1]):
+                j = self._targets[k]
+                # у неориентированного графа каждое ребро лежит в CSR дважды
+                if self.type == GraphType.UNDIRECTED and j < i:
+                    continue
+                g.add_edge(node_id, ids[j], dict(ColumnAttrs(self._edge_store, self._edge_ids[k])) or None)
+        return g
+
+    @property
+    def edge_columns(self):
+        """Edge attribute columns of the compact graph, see Graph.edge_columns (no conversion needed)."""
+        if self._edge_columns is None:
+            from edge_columns import EdgeColumns
+            size = self._edge_store.size
+            src: List[Hashable] = [None] * size
+            dst: List[Hashable] = [None] * size
+            ids, offsets, targets = self._ids, self._offsets, self._targets
+            undirected = self.type == GraphType.UNDIRECTED
+            for i in range(len(ids)):
+                for k in range(offsets[i], offsets[i + 1]):
+                    # неориентированное ребро берём с того конца, что и edges()
+                    if undirected and targets[k] < i:
+                        continue
+                    record = self._edge_ids[k]
+                    src[record] = ids[i]
+                    dst[record] = ids[targets[k]]
+            self._edge_columns = EdgeColumns(self, self._edge_store, src, dst)
+        return self._edge_columns
+
+    @property
+    def stats(self) -> GraphStats:
+        if self._stats is None:
+            self._stats = GraphStats.from_graph(self)
+        return self._stats
+
+    def __repr__(self):
+        return f"CompactGraph({self.type}, nodes: {len(self._ids)}, edges: {self.stats.edge_count})"
@@ -0,0 +1,221 @@
+# Компоненты связности и достижимость: union-find над массивом индексов и BFS по слоям.
+# Значения (метки компонент, множества достижимых узлов) кэшируются на графе,
+# пока не изменится его структура, так что повторный запрос стоит O(1).
+from array import array
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from compact import CompactGraph
+from diktyonphi import Graph, GraphType
+
+# сколько множеств достижимых узлов (ориентированный граф) держать в кэше одновременно
+_REACH_CACHE_SIZE = 64
+
+
+class UnionFind:
+    """
+    Disjoint sets over the integers ``0..n-1`` (union by size, path halving).
+
+    Both operations are amortized nearly O(1). The parents and sizes are two
+    flat ``array``s instead of dicts, so a million elements take 16 MB.
+    """
+
+    def __init__(self, n: int):
+        """:param n: Number of elements, each starts in its own set."""
+        self._parent = array("q", range(n))
+        self._size = array("q", [1]) * n
+        self.count = n  # число множеств
+
+    def find(self, i: int) -> int:
+        """Return the representative of the set containing ``i``."""
+        parent = self._parent
+        while parent[i] != i:
+            # сокращение пути вдвое: каждый второй узел начинает указывать на деда
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> bool:
+        """Merge the sets of ``i`` and ``j``; return False if they already were one set."""
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return False
+        if self._size[i] < self._size[j]:
+            i, j = j, i
+        self._parent[j] = i
+        self._size[i] += self._size[j]
+        self.count -= 1
+        return True
+
+    def connected(self, i: int, j: int) -> bool:
+        return self.find(i) == self.find(j)
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+
+def _union_find(g: Graph) -> Tuple[List[Hashable], UnionFind]:
+    """Node ids of ``g`` and a UnionFind over their positions with every edge merged (direction ignored)."""
+    if isinstance(g, CompactGraph):
+        # соседи уже лежат индексами в CSR, словарь id -> индекс не нужен
+        ids = g._ids
+        uf = UnionFind(len(ids))
+        offsets, targets = g._offsets, g._targets
+        for i in range(len(ids)):
+            for k in range(offsets[i], offsets[i + 1]):
+                uf.union(i, targets[k])
+        return ids, uf
+    ids = list(g.node_ids())
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    uf = UnionFind(len(ids))
+    for src_id, dst_id in g.edges():
+        uf.union(index[src_id], index[dst_id])
+    return ids, uf
+
+
+def component_labels(g: Graph) -> Dict[Hashable, int]:
+    """
+    Map every node id to the number of its (weakly) connected component.
+
+    Components are numbered ``0, 1, ...`` in the order of their first node.
+    Edge directions are ignored. The map is cached on the graph and reused
+    until nodes or edges are added (do not modify it).
+    """
+    cached = g._component_cache
+    if cached is not None and cached[0] == g._structure_version:
+        return cached[1]
+    ids, uf = _union_find(g)
+    labels: Dict[Hashable, int] = {}
+    roots: Dict[int, int] = {}
+    for i, node_id in enumerate(ids):
+        root = uf.find(i)
+        label = roots.get(root)
+        if label is None:
+            label = roots[root] = len(roots)
+        labels[node_id] = label
+    g._component_cache = (g._structure_version, labels)
+    return labels
+
+
+def _group(g: Graph) -> List[List[Hashable]]:
+    components: List[List[Hashable]] = []
+    for node_id, label in component_labels(g).items():
+        if label == len(components):
+            components.append([])
+        components[label].append(node_id)
+    return components
+
+
+def connected_components(g: Graph) -> List[List[Hashable]]:
+    """
+    Connected components of an undirected graph (lists of node IDs, in node order).
+
+    :raises ValueError: If the graph is directed (use weakly_connected_components()
+        or algorithms.strongly_connected_components()).
+    """
+    if g.type != GraphType.UNDIRECTED:
+        raise ValueError("Connected components are defined for undirected graphs, "
+                         "use weakly_connected_components() for a directed one")
+    return _group(g)
+
+
+def weakly_connected_components(g: Graph) -> List[List[Hashable]]:
+    """Components of the graph with edge directions ignored (lists of node IDs, in node order)."""
+    return _group(g)
+
+
+def number_of_components(g: Graph) -> int:
+    """Number of (weakly) connected components."""
+    labels = component_labels(g)
+    return max(labels.values()) + 1 if labels else 0
+
+
+def is_connected(g: Graph) -> bool:
+    """True if every node can be reached from every other one with edge directions ignored."""
+    return number_of_components(g) <= 1
+
+
+def same_component(g: Graph, a: Hashable, b: Hashable) -> bool:
+    """True if nodes ``a`` and ``b`` lie in the same (weakly) connected component, O(1) once cached."""
+    labels = component_labels(g)
+    try:
+        return labels[a] == labels[b]
+    except KeyError as e:
+        raise KeyError(f"Node {e.args[0]} is not in the graph") from None
+
+
+def bfs_layers(g: Graph, sources: Iterable[Hashable], max_depth: Optional[int] = None,
+               reverse: bool = False) -> Iterator[List[Hashable]]:
+    """
+    Breadth-first search from several sources at once, one frontier at a time.
+
+    Yields the list of sources first, then the nodes at distance 1, 2, ...
+    (every node once, at its smallest distance from any source).
+
+    :param g: Graph (or view).
+    :param sources: IDs of the start nodes.
+    :param max_depth: Stop after the frontier at this distance.
+    :param reverse: Follow edges backwards (who can reach the sources).
+    :raises KeyError: If a source is not in the graph.
+    """
+    frontier = []
+    seen: Set[Hashable] = set()
+    for node_id in sources:
+        if node_id not in g:
+            raise KeyError(f"Node {node_id} is not in the graph")
+        if node_id not in seen:
+            seen.add(node_id)
+            frontier.append(node_id)
+    depth = 0
+    while frontier:
+        yield frontier
+        if max_depth is not None and depth >= max_depth:
+            return
+        depth += 1
+        next_frontier = []
+        for node_id in frontier:
+            node = g.node(node_id)
+            for neighbor in (node._predecessors if reverse else node._neighbors):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+
+
+def bfs_distances(g: Graph, sources: Iterable[Hashable], max_depth: Optional[int] = None,
+                  reverse: bool = False) -> Dict[Hashable, int]:
+    """Number of edges from the nearest source to every reachable node, see bfs_layers()."""
+    return {node_id: depth
+            for depth, layer in enumerate(bfs_layers(g, sources, max_depth, reverse))
+            for node_id in layer}
+
+
+def reachable_from(g: Graph, sources: Iterable[Hashable]) -> Set[Hashable]:
+    """Set of nodes reachable from any of the sources (the sources included)."""
+    return {node_id for layer in bfs_layers(g, sources) for node_id in layer}
+
+
+def is_reachable(g: Graph, src_id: Hashable, dst_id: Hashable) -> bool:
+    """
+    True if there is a path from ``src_id`` to ``dst_id``.
+
+    In an undirected graph this is a component label comparison. In a
+    directed graph nodes of different weak components are rejected at once,
+    otherwise the set of nodes reachable from ``src_id`` is computed by BFS
+    and kept, so further queries from the same source are O(1) until the
+    structure of the graph changes.
+    """
+    if not same_component(g, src_id, dst_id):
+        return False
+    if g.type == GraphType.UNDIRECTED or src_id == dst_id:
+        return True
+    cached = g._reach_cache
+    if cached is None or cached[0] != g._structure_version:
+        cached = g._reach_cache = (g._structure_version, {})
+    sets = cached[1]
+    reach = sets.get(src_id)
+    if reach is None:
+        if len(sets) >= _REACH_CACHE_SIZE:
+            # выбрасываем самый старый источник (dict хранит порядок вставки)
+            del sets[next(iter(sets))]
+        reach = sets[src_id] = frozenset(reachable_from(g, [src_id]))
+    return dst_id in reach
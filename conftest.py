@@ -0,0 +1 @@
+# Модули лежат в корне репозитория (без пакета): этот файл добавляет корень в sys.path для тестов в tests/.
@@ -12,8 +12,8 @@ def pocet_uzlu(g):
     return len(g)
 
 def pocet_hran(g):
-    hrany = sum(node.out_degree for node in g)
-    return hrany if g.type == GraphType.DIRECTED else hrany // 2
+    # граф сам считает рёбра при добавлении (g.stats), обход всех узлов не нужен
+    return g.stats.edge_count
 
 
 def vypis_hrany_s_atributy(g):
@@ -41,23 +41,31 @@ def stupne_uzlu(g):
 # - Vypište průměrný výstupní stupeň všech uzlů
 
 def uzly_s_nulovym_stupnem(g):
-    return [node.id for node in g if node.out_degree == 0]
+    # stats.isolated идут в порядке, в каком узлы стали изолированными -> отдаём в порядке узлов
+    isolated = g.stats.isolated
+    if not isolated:
+        return []
+    return [node_id for node_id in g.node_ids() if node_id in isolated]
 
 def prumerny_stupen(g):
-    return sum(node.out_degree for node in g) / len(g)
+    return g.stats.degree_sum / len(g)
 
 # ─────────────────────────────────────────────────────────────
 # 🔹 Téma 3: Smyčky v grafu (ZADÁNÍ OD UŽIVATELE)
 # ─────────────────────────────────────────────────────────────
 
 def existuje_smycka(g):
-    return any(node.is_edge_to(node.id) for node in g)
+    return bool(g.stats.loops)
 
 # Variace:
 # - Vraťte seznam všech uzlů, které mají smyčku
 
 def uzly_se_smyckou(g):
-    return [node.id for node in g if node.is_edge_to(node.id)]
+    # как и выше: порядок узлов графа, а не порядок появления петель
+    loops = g.stats.loops
+    if not loops:
+        return []
+    return [node_id for node_id in g.node_ids() if node_id in loops]
 # it is node A
 
 # ─────────────────────────────────────────────────────────────
@@ -65,26 +73,22 @@ def uzly_se_smyckou(g):
 # ─────────────────────────────────────────────────────────────
 
 def existuje_zaporna_hrana(g):
-    for node in g:
-        for neighbor_id in node.neighbor_ids:
-            edge = node.to(neighbor_id)
-            if "weight" in edge._attrs and edge["weight"] < 0:
-                return True
-    return False
+    return any(w is not None and w < 0 for _, _, w in g.edges(data="weight"))
 
 # Variace:
 # - Najděte všechny záporné hrany a vypište je
 
 def vsechny_zaporne_hrany(g):
-    vysledky = []
-    for node in g:
-        for neighbor_id in node.neighbor_ids:
-            edge = node.to(neighbor_id)
-            # типа если есть вес в атрибутах, то посмотри меньше ли он нуля
-            if "weight" in edge._attrs and edge["weight"] < 0:
-                # если он меньше нуля, то в список добавляем айди узла, куда он идет и вес
-                vysledky.append((node.id, neighbor_id, edge["weight"]))
-    return vysledky
+    # если веса уже лежат колонкой (g.edge_columns), сравнение всей колонки сразу даёт маску;
+    # сами колонки ради чтения не включаем - это перевело бы граф в другое хранение
+    sloupce = g._edge_columns
+    if sloupce is not None:
+        if "weight" not in sloupce:
+            return []
+        vahy = sloupce["weight"]
+        maska = vahy < 0
+        return [(src, dst, w) for (src, dst), w in zip(vahy.edges(maska), vahy.select(maska))]
+    return [(src, dst, w) for src, dst, w in g.edges(data="weight") if w is not None and w < 0]
 
 # ─────────────────────────────────────────────────────────────
 # 🔹 Téma 5: Lineární graf (ZADÁNÍ OD UŽIVATELE)
@@ -123,6 +127,10 @@ def je_cesta(g):
 
 # barva задаем в конце в функции test()
 def uzly_podle_barvy(g, barva):
+    # если есть индекс (g.create_index("node", "color")), ответ за O(результата) без обхода графа
+    index = g.get_index("node", "color")
+    if index is not None:
+        return index.find(barva)
     return [node.id for node in g if node["color"] == barva]
 
 # ─────────────────────────────────────────────────────────────
@@ -130,24 +138,27 @@ def uzly_podle_barvy(g, barva):
 # ─────────────────────────────────────────────────────────────
 
 def zvysit_vahy_hran(g, o_kolik):
-    for node in g:
-        for neighbor_id in node.neighbor_ids:
-            edge = node.to(neighbor_id)
-            if "weight" in edge._attrs:
-                edge["weight"] += o_kolik
+    # если колонки уже есть - одна векторная операция над колонкой весов вместо цикла;
+    # иначе обычный цикл (edges() отдаёт неориентированное ребро один раз),
+    # рёбра без веса пропускаются, кэш DOT/картинок граф сбрасывает сам
+    sloupce = g._edge_columns
+    if sloupce is not None:
+        if "weight" in sloupce:
+            sloupce["weight"] += o_kolik
+        return
+    for src, dst, w in list(g.edges(data="weight")):
+        if w is not None:
+            g.node(src).to(dst)["weight"] = w + o_kolik
 
 # ─────────────────────────────────────────────────────────────
 # 🔹 Téma 8 (navíc): Odstranění hran určitého typu (logická simulace)
 # ─────────────────────────────────────────────────────────────
 
 def najdi_hrany_podle_typu(g, hledany_typ):
-    vysledky = []
-    for node in g:
-        for neighbor_id in node.neighbor_ids:
-            edge = node.to(neighbor_id)
-            if edge["type"] == hledany_typ:
-                vysledky.append((node.id, neighbor_id))
-    return vysledky
+    index = g.get_index("edge", "type")
+    if index is not None:
+        return index.find(hledany_typ)
+    return [(src, dst) for src, dst, typ in g.edges(data="type") if typ == hledany_typ]
 
 # ─────────────────────────────────────────────────────────────
 # 🔸 Testovací data a výpis výsledků
@@ -177,6 +188,9 @@ def test():
     print("Uzly s barvou 'red':", uzly_podle_barvy(g, "red"))
     zvysit_vahy_hran(g, 1)
     print("Hrany typu 'loop':", najdi_hrany_podle_typu(g, "loop"))
+    g.create_index("edge", "type")
+    g.node("A").to("B")["type"] = "loop"
+    print("Hrany typu 'loop' (index):", najdi_hrany_podle_typu(g, "loop"))
 
 if __name__ == "__main__":
     test()
@@ -1,10 +1,21 @@
 # позволяет создавать именованные константы
+import asyncio
 import enum
+import hashlib
+import io
 # Модуль для запуска внешних команд и процессов
 # вызов из Python терминальной команды dot, которая идёт с Graphviz
 import subprocess
+import tempfile
+import threading
+import weakref
+from collections.abc import Mapping
 # typing Чтобы явно указывать типы аргументов и возвращаемых значений функций/методов
-from typing import Dict, Hashable, Any, Optional, Iterator, Tuple
+from typing import Callable, Dict, Hashable, Any, Optional, Iterable, Iterator, Set, Tuple
+
+# кэш отрендеренных картинок (render_cache.py)
+import render_cache
+from render_cache import RenderCache, render_key
 
 # there we use the enum library
 # вместо обычных чисел или строк, просто чтобы в дальнейшем было удобно использовать
@@ -13,9 +24,51 @@ class GraphType(enum.Enum):
     DIRECTED = 0
     UNDIRECTED = 1
 
+
+class DuplicatePolicy(enum.Enum):
+    """What bulk insertion (add_nodes_from / add_edges_from) does with an already existing node or edge."""
+    RAISE = 0      # ValueError, nothing from the batch is inserted
+    SKIP = 1       # keep the existing one
+    OVERWRITE = 2  # replace its attributes (an item without attributes keeps the existing ones)
+
 # Edge Это ребро графа — то есть связь между двумя узлами (точками). 
+class _NoAttrs(Mapping):
+    """
+    Read-only empty attribute mapping shared by all nodes and edges created
+    without attributes, so they do not cost a dict each. A real dict is
+    allocated on the first write, see Graph._own_node_attrs/_own_edge_attrs.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(())
+
+    def __len__(self) -> int:
+        return 0
+
+    def copy(self) -> Dict[str, Any]:
+        return {}
+
+    def __repr__(self):
+        return "{}"
+
+
+_NO_ATTRS = _NoAttrs()
+
+
 class Edge:
     """Representation of an edge between two nodes with associated attributes."""
+    # без __dict__ у каждого объекта
+    __slots__ = ("src", "dest", "_attrs")
 
     def __init__(self, src: 'Node', dest: 'Node', attrs: Dict[str, Any]):
         """
@@ -41,7 +94,14 @@ class Edge:
     def __setitem__(self, key: str, val: Any) -> None:
         """Set edge attribute by key.
         Типа позволяет нам менять значения ребра в будущем, обращаясь к обьекту как к значению словаря по ключу"""
+        graph = self.src.graph
+        if self._attrs is _NO_ATTRS or graph._cow is not None:
+            # свой словарь (а не общий пустой или общий со снимком графа)
+            self._attrs = graph._own_edge_attrs(self.src.id, self.dest.id)
         self._attrs[key] = val
+        graph._version += 1
+        if graph._indexes:
+            graph._update_edge_index(self.src.id, self.dest.id, key, val)
 
     # Как ребро выглядит при печати
     def __repr__(self):
@@ -51,6 +111,7 @@ class Edge:
 
 class Node:
     """Representation of a graph node with attributes and outgoing edges."""
+    __slots__ = ("id", "graph", "_attrs", "_neighbors", "_predecessors")
 
     def __init__(self, graph: 'Graph', node_id: Hashable, attrs: Dict[str, Any]):
         """
@@ -66,6 +127,10 @@ class Node:
         self._neighbors: Dict[Hashable, Dict[str, Any]] = {}
         '''_neighbors внутренний словарь, который всегда должен начинаться пустым для нового узла, поэтому его нет вначале
         Типа этот параметр не обязателен лично для каждого узла, он создается уже внутри обьекта'''
+        # входящие рёбра: id узла-источника -> атрибуты ребра; заполняет Graph._set_edge
+        # у неориентированного графа входящие и исходящие рёбра совпадают, поэтому это тот же словарь
+        self._predecessors: Dict[Hashable, Dict[str, Any]] = (
+            self._neighbors if graph.type == GraphType.UNDIRECTED else {})
 
     def __getitem__(self, item: str) -> Any:
         """Access node attribute by key. Как у ребер"""
@@ -75,7 +140,15 @@ class Node:
 
     def __setitem__(self, item: str, val: Any) -> None:
         """Set node attribute by key."""
-        self._attrs[item] = val
+        attrs = self._attrs
+        if attrs is _NO_ATTRS or self.graph._cow is not None:
+            attrs = self.graph._own_node_attrs(self)
+        attrs[item] = val
+        # граф изменился -> кэш DOT/картинок больше не актуален
+        self.graph._version += 1
+        # и вторичный индекс по этому атрибуту, если он есть
+        if self.graph._indexes:
+            self.graph._update_index("node", item, self.id, val)
 
     def to(self, dest: Hashable | 'Node') -> Edge:
         """
@@ -111,7 +184,7 @@ class Node:
         # Убеждаемся, что узел назначения действительно есть в графе (по ID)
         assert dest.id in self.graph, f"Destination node {dest.id} is not in graph"
         # добавляем созданное ребро в граф
-        self.graph.add_edge(self.id, dest.id, attrs if attrs is not None else {})
+        self.graph.add_edge(self.id, dest.id, attrs)
 
     def is_edge_to(self, dest: Hashable | 'Node') -> bool:
         """
@@ -145,6 +218,34 @@ class Node:
     def out_degree(self) -> int:
         """Return the number of outgoing edges. Возвращает число исходящих рёбер из этого узла."""
         return len(self._neighbors)
+
+    @property
+    def predecessor_ids(self) -> Iterator[Hashable]:
+        """Return an iterator over IDs of nodes with an edge to this node (входящие рёбра).
+        Cost is O(in-degree), the graph keeps a reverse index.
+        For undirected graphs this is the same as neighbor_ids."""
+        return iter(self._predecessors)
+
+    @property
+    def predecessor_nodes(self) -> Iterator['Node']:
+        """Return an iterator over nodes with an edge to this node."""
+        for id in self.predecessor_ids:
+            yield self.graph.node(id)
+
+    @property
+    def in_degree(self) -> int:
+        """Return the number of incoming edges. Число входящих рёбер."""
+        return len(self._predecessors)
+
+    @property
+    def all_neighbor_ids(self) -> Iterator[Hashable]:
+        """Return an iterator over IDs of all adjacent nodes, successors first,
+        then predecessors that are not successors (each node once)."""
+        yield from self._neighbors
+        if self._predecessors is not self._neighbors:
+            for id in self._predecessors:
+                if id not in self._neighbors:
+                    yield id
     
     # удобно печатает просто. Покажет ID и атрибуты
     def __repr__(self):
@@ -165,6 +266,113 @@ class Node:
         return hash(self.id)
 
 
+class GraphStats:
+    """
+    Counters a graph keeps up to date on every change, so reading them is O(1).
+
+    "Degree" is the out-degree (``Node.out_degree``; for undirected graphs the
+    number of neighbours, a self-loop counts once). Treat the attributes as
+    read-only, only the graph changes them.
+    """
+    __slots__ = ("edge_count", "degree_sum", "histogram", "isolated", "loops", "min_degree", "max_degree")
+
+    def __init__(self):
+        self.edge_count = 0     # рёбер (неориентированное ребро - одно)
+        self.degree_sum = 0     # сумма исходящих степеней
+        # степень -> число узлов с такой степенью
+        self.histogram: Dict[int, int] = {}
+        # узлы без исходящих рёбер и узлы с петлёй (dict = упорядоченное множество)
+        self.isolated: Dict[Hashable, None] = {}
+        self.loops: Dict[Hashable, None] = {}
+        self.min_degree: Optional[int] = None
+        self.max_degree: Optional[int] = None
+
+    @classmethod
+    def from_graph(cls, g: 'Graph') -> 'GraphStats':
+        """Count everything with one scan over the graph (for graphs that do not keep the counters)."""
+        stats = cls()
+        histogram = stats.histogram
+        for node in g:
+            degree = node.out_degree
+            histogram[degree] = histogram.get(degree, 0) + 1
+            stats.degree_sum += degree
+            if degree == 0:
+                stats.isolated[node.id] = None
+            if node.is_edge_to(node.id):
+                stats.loops[node.id] = None
+        if histogram:
+            stats.min_degree = min(histogram)
+            stats.max_degree = max(histogram)
+        stats.edge_count = stats.degree_sum
+        if g.type == GraphType.UNDIRECTED:
+            # каждое ребро записано у обоих концов, петля - один раз
+            stats.edge_count = (stats.degree_sum + len(stats.loops)) // 2
+        return stats
+
+    @property
+    def average_degree(self) -> float:
+        """Average out-degree (0.0 for an empty graph)."""
+        n = sum(self.histogram.values())
+        return self.degree_sum / n if n else 0.0
+
+    def node_added(self, node_id: Hashable) -> None:
+        """Record a new node (degree 0)."""
+        self.histogram[0] = self.histogram.get(0, 0) + 1
+        self.isolated[node_id] = None
+        self.min_degree = 0
+        if self.max_degree is None:
+            self.max_degree = 0
+
+    def node_removed(self, node_id: Hashable) -> None:
+        """Forget a node (its edges must have been removed, so its degree is 0)."""
+        histogram = self.histogram
+        histogram[0] -= 1
+        if not histogram[0]:
+            del histogram[0]
+        del self.isolated[node_id]
+        if not histogram:
+            self.min_degree = self.max_degree = None
+        elif self.min_degree == 0 and 0 not in histogram:
+            # различных степеней мало (не больше sqrt(2E)), перебор гистограммы дешёвый
+            self.min_degree = min(histogram)
+
+    def degree_changed(self, node_id: Hashable, old: int, new: int) -> None:
+        """Move a node from degree ``old`` to ``new = old ± 1``."""
+        histogram = self.histogram
+        histogram[old] -= 1
+        if not histogram[old]:
+            del histogram[old]
+        histogram[new] = histogram.get(new, 0) + 1
+        self.degree_sum += new - old
+        if old == 0:
+            del self.isolated[node_id]
+        if new == 0:
+            self.isolated[node_id] = None
+        # степень меняется на 1, поэтому новые min/max находятся без перебора
+        if new > self.max_degree or (old == self.max_degree and old not in histogram):
+            self.max_degree = new
+        if new < self.min_degree or (old == self.min_degree and old not in histogram):
+            self.min_degree = new
+
+    def __repr__(self):
+        return (f"GraphStats(edges: {self.edge_count}, degrees: {self.min_degree}..{self.max_degree}, "
+                f"isolated: {len(self.isolated)}, loops: {len(self.loops)})")
+
+
+class _CopyOnWrite:
+    """What a graph shares with its snapshots (see Graph.snapshot) and what it already copied."""
+    __slots__ = ("snapshots", "nodes_shared", "nodes", "edges")
+
+    def __init__(self, snapshots: 'weakref.WeakSet'):
+        self.snapshots = snapshots      # живые снимки; когда их нет, копировать больше нечего
+        self.nodes_shared = True        # словарь _nodes ещё общий с последним снимком
+        self.nodes: Set[Hashable] = set()   # узлы, скопированные (или созданные) после снимка
+        # id словарей атрибутов рёбер, которые граф сам выделил после снимка (_own_edge_attrs);
+        # словарь из add_edge сюда не попадает - он может быть общим с ребром снимка.
+        # снимок держит свои словари живыми, поэтому id не может достаться чужому общему словарю
+        self.edges: Set[int] = set()
+
+
 class Graph:
     """Graph data structure supporting directed and undirected graphs."""
 
@@ -177,6 +385,29 @@ class Graph:
         self.type = type # Тип графа: направленный или нет
         # _nodes — это словарь, где ключ — ID узла, а значение — объект Node.
         self._nodes: Dict[Hashable, Node] = {} # Все узлы графа, храним их в словаре
+        # растёт при каждом изменении структуры (узлы, рёбра); по нему сбрасываются кэши
+        self._structure_version = 0
+        # растёт при любом изменении (структура или атрибуты через node[...] = / edge[...] =)
+        self._version = 0
+        # последний результат to_dot: (версия, аргументы, текст)
+        self._dot_cache: Optional[tuple] = None
+        # число рёбер, гистограмма степеней и т.п. - обновляются в _create_node/_put_edge
+        self._stats = GraphStats()
+        # колоночное хранение атрибутов рёбер (edge_columns.py), включается при первом обращении
+        self._edge_columns = None
+        # вторичные индексы (indexes.py): (тип "node"/"edge", атрибут) -> AttrIndex
+        self._indexes: Dict[Tuple[str, str], Any] = {}
+        # копирование при записи, пока есть снимки (snapshot()); None - снимков нет
+        self._cow: Optional[_CopyOnWrite] = None
+        self._init_caches()
+
+    def _init_caches(self) -> None:
+        """Declare the caches of values derived from the graph: ``(version, value)``, None until first computed."""
+        self._dot_digest_cache: Optional[tuple] = None    # dot_digest()
+        self._edge_arrays_cache: Optional[tuple] = None   # compact.edge_arrays()
+        self._weighted_csr_cache: Optional[tuple] = None  # shortest_paths._weighted_csr()
+        self._component_cache: Optional[tuple] = None     # components.component_labels()
+        self._reach_cache: Optional[tuple] = None         # components.is_reachable()
 
     def add_node(self, node_id: Hashable, attrs: Optional[Dict[str, Any]] = None) -> Node:
         """
@@ -191,7 +422,7 @@ class Graph:
         if node_id in self._nodes:
             raise ValueError(f"Node {node_id} already exists")
         # если его нет, то создаем по айди, и добавляем атрибуты
-        return self._create_node(node_id, attrs if attrs is not None else {})
+        return self._create_node(node_id, attrs if attrs is not None else _NO_ATTRS)
 
     def add_edge(self, src_id: Hashable, dst_id: Hashable,
                  attrs: Optional[Dict[str, Any]] = None) -> Tuple[Node, Node]:
@@ -204,24 +435,186 @@ class Graph:
         :raises ValueError: If the edge already exists.
         """
 
-        # если атрибуты не были переданы, просто заменяем его на пустой словарь
-        attrs = attrs if attrs is not None else {}
+        # если атрибуты не были переданы, просто берём общий пустой словарь (свой выделится при записи)
+        attrs = attrs if attrs is not None else _NO_ATTRS
 
         # тут мы проверяем есть ли src_id/dst_id в self._nodes, если нет - просто создаем их
         if src_id not in self._nodes:
-            self._create_node(src_id, {})
+            self._create_node(src_id, _NO_ATTRS)
         if dst_id not in self._nodes:
-            self._create_node(dst_id, {})
+            self._create_node(dst_id, _NO_ATTRS)
 
         # создаем ребро между узлами по их айдишкам энд атрибутов
         self._set_edge(src_id, dst_id, attrs)
 
         # Если граф ненаправленный, то для каждого ребра нужно сохранить его в обе стороны.
-        if self.type == GraphType.UNDIRECTED:
+        # (петля src == dst хранится один раз)
+        if self.type == GraphType.UNDIRECTED and dst_id != src_id:
             self._set_edge(dst_id, src_id, attrs)
         # Возвращает два объекта Node — исходный и целевой. Это может быть полезно, если ты хочешь сразу дальше с ними работать.
         return (self._nodes[src_id], self._nodes[dst_id])
 
+    def add_nodes_from(self, nodes: Iterable[Hashable | Tuple[Hashable, Dict[str, Any]]],
+                       attrs: Optional[Dict[str, Any]] = None,
+                       on_duplicate: DuplicatePolicy = DuplicatePolicy.RAISE) -> int:
+        """
+        Add many nodes at once.
+
+        :param nodes: Node IDs, or ``(node_id, attrs)`` pairs.
+        :param attrs: Attributes copied to every new node without its own attrs (e.g. ``{"color": None}``).
+        :param on_duplicate: What to do with nodes that already exist (or repeat in the batch).
+        :return: Number of newly created nodes.
+        :raises ValueError: With DuplicatePolicy.RAISE, if any node exists; the graph is left unchanged.
+        """
+        def split(item):
+            # пара (id, словарь) - узел со своими атрибутами, всё остальное - просто id
+            if isinstance(item, tuple) and len(item) == 2 and isinstance(item[1], dict):
+                return item
+            return item, None
+
+        if on_duplicate == DuplicatePolicy.RAISE:
+            # сначала проверяем всю пачку, чтобы при ошибке граф остался нетронутым
+            nodes = [split(item) for item in nodes]
+            seen = set()
+            for node_id, _ in nodes:
+                if node_id in self._nodes or node_id in seen:
+                    raise ValueError(f"Node {node_id} already exists")
+                seen.add(node_id)
+        else:
+            nodes = map(split, nodes)
+
+        added = 0
+        for node_id, node_attrs in nodes:
+            node = self._nodes.get(node_id)
+            if node is None:
+                if node_attrs is None:
+                    node_attrs = dict(attrs) if attrs is not None else _NO_ATTRS
+                self._create_node(node_id, node_attrs)
+                added += 1
+            # голый id существующего узла ничего не заменяет - атрибуты остаются прежними
+            elif on_duplicate == DuplicatePolicy.OVERWRITE and node_attrs is not None:
+                if self._cow is not None:
+                    node = self._writable_node(node_id)
+                    if node_attrs is not _NO_ATTRS:
+                        node_attrs = dict(node_attrs)
+                node._attrs = node_attrs
+                self._version += 1
+                if self._indexes:
+                    self._index_node(node_id, node_attrs)
+        return added
+
+    def add_edges_from(self, edges: Iterable[Tuple],
+                       on_duplicate: DuplicatePolicy = DuplicatePolicy.RAISE) -> int:
+        """
+        Add many edges at once. Nodes are created automatically if missing.
+
+        Compared to calling add_edge in a loop, duplicates are checked once for
+        the whole batch instead of on every step.
+
+        :param edges: ``(src, dst)`` or ``(src, dst, attrs)`` tuples.
+        :param on_duplicate: What to do with edges that already exist (or repeat in the batch;
+            for undirected graphs ``(a, b)`` and ``(b, a)`` are the same edge).
+        :return: Number of newly created edges.
+        :raises ValueError: With DuplicatePolicy.RAISE, if any edge exists; the graph is left unchanged.
+        """
+        undirected = self.type == GraphType.UNDIRECTED
+        # (словарь узлов берём уже свой: после снимка _create_node заменил бы его копией)
+        nodes = self._own_nodes()
+
+        def split(edge):
+            # None - у элемента нет своих атрибутов
+            if len(edge) == 2:
+                return edge[0], edge[1], None
+            return edge
+
+        if on_duplicate == DuplicatePolicy.RAISE:
+            edges = [split(edge) for edge in edges]
+            seen = set()
+            for src_id, dst_id, _ in edges:
+                if ((src_id, dst_id) in seen or (undirected and (dst_id, src_id) in seen)
+                        or (src_id in nodes and dst_id in nodes[src_id]._neighbors)):
+                    raise ValueError(f"Edge {src_id}→{dst_id} already exists")
+                seen.add((src_id, dst_id))
+            del seen
+        else:
+            edges = map(split, edges)
+
+        added = 0
+        for src_id, dst_id, attrs in edges:
+            if src_id not in nodes:
+                self._create_node(src_id, _NO_ATTRS)
+            if dst_id not in nodes:
+                self._create_node(dst_id, _NO_ATTRS)
+            if dst_id in nodes[src_id]._neighbors:
+                # ребро без атрибутов не затирает атрибуты существующего
+                if on_duplicate != DuplicatePolicy.OVERWRITE or attrs is None:
+                    continue
+            else:
+                added += 1
+                if attrs is None:
+                    attrs = _NO_ATTRS
+            self._put_edge(src_id, dst_id, attrs)
+            if undirected and dst_id != src_id:
+                self._put_edge(dst_id, src_id, attrs)
+        return added
+
+    def remove_edge(self, src_id: Hashable, dst_id: Hashable) -> None:
+        """
+        Remove the edge src -> dst (for an undirected graph the edge between the two nodes).
+        The nodes stay in the graph. Cost is O(1).
+
+        :raises ValueError: If no such edge exists.
+        """
+        if src_id not in self._nodes or dst_id not in self._nodes[src_id]._neighbors:
+            raise ValueError(f"No edge from {src_id} to {dst_id}")
+        self._drop_edge(src_id, dst_id)
+        if self.type == GraphType.UNDIRECTED and dst_id != src_id:
+            self._drop_edge(dst_id, src_id)
+
+    def remove_node(self, node_id: Hashable) -> None:
+        """
+        Remove a node together with all its edges (outgoing and incoming).
+        Cost is O(degree) thanks to the reverse index.
+
+        :raises KeyError: If the node does not exist.
+        """
+        node = self._nodes[node_id]
+        for dst_id in list(node._neighbors):
+            self.remove_edge(node_id, dst_id)
+        # при живом снимке узел мог быть скопирован -> берём актуальный
+        node = self._nodes[node_id]
+        if node._predecessors is not node._neighbors:
+            for src_id in list(node._predecessors):
+                self.remove_edge(src_id, node_id)
+        self._drop_node(node_id)
+
+    def remove_edges_from(self, edges: Iterable[Tuple], missing_ok: bool = False) -> int:
+        """
+        Remove many edges at once (e.g. a diff of the topology).
+
+        :param edges: ``(src, dst)`` or ``(src, dst, attrs)`` tuples, attrs are ignored.
+        :param missing_ok: Skip edges that do not exist (or repeat in the batch) instead of raising.
+        :return: Number of removed edges.
+        :raises ValueError: If an edge does not exist and not ``missing_ok``; the graph is left unchanged.
+        """
+        undirected = self.type == GraphType.UNDIRECTED
+        # сначала собираем и проверяем всю пачку: так можно передать и g.edges(), и при ошибке граф не меняется
+        pairs = []
+        seen = set()
+        for edge in edges:
+            src_id, dst_id = edge[0], edge[1]
+            if ((src_id, dst_id) in seen or (undirected and (dst_id, src_id) in seen)
+                    or src_id not in self or dst_id not in self.node(src_id)._neighbors):
+                if missing_ok:
+                    continue
+                raise ValueError(f"No edge from {src_id} to {dst_id}")
+            seen.add((src_id, dst_id))
+            pairs.append((src_id, dst_id))
+        del seen
+        for src_id, dst_id in pairs:
+            self.remove_edge(src_id, dst_id)
+        return len(pairs)
+
     # __contains__ делает граф удобным для использования извне
     # типа чтобы люди извне могли искать узлы так: if "A" in g. Не прописывая название словаря и тд.
     def __contains__(self, node_id: Hashable) -> bool:
@@ -254,12 +647,231 @@ class Graph:
         """
         return self._nodes[node_id]
 
+    def edges(self, data: bool | str = False, default: Any = None) -> Iterator[tuple]:
+        """
+        Iterate over all edges without creating Node/Edge objects.
+
+        Every edge of an undirected graph is reported once (from the endpoint
+        that comes first in node order). Attribute dicts are the graph's own,
+        so changing them changes the graph; edges created without attributes
+        share a read-only empty mapping until an attribute is set through Edge.
+
+        :param data: False -> ``(src, dst)``, True -> ``(src, dst, attrs)``,
+            attribute name -> ``(src, dst, attrs.get(name, default))``.
+        :param default: Value used when ``data`` is a name the edge does not have.
+        :return: Iterator of tuples.
+        """
+        # вместо множества всех пар храним только уже пройденные узлы (O(V), а не O(E))
+        done = set() if self.type == GraphType.UNDIRECTED else None
+        for src_id, node in self._nodes.items():
+            neighbors = node._neighbors
+            if done is None:
+                if data is False:
+                    for dst_id in neighbors:
+                        yield (src_id, dst_id)
+                elif data is True:
+                    for dst_id, attrs in neighbors.items():
+                        yield (src_id, dst_id, attrs)
+                else:
+                    for dst_id, attrs in neighbors.items():
+                        yield (src_id, dst_id, attrs.get(data, default))
+                continue
+            for dst_id, attrs in neighbors.items():
+                if dst_id in done:
+                    continue
+                if data is False:
+                    yield (src_id, dst_id)
+                elif data is True:
+                    yield (src_id, dst_id, attrs)
+                else:
+                    yield (src_id, dst_id, attrs.get(data, default))
+            done.add(src_id)
+
+    def mark_modified(self) -> None:
+        """
+        Tell the graph its attributes were changed behind its back (e.g. through
+        the dicts returned by edges(data=True)), so cached DOT text and renders
+        are not reused. Secondary indexes are rebuilt.
+        """
+        self._version += 1
+        self._reindex()
+
+    def compact(self) -> 'Graph':
+        """
+        Return a read-only copy of the graph in compact CSR storage.
+
+        Node ids are interned to dense integers, adjacency is kept in two flat
+        arrays (offsets + targets) and attributes in columns, see compact.py.
+        The Node/Edge API keeps working on the result; use ``thaw()`` on it to
+        get a mutable Graph back.
+        """
+        # импорт внутри функции, иначе compact.py и этот файл импортировали бы друг друга
+        from compact import CompactGraph
+        return CompactGraph.from_graph(self)
+
+    def save(self, path: str) -> None:
+        """
+        Save the graph to a binary snapshot file, see graphfile.save_graph.
+
+        Open it again with ``graphfile.open_graph(path)``: the file is
+        memory-mapped, so even a huge graph is usable right away.
+        """
+        from graphfile import save_graph
+        save_graph(self, path)
+
+    @property
+    def edge_columns(self):
+        """
+        Edge attributes stored column by column (see edge_columns.py), for bulk
+        operations like ``g.edge_columns["weight"] += 1``.
+
+        The first access moves all edge attribute dicts into columns (O(E));
+        from then on new edges are stored there too. ``Edge`` and the dicts from
+        ``edges(data=True)`` keep working as dict-like records.
+        """
+        if self._edge_columns is None:
+            from edge_columns import EdgeColumns
+            if self._cow_active() is not None:
+                # записи рёбер заменяются на месте -> сначала отделяем все узлы от снимков
+                for node_id in list(self._nodes):
+                    self._writable_node(node_id)
+                self._cow = None
+            self._edge_columns = EdgeColumns.from_graph(self)
+            # у рёбер теперь другие объекты-записи -> индексы по рёбрам пересобираем
+            self._reindex("edge")
+        return self._edge_columns
+
+    def edge_attr(self, name: str):
+        """Return one edge attribute of all edges as a column, ``g.edge_columns[name]``."""
+        return self.edge_columns[name]
+
+    def create_index(self, kind: str, attr: str):
+        """
+        Create (or return the existing) secondary index of a node or edge attribute.
+
+        The index is kept up to date by Node/Edge ``__setitem__``, node and edge
+        insertion and bulk column operations, so ``find(value)`` and
+        ``range(lo, hi)`` cost O(result) instead of a scan, see indexes.py.
+        Changes made to attribute dicts directly need ``mark_modified()``, as
+        do writes to one dict passed to several ``add_edge`` calls (the edges
+        share it, but only the edge written through is reindexed).
+
+        :param kind: "node" or "edge".
+        :param attr: Attribute name, e.g. "color" or "type".
+        :return: The AttrIndex.
+        """
+        if kind not in ("node", "edge"):
+            raise ValueError(f"Index kind must be 'node' or 'edge', not {kind!r}")
+        index = self._indexes.get((kind, attr))
+        if index is None:
+            from indexes import AttrIndex
+            index = self._indexes[(kind, attr)] = AttrIndex(kind, attr)
+            self._fill_index(index)
+        return index
+
+    def get_index(self, kind: str, attr: str):
+        """Return the index created by create_index(), or None."""
+        return self._indexes.get((kind, attr))
+
+    def drop_index(self, kind: str, attr: str) -> None:
+        """Remove a secondary index. :raises KeyError: If there is no such index."""
+        del self._indexes[(kind, attr)]
+
+    def _edge_key(self, src_id: Hashable, dst_id: Hashable) -> Hashable:
+        """Key of an edge in edge indexes: its ends, unordered for an undirected graph (both directions are one edge)."""
+        if self.type == GraphType.UNDIRECTED:
+            return frozenset((src_id, dst_id))
+        return (src_id, dst_id)
+
+    def _fill_index(self, index) -> None:
+        index.clear()
+        attr = index.attr
+        if index.kind == "node":
+            for node in self:
+                if attr in node._attrs:
+                    index.set(node.id, node._attrs[attr])
+        else:
+            for src_id, dst_id, attrs in self.edges(data=True):
+                if attr in attrs:
+                    index.set(self._edge_key(src_id, dst_id), attrs[attr], (src_id, dst_id))
+
+    def _reindex(self, kind: Optional[str] = None, attr: Optional[str] = None) -> None:
+        """Rebuild the indexes of the given kind / attribute (all if None)."""
+        for index in self._indexes.values():
+            if (kind is None or index.kind == kind) and (attr is None or index.attr == attr):
+                self._fill_index(index)
+
+    def _update_index(self, kind: str, attr: str, key: Hashable, val: Any,
+                      ends: Optional[Tuple[Hashable, Hashable]] = None) -> None:
+        index = self._indexes.get((kind, attr))
+        if index is not None:
+            index.set(key, val, ends)
+
+    def _update_edge_index(self, src_id: Hashable, dst_id: Hashable, attr: str, val: Any) -> None:
+        """Attribute ``attr`` of the edge src -> dst was set to ``val`` (called from Edge.__setitem__)."""
+        self._update_index("edge", attr, self._edge_key(src_id, dst_id), val, (src_id, dst_id))
+
+    def _index_node(self, node_id: Hashable, attrs: Dict[str, Any]) -> None:
+        for (kind, attr), index in self._indexes.items():
+            if kind != "node":
+                continue
+            if attr in attrs:
+                index.set(node_id, attrs[attr])
+            else:
+                index.remove(node_id)
+
+    def _index_edge(self, src_id: Hashable, target_id: Hashable, attrs: Dict[str, Any]) -> None:
+        key = self._edge_key(src_id, target_id)
+        for (kind, attr), index in self._indexes.items():
+            if kind != "edge":
+                continue
+            if attr in attrs:
+                index.set(key, attrs[attr], (src_id, target_id))
+            else:
+                index.remove(key)
+
+    def reverse_view(self) -> 'Graph':
+        """Return a read-only view of the graph with all edges reversed, without copying (see views.py)."""
+        from views import ReversedView
+        return ReversedView(self)
+
+    def undirected_view(self) -> 'Graph':
+        """Return a read-only view of the graph with edge directions ignored, without copying."""
+        from views import UndirectedView
+        return UndirectedView(self)
+
+    def subgraph_view(self, nodes: Optional[Iterable[Hashable]] = None,
+                      node_filter: Optional[Callable[[Hashable, Dict[str, Any]], bool]] = None,
+                      edge_filter: Optional[Callable[[Hashable, Hashable, Dict[str, Any]], bool]] = None) -> 'Graph':
+        """
+        Return a read-only view of a part of the graph, without copying.
+
+        :param nodes: IDs of the nodes to keep (all nodes if None).
+        :param node_filter: Called as ``node_filter(node_id, attrs)``, False hides the node.
+        :param edge_filter: Called as ``edge_filter(src_id, dst_id, attrs)``, False hides the edge.
+        """
+        from views import SubgraphView
+        return SubgraphView(self, nodes, node_filter, edge_filter)
+
     def _create_node(self, node_id: Hashable, attrs: Optional[Dict[str, Any]] = None) -> Node:
         """Internal (внутренний) method to create a node. Работает только внутри данного класса Graph
         Короч, сверху мы вызываем эту функцию по созданию узла. Тут мы просто создали эту функцию
         Видишь, вот тут вот мы и вызываем класс Node"""
         node = Node(self, node_id, attrs)
-        self._nodes[node_id] = node
+        if self._cow is None:
+            self._nodes[node_id] = node
+        else:
+            self._own_nodes()[node_id] = node
+            if self._cow is not None:
+                self._cow.nodes.add(node_id)
+                # словарь вызывающего может быть общим с узлом снимка -> храним копию
+                if attrs is not None and attrs is not _NO_ATTRS:
+                    node._attrs = dict(attrs)
+        self._stats.node_added(node_id)
+        if self._indexes and attrs is not None:
+            self._index_node(node_id, attrs)
+        self._structure_version += 1
+        self._version += 1
         return node
 
     def _set_edge(self, src_id: Hashable, target_id: Hashable, attrs: Dict[str, Any]) -> None:
@@ -271,98 +883,438 @@ class Graph:
         # поэтому тут мы можем ссылатсья на словарь, созданный в другом обьекте
         if target_id in self._nodes[src_id]._neighbors:
             raise ValueError(f"Edge {src_id}→{target_id} already exists")
+        self._put_edge(src_id, target_id, attrs)
+
+    def _put_edge(self, src_id: Hashable, target_id: Hashable, attrs: Dict[str, Any]) -> None:
+        """Internal method to store a directed edge without any checks (replaces an existing one)."""
+        if self._edge_columns is not None:
+            # атрибуты ребра живут в колонках, в _neighbors кладём ссылку на запись
+            attrs = self._edge_columns._record(src_id, target_id, attrs)
+        src = self._nodes[src_id] if self._cow is None else self._writable_node(src_id)
+        neighbors = src._neighbors
+        old = neighbors.get(target_id)
+        if old is None:
+            # новое направление ребра -> степень src растёт на 1
+            stats = self._stats
+            degree = len(neighbors)
+            stats.degree_changed(src_id, degree, degree + 1)
+            if src_id == target_id:
+                stats.loops[src_id] = None
+            # неориентированное ребро пишется дважды (a->b, потом b->a), считаем его при первой записи
+            if (self.type == GraphType.DIRECTED or src_id == target_id
+                    or src_id not in self._nodes[target_id]._neighbors):
+                stats.edge_count += 1
         #  добавляет ребро (связь) из узла src_id в узел target_id, и при этом сохраняет атрибуты ребра в словаре.
-        self._nodes[src_id]._neighbors[target_id] = attrs
+        neighbors[target_id] = attrs
+        self._structure_version += 1
+        self._version += 1
+        # обратный индекс; у неориентированного графа _predecessors и _neighbors - один словарь
+        if self.type == GraphType.DIRECTED:
+            target = self._nodes[target_id] if self._cow is None else self._writable_node(target_id)
+            target._predecessors[src_id] = attrs
+        if self._indexes:
+            self._index_edge(src_id, target_id, attrs)
+
+    def _drop_edge(self, src_id: Hashable, target_id: Hashable) -> None:
+        """Internal method to remove one direction of an edge without checks (the counterpart of _put_edge)."""
+        src = self._nodes[src_id] if self._cow is None else self._writable_node(src_id)
+        neighbors = src._neighbors
+        attrs = neighbors.pop(target_id)
+        stats = self._stats
+        degree = len(neighbors)
+        stats.degree_changed(src_id, degree + 1, degree)
+        if src_id == target_id:
+            del stats.loops[src_id]
+        # неориентированное ребро удаляется в два шага (a->b, потом b->a):
+        # считаем его удалённым на первом, запись атрибутов убираем на последнем
+        single = self.type == GraphType.DIRECTED or src_id == target_id
+        if single or src_id in self._nodes[target_id]._neighbors:
+            stats.edge_count -= 1
+        if self.type == GraphType.DIRECTED:
+            target = self._nodes[target_id] if self._cow is None else self._writable_node(target_id)
+            del target._predecessors[src_id]
+        self._structure_version += 1
+        self._version += 1
+        if single or src_id not in self._nodes[target_id]._neighbors:
+            self._edge_removed(src_id, target_id, attrs)
+
+    def _edge_removed(self, src_id: Hashable, target_id: Hashable, attrs: Dict[str, Any]) -> None:
+        """The edge src -> dst with these attributes is gone: drop it from indexes and edge columns."""
+        if self._indexes:
+            key = self._edge_key(src_id, target_id)
+            for (kind, _), index in self._indexes.items():
+                if kind == "edge":
+                    index.remove(key)
+        if self._edge_columns is not None:
+            self._edge_columns._remove(attrs)
+
+    def _drop_node(self, node_id: Hashable) -> None:
+        """Internal method to remove a node that has no edges left (the counterpart of _create_node)."""
+        del self._own_nodes()[node_id]
+        if self._cow is not None:
+            self._cow.nodes.discard(node_id)
+        self._node_removed(node_id)
+
+    def _node_removed(self, node_id: Hashable) -> None:
+        self._stats.node_removed(node_id)
+        for (kind, _), index in self._indexes.items():
+            if kind == "node":
+                index.remove(node_id)
+        self._structure_version += 1
+        self._version += 1
+
+    def _own_node_attrs(self, node: Node) -> Dict[str, Any]:
+        """
+        Return the attribute dict to write to for ``node``: its own one instead
+        of the shared empty one, and not one shared with a snapshot. A Node
+        object that belongs to a snapshot is left as it is.
+        """
+        live = self._writable_node(node.id)
+        if live._attrs is _NO_ATTRS:
+            live._attrs = {}
+        return live._attrs
+
+    def _own_edge_attrs(self, src_id: Hashable, dst_id: Hashable) -> Dict[str, Any]:
+        """The same for the edge src -> dst, replaced in every place that refers to it (both ends, reverse index)."""
+        attrs = self._nodes[src_id]._neighbors[dst_id]
+        cow = self._cow_active()
+        if attrs is not _NO_ATTRS and (cow is None or id(attrs) in cow.edges):
+            return attrs
+        own = {} if attrs is _NO_ATTRS else dict(attrs)
+        if cow is not None:
+            cow.edges.add(id(own))
+        self._writable_node(src_id)._neighbors[dst_id] = own
+        dst = self._writable_node(dst_id)
+        if self.type == GraphType.DIRECTED:
+            dst._predecessors[src_id] = own
+        else:
+            dst._neighbors[src_id] = own
+        return own
+
+    def snapshot(self) -> 'Graph':
+        """
+        Return an immutable snapshot of the graph in O(1).
+
+        The snapshot is a read-only graph (see views.GraphSnapshot) that keeps
+        showing the current nodes, edges and attributes however the graph
+        changes later, so other threads can read it without locking while one
+        writer goes on. Nothing is copied up front: after a snapshot the graph
+        copies the node dict once and every node (O(degree)) or edge attribute
+        dict the first time it changes it. Once all snapshots are garbage, the
+        graph stops copying.
+
+        Change attributes through Node/Edge (``node[...] = ...``), not through
+        the dicts returned by edges(data=True), which may be the snapshot's.
+        Node/Edge objects taken before a snapshot keep showing the snapshot's
+        state after a change; get them again with node().
+
+        :raises TypeError: If the edge attributes are stored in columns.
+        """
+        if self._edge_columns is not None:
+            raise TypeError("Graphs with edge columns do not support snapshots")
+        from views import GraphSnapshot
+        cow = self._cow_active()
+        snapshots = cow.snapshots if cow is not None else weakref.WeakSet()
+        snap = GraphSnapshot(self)
+        snapshots.add(snap)
+        self._cow = _CopyOnWrite(snapshots)
+        return snap
+
+    def _cow_active(self) -> Optional[_CopyOnWrite]:
+        """Copy-on-write state, or None when no snapshot that could see a change is alive."""
+        cow = self._cow
+        if cow is not None and not cow.snapshots:
+            cow = self._cow = None
+        return cow
+
+    def _own_nodes(self) -> Dict[Hashable, Node]:
+        """The node dict to add to / remove from (a copy of the snapshot's one on the first change)."""
+        cow = self._cow_active()
+        if cow is not None and cow.nodes_shared:
+            self._nodes = dict(self._nodes)
+            cow.nodes_shared = False
+        return self._nodes
+
+    def _writable_node(self, node_id: Hashable) -> Node:
+        """The Node to change; while a snapshot shares it, a private copy replaces it first (O(degree))."""
+        cow = self._cow_active()
+        if cow is None or node_id in cow.nodes:
+            return self._nodes[node_id]
+        nodes = self._own_nodes()
+        shared = nodes[node_id]
+        node = Node(self, node_id, shared._attrs if shared._attrs is _NO_ATTRS else dict(shared._attrs))
+        node._neighbors = dict(shared._neighbors)
+        node._predecessors = (node._neighbors if self.type == GraphType.UNDIRECTED
+                              else dict(shared._predecessors))
+        nodes[node_id] = node
+        cow.nodes.add(node_id)
+        return node
+
+    @property
+    def stats(self) -> GraphStats:
+        """
+        Edge count, degree histogram, isolated nodes, self-loops and min/max
+        degree, kept up to date on every change (reading them is O(1)).
+        """
+        return self._stats
 
     def __repr__(self):
-        '''node.out_degree - ссылаемся на функцию out_degree, который был создан в классе node. Считает сколько ребер исходит из узла
-          self._nodes.values() — берём все узлы графа.
-          конкретно в нижней строке мы просто считаем общее количество всех рёбер в графе'''
-        edges = sum(node.out_degree for node in self._nodes.values())
+        '''число рёбер больше не считаем обходом всех узлов (sum(node.out_degree) // 2 ошибался на петлях),
+          а берём из счётчика, который обновляется при каждом добавлении ребра'''
+        # тут просто выводим в целом сколько узлов и ребер есть в graph
+        return f"Graph({self.type}, nodes: {len(self._nodes)}, edges: {self._stats.edge_count})"
 
-        # Если граф неориентированный, то делим количество рёбер пополам (убираем дубли)
-        if self.type == GraphType.UNDIRECTED:
-            edges //= 2
+    def dot_node_attrs(self, node: Node, label_attr: str = "label") -> Dict[str, Any]:
+        """
+        Return the Graphviz attributes of one node for the DOT output.
+        Subclasses override this hook to style nodes (see ColorGraph).
 
-        # тут просто выводим в целом сколько узлов и ребер есть в graph
-        return f"Graph({self.type}, nodes: {len(self._nodes)}, edges: {edges})"
+        :param node: The node being written.
+        :param label_attr: Node attribute used as the label (the node ID if missing).
+        """
+        # берем его label_attr, если есть, иначе просто по айди
+        return {"label": node._attrs.get(label_attr, node.id)}
 
-    def to_dot(self, label_attr:str ="label", weight_attr:str = "weight") -> str:
+    def iter_dot(self, label_attr: str = "label", weight_attr: str = "weight") -> Iterator[str]:
         """
-        Generate a simple Graphviz (DOT) representation of the graph. Generated by ChatGPT.
+        Generate the Graphviz (DOT) representation line by line (without newlines),
+        so it can be streamed without building the whole text in memory.
 
         label_attr: имя атрибута узла, которое будет отображаться как подпись (например, "label"), его типа тоже надо прописывать отдельно прям label деп
         weight_attr: имя атрибута ребра, которое будет отображаться как вес или подпись (например, "weight")
-
-        :return: String in DOT language.
         """
-        lines = []
         name = "G"
         # connector — символ связи
         connector = "->" if self.type == GraphType.DIRECTED else "--"
 
-        lines.append(f'digraph {name} {{' if self.type == GraphType.DIRECTED else f'graph {name} {{')
+        yield f'digraph {name} {{' if self.type == GraphType.DIRECTED else f'graph {name} {{'
 
         # Nodes
-        for node_id in self.node_ids():
-            node = self.node(node_id)
-            # берем его label_attr, если есть, иначе просто по айди
-            label = node[label_attr] if label_attr in node._attrs else str(node_id)
-            lines.append(f'    "{node_id}" [label="{label}"];')
+        for node in self:
+            attrs = ", ".join(f'{key}="{val}"' for key, val in self.dot_node_attrs(node, label_attr).items())
+            yield f'    "{node.id}" [{attrs}];'
 
         # Edges
-        # set — это множество в Python. Это неупорядоченная коллекция уникальных элементов.
-        # нужна для того, чтобы не добавить одни и те же рёбра дважды, если граф неориентированный (UNDIRECTED).
-        seen = set()
-        for node_id in self.node_ids():
-            node = self.node(node_id)
-            for dst_id in node.neighbor_ids:
-                # and (dst_id, node_id) - добавлено в обратном порядке
-                if self.type == GraphType.UNDIRECTED and (dst_id, node_id) in seen:
-                    continue
-                # добавляем лишь в том случае, если при проверке вышло False
-                seen.add((node_id, dst_id))
-                # Получаем объект ребра
-                edge = node.to(dst_id)
-                # присваивает метку (label) ребру, если у этого ребра есть атрибут с нужным именем (по умолчанию это "weight").
-                label = edge[weight_attr] if weight_attr in edge._attrs else ""
-                # connector - прописали сверху, просто знак, указывающий DIRECTED OR NOT
-                lines.append(f'    "{node_id}" {connector} "{dst_id}" [label="{label}"];')
+        # edges() сам отдаёт каждое неориентированное ребро один раз, без объектов Edge
+        # и без множества всех пар рёбер (помнит только пройденные узлы)
+        for node_id, dst_id, attrs in self.edges(data=True):
+            # присваивает метку (label) ребру, если у этого ребра есть атрибут с нужным именем (по умолчанию это "weight").
+            label = attrs.get(weight_attr, "")
+            # connector - прописали сверху, просто знак, указывающий DIRECTED OR NOT
+            yield f'    "{node_id}" {connector} "{dst_id}" [label="{label}"];'
+
+        yield "}"
+
+    def write_dot(self, file, label_attr: str = "label", weight_attr: str = "weight") -> None:
+        """
+        Stream the DOT representation into a text file-like object
+        (an open file, sys.stdout, stdin of a `dot` process, ...).
 
-        # just closing the list
-        lines.append("}")
-        # Склеиваем всё в одну строку
-        return "\n".join(lines)
+        :param file: Object with a ``write(str)`` method.
+        """
+        for line in self.iter_dot(label_attr, weight_attr):
+            file.write(line)
+            file.write("\n")
+
+    def to_dot(self, label_attr:str ="label", weight_attr:str = "weight") -> str:
+        """
+        Generate a simple Graphviz (DOT) representation of the graph. Generated by ChatGPT.
+        For large graphs prefer write_dot(), which does not keep the whole text in memory.
+        The result is reused until the graph is modified.
+
+        :return: String in DOT language.
+        """
+        key = (self._version, label_attr, weight_attr)
+        if self._dot_cache is None or self._dot_cache[0] != key:
+            # Склеиваем всё в одну строку
+            self._dot_cache = (key, "\n".join(self.iter_dot(label_attr, weight_attr)))
+        return self._dot_cache[1]
+
+    def dot_digest(self, label_attr: str = "label", weight_attr: str = "weight") -> str:
+        """
+        Return the SHA-256 hex digest of the DOT text, computed while streaming
+        it (the text itself is not kept) and reused until the graph is modified.
+        """
+        key = (self._version, label_attr, weight_attr)
+        cached = self._dot_digest_cache
+        if cached is None or cached[0] != key:
+            digest = hashlib.sha256()
+            for line in self.iter_dot(label_attr, weight_attr):
+                digest.update(line.encode("utf-8"))
+                digest.update(b"\n")
+            cached = self._dot_digest_cache = (key, digest.hexdigest())
+        return cached[1]
+
+    def render(self, fmt: str = "svg", engine: str = "dot", cache: bool | RenderCache = True) -> bytes:
+        """
+        Render the graph with Graphviz and return the image bytes.
+
+        Results are cached by the hash of the DOT text, the format and the layout
+        engine, so rendering an unchanged graph again does not start Graphviz.
+
+        :param fmt: Graphviz output format ("svg", "png", "pdf", ...).
+        :param engine: Layout engine ("dot", "neato", "circo", ...).
+        :param cache: True for render_cache.default_cache, False to disable caching,
+            or a RenderCache instance.
+        :raises RuntimeError: If Graphviz 'dot' command fails.
+        """
+        if cache is True:
+            cache = render_cache.default_cache
+        key = render_key(self.dot_digest(), fmt, engine) if cache else None
+        if cache:
+            data = cache.get(key)
+            if data is not None:
+                return data
+        data = self._run_dot(["dot", f"-K{engine}", f"-T{fmt}"], capture=True)
+        if cache:
+            cache.put(key, data)
+        return data
+
+    def _run_dot(self, args: list, capture: bool = False) -> Optional[bytes]:
+        """
+        Run Graphviz with the DOT text streamed into its stdin.
+
+        A separate thread writes the input while this one reads the output, so
+        neither side blocks on a full pipe; stderr goes to a temporary file.
 
+        :param args: Command line, e.g. ``["dot", "-Tsvg"]``.
+        :param capture: Return the standard output as bytes.
+        :raises RuntimeError: If the command exits with an error.
+        """
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(args, stdin=subprocess.PIPE,
+                                       stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+                                       stderr=stderr)
+
+            # ошибка при генерации DOT (в потоке-писателе), её поднимаем в вызывающем потоке
+            failed = []
+
+            def feed():
+                stdin = io.TextIOWrapper(process.stdin, encoding="utf-8")
+                try:
+                    self.write_dot(stdin)
+                except BrokenPipeError:
+                    # dot завершился раньше времени - причину покажет код возврата
+                    pass
+                except BaseException as e:
+                    # иначе dot отрисовал бы обрезанный текст как готовый граф (и он попал бы в кэш)
+                    failed.append(e)
+                    process.kill()
+                finally:
+                    # канал закрываем всегда: close() закроет его, даже если досылка буфера не удалась
+                    try:
+                        stdin.close()
+                    except OSError:
+                        pass
+
+            writer = threading.Thread(target=feed, daemon=True)
+            writer.start()
+            output = process.stdout.read() if capture else None
+            writer.join()
+            if failed:
+                process.wait()
+                raise failed[0]
+            if process.wait() != 0:
+                stderr.seek(0)
+                message = stderr.read().decode("utf-8", "replace")
+                raise RuntimeError(f"Graphviz '{args[0]}' command failed with exit code "
+                                   f"{process.returncode}: {message}")
+            return output
+
+
+    async def _run_dot_async(self, args: list, timeout: Optional[float] = None) -> bytes:
+        """
+        Asyncio version of _run_dot: stream the DOT text into Graphviz and return its stdout.
+
+        :param args: Command line, e.g. ``["dot", "-Tsvg"]``.
+        :param timeout: Seconds before the process is killed.
+        :raises asyncio.TimeoutError: If Graphviz does not finish in time.
+        :raises RuntimeError: If the command exits with an error.
+        """
+        process = await asyncio.create_subprocess_exec(
+            *args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        async def feed():
+            try:
+                batch = []
+                for line in self.iter_dot():
+                    batch.append(line)
+                    # пишем пачками строк и ждём drain, чтобы не раздувать буфер
+                    if len(batch) >= 1000:
+                        process.stdin.write(("\n".join(batch) + "\n").encode("utf-8"))
+                        batch.clear()
+                        await process.stdin.drain()
+                process.stdin.write(("\n".join(batch) + "\n").encode("utf-8"))
+                await process.stdin.drain()
+                process.stdin.close()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        async def run():
+            _, output, errors = await asyncio.gather(feed(), process.stdout.read(), process.stderr.read())
+            await process.wait()
+            return output, errors
+
+        try:
+            output, errors = await asyncio.wait_for(run(), timeout)
+        except BaseException:
+            # тайм-аут, ошибка генерации DOT или отмена задачи -> процесс не должен остаться висеть
+            if process.returncode is None:
+                process.kill()
+            await process.wait()
+            raise
+        if process.returncode != 0:
+            raise RuntimeError(f"Graphviz '{args[0]}' command failed with exit code "
+                               f"{process.returncode}: {errors.decode('utf-8', 'replace')}")
+        return output
+
+    async def render_async(self, fmt: str = "svg", engine: str = "dot",
+                           cache: bool | RenderCache = True, timeout: Optional[float] = None) -> bytes:
+        """
+        Asyncio version of render(): does not block the event loop while Graphviz runs.
 
-    def export_to_png(self, filename: str = None) -> None:
+        :param timeout: Seconds before the Graphviz process is killed (asyncio.TimeoutError).
+        """
+        if cache is True:
+            cache = render_cache.default_cache
+        key = render_key(self.dot_digest(), fmt, engine) if cache else None
+        if cache:
+            data = cache.get(key)
+            if data is not None:
+                return data
+        data = await self._run_dot_async(["dot", f"-K{engine}", f"-T{fmt}"], timeout)
+        if cache:
+            cache.put(key, data)
+        return data
+
+    async def export_async(self, filename: str, fmt: str = "png", engine: str = "dot",
+                           timeout: Optional[float] = None) -> None:
+        """
+        Asyncio version of export_to_png for any Graphviz format: ``await g.export_async("g.svg", "svg")``.
+
+        :raises asyncio.TimeoutError: If Graphviz does not finish in time.
+        :raises RuntimeError: If Graphviz 'dot' command fails.
+        """
+        data = await self.render_async(fmt, engine, timeout=timeout)
+        with open(filename, "wb") as f:
+            f.write(data)
+
+    def export_to_png(self, filename: str = "graph.png") -> None:
         """
         Export the graph to a PNG file using Graphviz (dot). Graphviz (https://graphviz.org/)
          must be installed.
 
-        filename: str = None — значит, что параметр filename необязательный. Если не указать, будет просто None
+        filename: str = "graph.png" — значит, что параметр filename необязательный. Если не указать, картинка запишется в graph.png
         -> None означает, что функция ничего не возвращает (возвращает None).
 
-        :param filename: Output PNG filename.
+        :param filename: Output PNG filename (``graph.png`` in the current directory by default).
         :raises RuntimeError: If Graphviz 'dot' command fails.
         """
-
-        # Генерируем текстовое описание графа в формате DOT
-        # тут self, потому что обе функции находятся внутри одного класса и класс сам к себе обращается
-        dot_data = self.to_dot()
-        try:
-            # there we use the library subprocess
-            # that function is for сгенерировать изображение графа
-            # Запускаем внешнюю программу Graphviz (команду dot), чтобы создать PNG-файл
-            subprocess.run(
-                ["dot", "-Tpng", "-o", filename], # Команда: dot, формат вывода PNG, файл вывода - filename
-                input=dot_data, # Передаём описание графа в программу dot через стандартный ввод
-                text=True, # Ввод/вывод как текст (а не байты)
-                check=True  # Если команда вернёт ошибку — вызовет исключение
-            )
-        except subprocess.CalledProcessError as e:
-            # Если команда dot не сработала (например, Graphviz не установлен или ошибка в dot_data)
-            raise RuntimeError(f"Graphviz 'dot' command failed: {e}") from e
+        # описание графа в формате DOT пишется прямо в stdin процесса dot, без промежуточной строки;
+        # если этот граф уже рендерился и не менялся, dot вообще не запускается
+        data = self.render("png")
+        with open(filename, "wb") as f:
+            f.write(data)
 
     def _repr_svg_(self):
         """
@@ -380,20 +1332,7 @@ class Graph:
         """
         # Импортируем класс SVG для отображения картинок в Jupyter
         from IPython.display import SVG
-        dot_data = self.to_dot()
-        try:
-            process = subprocess.run(
-                ['dot', '-Tsvg'],
-                input=dot_data,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                check=True
-            )
-            return SVG(data=process.stdout)
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Graphviz 'dot' command failed: {e} with stderr: {e.stderr.decode('utf-8')}") from e
-        
+        return SVG(data=self.render("svg").decode("utf-8"))        
 
 """
         from IPython.display import SVG
@@ -2,6 +2,7 @@
 # ✅ Rozšířené úlohy ke zkoušce – variace na práci s API z diktyonphi.py
 
 from diktyonphi import Graph, GraphType
+from algorithms import find_cycle, iter_simple_paths
 
 # ─────────────────────────────────────────────────────────────
 # 🔹 Téma 9: Uzly s výstupním stupněm větším než 2
@@ -18,84 +19,43 @@ def uzly_s_vysokym_stupnem(g, hranice=2):
 Возвращает список путей, где каждый путь — это список узлов, через которые мы прошли.'''
 
 # path изначально None, чтобы можно было создавать новый пустой список при первом вызове
+# теперь без рекурсии: пути берём из генератора iter_simple_paths (algorithms.py),
+# который идёт явным стеком и помнит узлы текущего пути во множестве
 def najdi_vsechny_cesty(g, start_id, end_id, path=None):
-    path = path or []
-    # Создаём новый список пути, добавляя текущий узел start_id в конец.
-    # создаёт новую копию списка, которая содержит все старые элементы плюс новый
-    path = path + [start_id]
-
-    # Если текущий узел совпал с конечным — значит, мы нашли путь.
-    # Обратите внимание: возвращаем именно список путей
-    if start_id == end_id:
-        return [path]
-    
-    # Если узла start_id нет в графе g — возвращаем пустой список (пути не существует).
-    if start_id not in g:
-        return []
-    
-    # Создаём пустой список для накопления всех найденных путей.
-    paths = []
-    for neighbor in g.node(start_id).neighbor_ids:
-        # Проверяем, чтобы не заходить в узлы, которые уже были в текущем пути (чтобы избежать циклов/зацикливания).
-        if neighbor not in path:
-            # Рекурсивно вызываем функцию для соседа, передавая обновлённый путь path.
-            nove = najdi_vsechny_cesty(g, neighbor, end_id, path)
-            # Добавляем все найденные пути из рекурсивного вызова к нашему списку путей paths
-            paths.extend(nove)
-    return paths
+    # path - уже пройденный префикс: его узлы нельзя посещать повторно,
+    # поэтому поиск в них просто не заходит (а не фильтрует готовые пути)
+    prefix = list(path or [])
+    return [prefix + cesta for cesta in iter_simple_paths(g, start_id, end_id, avoid=prefix)]
 
 # ─────────────────────────────────────────────────────────────
 # 🔹 Téma 11: Detekce obecného cyklu v grafu
 # Úkol: Zjistěte, zda graf obsahuje libovolný cyklus.
 # ─────────────────────────────────────────────────────────────
 def existuje_cyklus(g):
-    visited = set()
-    stack = set()
-
-    def dfs(node_id):
-        visited.add(node_id)
-        stack.add(node_id)
-        for neighbor_id in g.node(node_id).neighbor_ids:
-            if neighbor_id not in visited:
-                if dfs(neighbor_id):
-                    return True
-            elif neighbor_id in stack:
-                return True
-        stack.remove(node_id)
-        return False
-
-    for node in g:
-        if node.id not in visited:
-            if dfs(node.id):
-                return True
-    return False
+    # итеративный DFS из algorithms.py: нет RecursionError на глубоких графах,
+    # а find_cycle вдобавок умеет вернуть сам цикл
+    return find_cycle(g) is not None
 
 # ─────────────────────────────────────────────────────────────
 # 🔹 Téma 12: Počet hran určitého typu
 # Úkol: Spočítejte, kolik hran má daný typ.
 # ─────────────────────────────────────────────────────────────
 def pocet_hran_typu(g, typ):
-    count = 0
-    for node in g:
-        for neighbor_id in node.neighbor_ids:
-            edge = node.to(neighbor_id)
-            if edge['type'] == typ:
-                count += 1
-    return count
+    # с индексом по "type" - O(1), иначе перебор всех рёбер
+    index = g.get_index("edge", "type")
+    if index is not None:
+        return index.count(typ)
+    # edges() отдаёт неориентированное ребро один раз, как и индекс
+    return sum(1 for _, _, t in g.edges(data="type") if t == typ)
 
 # ─────────────────────────────────────────────────────────────
 # 🔹 Téma 13: Obrácení hran v grafu (reverse graph)
 # Úkol: Vytvořte nový graf, kde budou hrany obrácené.
 # ─────────────────────────────────────────────────────────────
 def obratit_graf(g):
-    g_rev = Graph(GraphType.DIRECTED)
-    for node in g:
-        g_rev.add_node(node.id, node._attrs.copy())
-    for node in g:
-        for neighbor_id in node.neighbor_ids:
-            edge = node.to(neighbor_id)
-            g_rev.add_edge(neighbor_id, node.id, edge._attrs.copy())
-    return g_rev
+    # вместо копии всех узлов, рёбер и атрибутов - представление над тем же графом
+    # (views.ReversedView); изменения g в нём сразу видны, менять его самого нельзя
+    return g.reverse_view()
 
 # ─────────────────────────────────────────────────────────────
 # 🔹 Téma 14: Zjištění izolovanosti uzlu
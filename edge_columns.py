@@ -0,0 +1,342 @@
+# Колоночное хранение атрибутов рёбер обычного (изменяемого) Graph:
+# вместо отдельного словаря у каждого ребра - по одной колонке на атрибут,
+# так что "прибавить 1 ко всем весам" - одна векторная операция.
+import operator
+from array import array
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Tuple
+
+from compact import MISSING, Column, ColumnAttrs, ColumnStore
+from diktyonphi import Graph, GraphType
+
+_DTYPES = {"q": "int64", "d": "float64"}
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    return np
+
+
+class EdgeColumns(MutableMapping):
+    """
+    Edge attributes of a graph stored column by column (``g.edge_columns``).
+
+    Every edge has a record number; ``Node._neighbors`` / ``Edge._attrs`` hold a
+    ColumnAttrs pointing to it, so ``edge["weight"]`` keeps working. Numeric
+    columns are typed arrays and support bulk operations::
+
+        g.edge_columns["weight"] += 1
+        heavy = g.edge_columns["weight"] > 10
+        g.edge_columns["weight"].edges(heavy)
+
+    Mapping keys are attribute names, values are AttrColumn objects.
+    """
+
+    def __init__(self, graph: Graph, store: ColumnStore, src: List[Hashable], dst: List[Hashable]):
+        """
+        :param graph: The graph the records belong to.
+        :param store: Columns, one record per edge (undirected edges have a single record).
+        :param src: Source node id of every record.
+        :param dst: Destination node id of every record.
+        """
+        self._graph = graph
+        self._store = store
+        self._src = src
+        self._dst = dst
+
+    @classmethod
+    def from_graph(cls, g: Graph) -> 'EdgeColumns':
+        """Move the edge attribute dicts of a regular graph into columns (in place)."""
+        edges = list(g.edges(data=True))
+        store = ColumnStore.from_dicts([attrs for _, _, attrs in edges])
+        columns = cls(g, store, [src for src, _, _ in edges], [dst for _, dst, _ in edges])
+        undirected = g.type == GraphType.UNDIRECTED
+        for record, (src_id, dst_id, _) in enumerate(edges):
+            attrs = ColumnAttrs(store, record)
+            # словарь ребра заменяем у обоих концов (и в обратном индексе)
+            g._nodes[src_id]._neighbors[dst_id] = attrs
+            if undirected:
+                g._nodes[dst_id]._neighbors[src_id] = attrs
+            else:
+                g._nodes[dst_id]._predecessors[src_id] = attrs
+        return columns
+
+    def _record(self, src_id: Hashable, dst_id: Hashable, attrs: Dict[str, Any]) -> ColumnAttrs:
+        """
+        Return the record to store for edge src -> dst with the given attributes
+        (called from Graph._put_edge): a new one, or the existing record of the
+        edge (or of its other direction) overwritten with ``attrs``.
+        """
+        nodes = self._graph._nodes
+        existing = nodes[src_id]._neighbors.get(dst_id)
+        if existing is None and self._graph.type == GraphType.UNDIRECTED:
+            existing = nodes[dst_id]._neighbors.get(src_id)
+        if existing is None:
+            self._src.append(src_id)
+            self._dst.append(dst_id)
+            return ColumnAttrs(self._store, self._store.append(attrs))
+        if existing is not attrs:
+            for name in list(existing):
+                if name not in attrs:
+                    del existing[name]
+            for name, val in attrs.items():
+                existing[name] = val
+        return existing
+
+    def _remove(self, attrs: ColumnAttrs) -> None:
+        """
+        Drop the record of a removed edge (called from Graph._drop_edge). The
+        last record moves into its place; its ColumnAttrs is shared by every
+        reference to that edge, so updating its index there is enough.
+        """
+        i = attrs._index
+        last = self._store.size - 1
+        if i != last:
+            moved = self._graph._nodes[self._src[last]]._neighbors[self._dst[last]]
+            moved._index = i
+            self._src[i] = self._src[last]
+            self._dst[i] = self._dst[last]
+        self._src.pop()
+        self._dst.pop()
+        self._store.remove(i)
+        # устаревший Edge удалённого ребра не должен писать в чужую запись
+        attrs._index = None
+
+    def __len__(self) -> int:
+        return len(self._store.columns)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.columns)
+
+    def __getitem__(self, name: str) -> 'AttrColumn':
+        if name not in self._store.columns:
+            raise KeyError(name)
+        return AttrColumn(self, name)
+
+    def __setitem__(self, name: str, values: Any) -> None:
+        """Set ``name`` on every edge: to one value, or to a sequence with one value per record."""
+        if isinstance(values, AttrColumn) and values._columns is self and values.name == name:
+            # g.edge_columns["w"] += 1 -> колонка уже изменена на месте
+            return
+        n = self._store.size
+        if isinstance(values, AttrColumn):
+            values = values.values()
+        if isinstance(values, (str, bytes)) or not hasattr(values, "__len__"):
+            values = [values] * n
+        elif len(values) != n:
+            raise ValueError(f"Expected {n} values, got {len(values)}")
+        self._store.columns[name] = Column.from_values(
+            values.tolist() if hasattr(values, "tolist") else list(values))
+        self._changed(name)
+
+    def __delitem__(self, name: str) -> None:
+        """Remove the attribute from every edge."""
+        del self._store.columns[name]
+        self._changed(name)
+
+    def _changed(self, name: str) -> None:
+        """Whole column ``name`` changed: reset caches and rebuild an edge index on it."""
+        self._graph._version += 1
+        if self._graph._indexes:
+            self._graph._reindex("edge", name)
+
+    @property
+    def size(self) -> int:
+        """Number of edge records."""
+        return self._store.size
+
+    def edges(self, mask: Any = None) -> List[Tuple[Hashable, Hashable]]:
+        """Return ``(src, dst)`` of the records where ``mask`` is true (of all records if None)."""
+        if mask is None:
+            return list(zip(self._src, self._dst))
+        return [(self._src[i], self._dst[i]) for i in _mask_indexes(mask)]
+
+
+def _mask_indexes(mask: Any) -> Iterator[int]:
+    np = _numpy()
+    if np is not None and isinstance(mask, np.ndarray):
+        return iter(np.flatnonzero(mask).tolist())
+    return (i for i, m in enumerate(mask) if m)
+
+
+class AttrColumn:
+    """
+    One edge attribute of all edges, returned by ``g.edge_columns[name]``.
+
+    Arithmetic assignment (``+=``, ``-=``, ``*=``, ``/=``) updates the column in
+    place, vectorized with NumPy when it is installed and the column is a typed
+    array. Comparisons return a mask (a NumPy bool array, or a list of bools),
+    usable with ``edges(mask)``, ``select(mask)`` and ``assign(mask, value)``.
+    Edges without the attribute are skipped by arithmetic and aggregation and
+    never match a comparison.
+    """
+    __slots__ = ("_columns", "name")
+
+    def __init__(self, columns: EdgeColumns, name: str):
+        self._columns = columns
+        self.name = name
+
+    @property
+    def _column(self) -> Column:
+        return self._columns._store.columns[self.name]
+
+    def _array(self):
+        """NumPy view of a typed column (no copy), or None."""
+        np = _numpy()
+        column = self._column
+        if np is None or column.typecode is None or len(column) == 0:
+            return None
+        return np.frombuffer(column.data, dtype=_DTYPES[column.typecode])
+
+    def __len__(self) -> int:
+        return len(self._column)
+
+    def values(self) -> Any:
+        """Copy of the values: a NumPy array for typed columns, a list otherwise (MISSING marks absent values)."""
+        a = self._array()
+        return a.copy() if a is not None else list(self._column.data)
+
+    def _operand(self, other: Any) -> Any:
+        return other.values() if isinstance(other, AttrColumn) else other
+
+    def _update(self, np_name: str, op: Callable[[Any, Any], Any], other: Any) -> 'AttrColumn':
+        other = self._operand(other)
+        a = self._array()
+        if a is not None and not (isinstance(other, list) and MISSING in other):
+            np = _numpy()
+            ufunc = getattr(np, np_name)
+            other = np.asarray(other)
+            dtype = np.dtype("float64") if np_name == "true_divide" else np.result_type(a, other)
+            if dtype == a.dtype and a.flags.writeable:
+                # прямо в буфере array.array, без копии
+                ufunc(a, other, out=a)
+            else:
+                # int-колонка стала float (или буфер только для чтения) -> новая колонка
+                typecode = "d" if dtype.kind == "f" else "q"
+                result = ufunc(a, other).astype(_DTYPES[typecode])
+                self._columns._store.columns[self.name] = Column(array(typecode, result.tobytes()))
+        else:
+            data = self._column.data
+            scalar = not hasattr(other, "__len__") or isinstance(other, str)
+            result = []
+            for i, val in enumerate(data):
+                o = other if scalar else other[i]
+                result.append(MISSING if val is MISSING or o is MISSING else op(val, o))
+            self._columns._store.columns[self.name] = Column.from_values(result)
+        self._columns._changed(self.name)
+        return self
+
+    def __iadd__(self, other: Any) -> 'AttrColumn':
+        return self._update("add", operator.add, other)
+
+    def __isub__(self, other: Any) -> 'AttrColumn':
+        return self._update("subtract", operator.sub, other)
+
+    def __imul__(self, other: Any) -> 'AttrColumn':
+        return self._update("multiply", operator.mul, other)
+
+    def __itruediv__(self, other: Any) -> 'AttrColumn':
+        return self._update("true_divide", operator.truediv, other)
+
+    def _compare(self, op: Callable[[Any, Any], Any], other: Any) -> Any:
+        other = self._operand(other)
+        a = self._array()
+        if a is not None:
+            return op(a, other)
+        scalar = not hasattr(other, "__len__") or isinstance(other, str)
+        mask = []
+        for i, val in enumerate(self._column.data):
+            o = other if scalar else other[i]
+            try:
+                mask.append(val is not MISSING and o is not MISSING and bool(op(val, o)))
+            except TypeError:
+                # несравнимые значения (None < 0 и т.п.) просто не подходят
+                mask.append(False)
+        return mask
+
+    def __lt__(self, other: Any) -> Any:
+        return self._compare(operator.lt, other)
+
+    def __le__(self, other: Any) -> Any:
+        return self._compare(operator.le, other)
+
+    def __gt__(self, other: Any) -> Any:
+        return self._compare(operator.gt, other)
+
+    def __ge__(self, other: Any) -> Any:
+        return self._compare(operator.ge, other)
+
+    def __eq__(self, other: Any) -> Any:
+        return self._compare(operator.eq, other)
+
+    def __ne__(self, other: Any) -> Any:
+        return self._compare(operator.ne, other)
+
+    __hash__ = None
+
+    def _present(self) -> List[Any]:
+        return [val for val in self._column.data if val is not MISSING]
+
+    def sum(self) -> Any:
+        a = self._array()
+        return a.sum().item() if a is not None else sum(self._present())
+
+    def min(self) -> Any:
+        """Smallest value (None if no edge has the attribute)."""
+        a = self._array()
+        if a is not None:
+            return a.min().item()
+        return min(self._present(), default=None)
+
+    def max(self) -> Any:
+        """Largest value (None if no edge has the attribute)."""
+        a = self._array()
+        if a is not None:
+            return a.max().item()
+        return max(self._present(), default=None)
+
+    def mean(self) -> float:
+        """Average value (nan if no edge has the attribute)."""
+        a = self._array()
+        if a is not None:
+            return a.mean().item()
+        present = self._present()
+        return sum(present) / len(present) if present else float("nan")
+
+    def count(self) -> int:
+        """Number of edges that have the attribute."""
+        column = self._column
+        if column.typecode is not None:
+            return len(column)
+        return sum(1 for val in column.data if val is not MISSING)
+
+    def select(self, mask: Any) -> List[Any]:
+        """Values of the records where ``mask`` is true, in the order of edges(mask)."""
+        a = self._array()
+        np = _numpy()
+        if a is not None and isinstance(mask, np.ndarray):
+            return a[mask].tolist()
+        data = self._column.data
+        return [data[i] for i in _mask_indexes(mask)]
+
+    def assign(self, mask: Any, value: Any) -> None:
+        """Set the attribute to ``value`` on the records where ``mask`` is true."""
+        column = self._column
+        a = self._array()
+        np = _numpy()
+        if a is not None and isinstance(mask, np.ndarray) and column._fits(value) and a.flags.writeable:
+            a[mask] = value
+        else:
+            for i in _mask_indexes(mask):
+                column[i] = value
+        self._columns._changed(self.name)
+
+    def edges(self, mask: Any = None) -> List[Tuple[Hashable, Hashable]]:
+        """``(src, dst)`` of the records where ``mask`` is true, see EdgeColumns.edges()."""
+        return self._columns.edges(mask)
+
+    def __repr__(self):
+        return f"AttrColumn({self.name!r}, edges: {len(self)}, typecode: {self._column.typecode})"
@@ -0,0 +1,262 @@
+# Бинарный снимок графа: заголовок, таблица id, CSR (offsets + targets) и колонки атрибутов.
+# Файл открывается через mmap: ничего не разбирается заранее, страницы читаются с диска
+# по мере обращения и делятся между процессами, открывшими тот же файл.
+import json
+import mmap
+import os
+import pickle
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Hashable, Iterator, Optional
+
+from compact import MISSING, Column, ColumnStore, CompactGraph
+from diktyonphi import Graph, GraphType
+
+MAGIC = b"DIKTGRF\0"
+FORMAT_VERSION = 1
+# magic, версия формата, смещение и длина JSON-каталога секций
+_HEADER = struct.Struct("<8sIxxxxqq")
+_ALIGN = 8
+
+
+class _IdTable(Sequence):
+    """Node ids by index, decoded from the file on access."""
+
+    def __init__(self, kind: str, data: memoryview, offsets: Optional[memoryview]):
+        self._kind = kind
+        self._data = data
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._data) if self._kind == "int" else len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> Hashable:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if self._kind == "int":
+            return self._data[i]
+        if i < 0:
+            i += len(self)
+        return str(self._data[self._offsets[i]:self._offsets[i + 1]], "utf-8")
+
+    def __iter__(self) -> Iterator[Hashable]:
+        if self._kind == "int":
+            return iter(self._data)
+        return (self[i] for i in range(len(self)))
+
+
+class _SortedIds(Sequence):
+    """Node ids in sorted order (through the ``order`` permutation), for bisect."""
+
+    def __init__(self, ids: _IdTable, order: memoryview):
+        self._ids = ids
+        self._order = order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, k: int) -> Hashable:
+        return self._ids[self._order[k]]
+
+
+class _IdLookup(Mapping):
+    """Node id -> index by binary search over the sorted id table (replaces the dict of CompactGraph)."""
+
+    def __init__(self, ids: _IdTable, order: memoryview):
+        self._ids = ids
+        self._sorted = _SortedIds(ids, order)
+        self._order = order
+
+    def __getitem__(self, node_id: Hashable) -> int:
+        kind = self._ids._kind
+        if kind == "int" and (type(node_id) is not int) or kind == "str" and type(node_id) is not str:
+            raise KeyError(node_id)
+        k = bisect_left(self._sorted, node_id)
+        if k < len(self._sorted) and self._sorted[k] == node_id:
+            return self._order[k]
+        raise KeyError(node_id)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class _LazyColumn(Column):
+    """List column kept pickled in the file and unpickled on first access."""
+    __slots__ = ("_view", "_size", "_data")
+
+    def __init__(self, view: memoryview, size: int):
+        self._view = view
+        self._size = size
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            values = [MISSING] * self._size
+            for i, val in pickle.loads(self._view):
+                values[i] = val
+            self._data = values
+        return self._data
+
+    @data.setter
+    def data(self, value) -> None:
+        self._data = value
+
+
+class MappedGraph(CompactGraph):
+    """
+    Read-only graph opened from a snapshot file by ``open_graph``.
+
+    Works like CompactGraph, but its arrays are memoryviews into the mapped
+    file and node ids are looked up by binary search, so opening costs O(1)
+    regardless of the graph size. Writing an attribute copies that column into
+    memory (the file is never modified). Pickling a MappedGraph (e.g. to send
+    it to a worker process) only sends the file path.
+    """
+
+    def __init__(self, path: str):
+        """:param path: Snapshot file written by ``save_graph``."""
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mmap)
+        magic, version, dir_offset, dir_length = _HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a graph snapshot file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format version {version}")
+        directory = json.loads(bytes(buf[dir_offset:dir_offset + dir_length]))
+        self.path = path
+        self._directory = directory
+
+        def section(entry: Dict[str, Any], typecode: str = "q") -> memoryview:
+            return buf[entry["offset"]:entry["offset"] + entry["length"]].cast(typecode)
+
+        ids_entry = directory["ids"]
+        if ids_entry["kind"] == "int":
+            ids = _IdTable("int", section(ids_entry["data"]), None)
+        else:
+            ids = _IdTable("str", section(ids_entry["data"], "B"), section(ids_entry["offsets"]))
+
+        def store(entry: Dict[str, Any]) -> ColumnStore:
+            columns = ColumnStore(entry["size"])
+            for name, col in entry["columns"].items():
+                if col["typecode"] is None:
+                    columns.columns[name] = _LazyColumn(section(col, "B"), entry["size"])
+                else:
+                    columns.columns[name] = Column(section(col, col["typecode"]))
+            return columns
+
+        super().__init__(GraphType[directory["type"]], ids, section(directory["offsets"]),
+                         section(directory["targets"]), section(directory["edge_ids"]),
+                         store(directory["node_attrs"]), store(directory["edge_attrs"]),
+                         index=_IdLookup(ids, section(ids_entry["order"])))
+        if "reverse" in directory:
+            rev = directory["reverse"]
+            self._reverse = (section(rev["offsets"]), section(rev["targets"]), section(rev["edge_ids"]))
+
+    def __reduce__(self):
+        # в другой процесс передаём только путь: он отобразит тот же файл (общие страницы ОС)
+        return (MappedGraph, (self.path,))
+
+    def __repr__(self):
+        return (f"MappedGraph({self.type}, nodes: {len(self._ids)}, "
+                f"edges: {self._directory['edge_count']}, path: {self.path!r})")
+
+
+def _write_section(f, data) -> Dict[str, int]:
+    """Write a buffer at the next aligned position and return its location."""
+    pos = f.tell()
+    pad = -pos % _ALIGN
+    if pad:
+        f.write(b"\0" * pad)
+        pos += pad
+    f.write(data)
+    return {"offset": pos, "length": f.tell() - pos}
+
+
+def _write_store(f, store: ColumnStore) -> Dict[str, Any]:
+    columns = {}
+    for name, column in store.columns.items():
+        if not isinstance(name, str):
+            raise TypeError(f"Attribute names must be strings to be saved, got {name!r}")
+        typecode = column.typecode
+        if typecode is not None:
+            entry = _write_section(f, column.data)
+        else:
+            # произвольные значения: пикл пар (индекс, значение) без отсутствующих
+            present = [(i, val) for i, val in enumerate(column.data) if val is not MISSING]
+            entry = _write_section(f, pickle.dumps(present, pickle.HIGHEST_PROTOCOL))
+        entry["typecode"] = typecode
+        columns[name] = entry
+    return {"size": store.size, "columns": columns}
+
+
+def save_graph(g: Graph, path: str) -> None:
+    """
+    Write the graph to a binary snapshot file (see open_graph).
+
+    Node ids must be all ``int`` (64-bit) or all ``str``. Numeric attribute
+    columns are written as raw arrays, other attributes are pickled per column.
+    The file is written to a temporary name and renamed, so readers never see
+    a half-written snapshot.
+
+    :param g: Graph to save (a regular graph is compacted first).
+    :param path: Target file name.
+    """
+    c = g.compact()
+    ids = list(c._ids)
+    if all(type(node_id) is int for node_id in ids):
+        kind = "int"
+    elif all(type(node_id) is str for node_id in ids):
+        kind = "str"
+    else:
+        raise TypeError("Only graphs whose node ids are all int or all str can be saved")
+    order = array("q", sorted(range(len(ids)), key=ids.__getitem__))
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"\0" * _HEADER.size)
+        directory: Dict[str, Any] = {"type": c.type.name, "edge_count": g.stats.edge_count}
+        if kind == "int":
+            ids_entry = {"kind": kind, "data": _write_section(f, array("q", ids))}
+        else:
+            encoded = [node_id.encode("utf-8") for node_id in ids]
+            offsets = array("q", [0])
+            for data in encoded:
+                offsets.append(offsets[-1] + len(data))
+            ids_entry = {"kind": kind, "data": _write_section(f, b"".join(encoded)),
+                         "offsets": _write_section(f, offsets)}
+        ids_entry["order"] = _write_section(f, order)
+        directory["ids"] = ids_entry
+        directory["offsets"] = _write_section(f, array("q", c._offsets))
+        directory["targets"] = _write_section(f, array("q", c._targets))
+        directory["edge_ids"] = _write_section(f, array("q", c._edge_ids))
+        if c.type == GraphType.DIRECTED:
+            # входящие рёбра тоже сохраняем, чтобы predecessor_ids не строил их при открытии
+            offsets, sources, edge_ids = c._reverse_csr()
+            directory["reverse"] = {"offsets": _write_section(f, array("q", offsets)),
+                                    "targets": _write_section(f, array("q", sources)),
+                                    "edge_ids": _write_section(f, array("q", edge_ids))}
+        directory["node_attrs"] = _write_store(f, c._node_store)
+        directory["edge_attrs"] = _write_store(f, c._edge_store)
+        encoded_dir = json.dumps(directory).encode("utf-8")
+        dir_offset = f.tell()
+        f.write(encoded_dir)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, dir_offset, len(encoded_dir)))
+    os.replace(tmp, path)
+
+
+def open_graph(path: str) -> MappedGraph:
+    """
+    Open a snapshot written by save_graph as a read-only graph.
+
+    Nothing is parsed up front: arrays are memory-mapped and read lazily.
+    Only open files you trust, non-numeric attribute columns are pickled.
+    """
+    return MappedGraph(path)
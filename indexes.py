@@ -0,0 +1,132 @@
+# Вторичные индексы по атрибутам узлов/рёбер: значение -> кто его имеет.
+# Граф обновляет их сам (Node/Edge.__setitem__, добавление узлов и рёбер),
+# поэтому запрос "все красные узлы" стоит O(результата), а не O(графа).
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+
+class AttrIndex:
+    """
+    Index of one node or edge attribute, created by ``Graph.create_index``.
+
+    Keys are node IDs for a node index. An edge index keys edges by their
+    ends (``Graph._edge_key``: unordered for an undirected graph) and reports
+    them as ``(src, dst)`` pairs (an undirected edge once, in the direction it
+    was first indexed). Nodes / edges without the attribute, or with an
+    unhashable value, are not indexed. Results come in insertion order within
+    one value. ``range()`` skips None and any value that cannot be ordered
+    with the values indexed before it (e.g. a string among numbers); find()
+    still finds them.
+    """
+
+    def __init__(self, kind: str, attr: str):
+        """
+        :param kind: "node" or "edge".
+        :param attr: Name of the indexed attribute.
+        """
+        self.kind = kind
+        self.attr = attr
+        # значение -> упорядоченное множество ключей
+        self._buckets: Dict[Any, Dict[Hashable, None]] = {}
+        # ключ -> его текущее значение (чтобы убрать ключ из старой корзины)
+        self._values: Dict[Hashable, Any] = {}
+        # для рёбер: ключ ребра -> (src, dst) в том направлении, в каком его добавили
+        self._ends: Dict[Hashable, Tuple[Hashable, Hashable]] = {}
+        # отсортированные различные значения для запросов по диапазону
+        self._sorted: List[Any] = []
+        # значения, которые нельзя упорядочить с остальными (None и т.п.) - в range() не попадают
+        self._unordered: Set[Any] = set()
+
+    def set(self, key: Hashable, val: Any, ends: Optional[Tuple[Hashable, Hashable]] = None) -> None:
+        """Index ``key`` under ``val`` (moving it from its previous value)."""
+        try:
+            hash(val)
+        except TypeError:
+            self.remove(key)
+            return
+        if key in self._values:
+            old = self._values[key]
+            if old is val or old == val:
+                return
+            self._discard(key, old)
+        elif ends is not None:
+            self._ends[key] = ends
+        self._values[key] = val
+        bucket = self._buckets.get(val)
+        if bucket is None:
+            bucket = self._buckets[val] = {}
+            if val is None:
+                self._unordered.add(val)
+            else:
+                try:
+                    insort(self._sorted, val)
+                except TypeError:
+                    # несравнимое с уже упорядоченными значение -> только для find()
+                    self._unordered.add(val)
+        bucket[key] = None
+
+    def remove(self, key: Hashable) -> None:
+        """Drop ``key`` from the index (no-op if it is not indexed)."""
+        if key in self._values:
+            self._discard(key, self._values.pop(key))
+        self._ends.pop(key, None)
+
+    def _discard(self, key: Hashable, val: Any) -> None:
+        bucket = self._buckets[val]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[val]
+            if val in self._unordered:
+                self._unordered.discard(val)
+            else:
+                del self._sorted[bisect_left(self._sorted, val)]
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._values.clear()
+        self._ends.clear()
+        self._sorted = []
+        self._unordered.clear()
+
+    def _result(self, keys) -> List[Hashable]:
+        if self.kind == "edge":
+            return [self._ends[key] for key in keys]
+        return list(keys)
+
+    def find(self, val: Any) -> List[Hashable]:
+        """Nodes (or ``(src, dst)`` edges) whose attribute equals ``val``."""
+        return self._result(self._buckets.get(val, ()))
+
+    def count(self, val: Any) -> int:
+        """Number of nodes (edges) whose attribute equals ``val``, O(1)."""
+        return len(self._buckets.get(val, ()))
+
+    def range(self, lo: Any = None, hi: Any = None, inclusive: bool = True) -> List[Hashable]:
+        """
+        Nodes (edges) with ``lo <= value <= hi`` (``< hi`` if not inclusive),
+        ordered by value. None means unbounded on that side. Values that
+        cannot be ordered (None, ...) are skipped.
+
+        :raises TypeError: If ``lo`` or ``hi`` cannot be compared with the indexed values.
+        """
+        values = self._sorted
+        try:
+            start = 0 if lo is None else bisect_left(values, lo)
+            end = len(values) if hi is None else (bisect_right if inclusive else bisect_left)(values, hi)
+        except TypeError:
+            raise TypeError(f"Bounds {lo!r}, {hi!r} are not comparable with values of "
+                            f"{self.kind} attribute '{self.attr}'") from None
+        result = []
+        for val in values[start:end]:
+            result.extend(self._result(self._buckets[val]))
+        return result
+
+    def values(self) -> List[Any]:
+        """Distinct indexed values."""
+        return list(self._buckets)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self):
+        return f"AttrIndex({self.kind}.{self.attr}, keys: {len(self._values)}, values: {len(self._buckets)})"
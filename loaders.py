@@ -0,0 +1,284 @@
+# Потоковая загрузка графа прямо из файла, без промежуточного словаря со всеми данными
+# (в отличие от colorize.load_preprocessing + make_graph).
+import csv
+import io
+import json
+import os
+import re
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+from diktyonphi import DuplicatePolicy, Graph, GraphType
+
+# progress(bytes_read, total_bytes)
+ProgressCallback = Callable[[int, int], None]
+
+CHUNK_SIZE = 1 << 20
+
+
+class _ProgressReader(io.RawIOBase):
+    """Binary file wrapper that reports how many bytes were read so far."""
+
+    def __init__(self, raw, progress: Optional[ProgressCallback]):
+        self._raw = raw
+        self._progress = progress
+        self._total = os.fstat(raw.fileno()).st_size
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = self._raw.readinto(buffer)
+        if n:
+            self.bytes_read += n
+            if self._progress is not None:
+                self._progress(self.bytes_read, self._total)
+        return n
+
+    def close(self) -> None:
+        self._raw.close()
+        super().close()
+
+
+def _open_text(filename: str, progress: Optional[ProgressCallback], newline: Optional[str] = None):
+    """Open a UTF-8 text file whose reads are reported to ``progress``."""
+    reader = _ProgressReader(open(filename, "rb"), progress)
+    return io.TextIOWrapper(io.BufferedReader(reader, CHUNK_SIZE), encoding="utf-8", newline=newline)
+
+
+def _iter_json_object(f, chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally parse a top-level JSON object ``{"key": value, ...}``.
+
+    Only one chunk of the file (plus the value being parsed) is held in memory.
+
+    :return: Iterator of (key, value) pairs in file order.
+    :raises ValueError: If the file is not a JSON object.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def more() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        # выбрасываем уже разобранную часть буфера
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_ws() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not more():
+                return ""
+
+    def value() -> Any:
+        nonlocal pos
+        while True:
+            try:
+                val, end = decoder.raw_decode(buf, pos)
+                # число на границе буфера могло быть обрезано -> дочитываем
+                if end < len(buf) or eof:
+                    pos = end
+                    return val
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            if not more():
+                val, pos = decoder.raw_decode(buf, pos)
+                return val
+
+    if skip_ws() != "{":
+        raise ValueError("Expected a JSON object at the top level")
+    pos += 1
+    if skip_ws() == "}":
+        return
+    while True:
+        if skip_ws() != '"':
+            raise ValueError(f"Expected an object key at character {pos}")
+        key = value()
+        if skip_ws() != ":":
+            raise ValueError(f"Expected ':' at character {pos}")
+        pos += 1
+        skip_ws()
+        yield key, value()
+        sep = skip_ws()
+        pos += 1
+        if sep == "}":
+            return
+        if sep != ",":
+            raise ValueError(f"Expected ',' or '}}' at character {pos - 1}")
+
+
+def _two_passes(progress: Optional[ProgressCallback]) -> Tuple[Optional[ProgressCallback], Optional[ProgressCallback]]:
+    """Split ``progress`` over two reads of the same file (reported as one read of twice its size)."""
+    if progress is None:
+        return None, None
+    return (lambda done, total: progress(done, 2 * total),
+            lambda done, total: progress(total + done, 2 * total))
+
+
+def _add_declared_nodes(g: Graph, node_ids: Iterable[Hashable], node_attrs: Optional[Dict[str, Any]]) -> None:
+    """First pass of an adjacency loader: create every declared node, in file order."""
+    for node_id in node_ids:
+        if node_id not in g:
+            g.add_node(node_id, dict(node_attrs) if node_attrs is not None else None)
+
+
+def _add_adjacency(g: Graph, node_id: Hashable, neighbours: Iterable[Hashable]) -> None:
+    """
+    Second pass: add the edges of one ``node -> [neighbours]`` record.
+
+    All declared nodes already exist, so a neighbour missing from the graph is
+    never declared and its edge is dropped, like in colorize.load_preprocessing.
+    """
+    edges = [(node_id, neighbour) for neighbour in neighbours if neighbour in g]
+    # A-B обычно записано и у A, и у B -> повтор просто пропускаем
+    g.add_edges_from(edges, on_duplicate=DuplicatePolicy.SKIP)
+
+
+def load_adjacency_json(filename: str, graph: Optional[Graph] = None,
+                        node_attrs: Optional[Dict[str, Any]] = None,
+                        progress: Optional[ProgressCallback] = None) -> Graph:
+    """
+    Stream an adjacency JSON file ``{"node": ["neighbour", ...], ...}`` into a graph.
+
+    The file is read twice: first the nodes, then the edges, so nothing but
+    the graph itself grows with the size of the file.
+
+    :param filename: Path to the JSON file (e.g. eu_sousede.json).
+    :param graph: Graph to fill, a new undirected Graph by default.
+    :param node_attrs: Attributes copied to every created node (e.g. ``{"color": None}``).
+    :param progress: Called as ``progress(bytes_read, total_bytes)`` while reading (both passes).
+    :return: The filled graph.
+    """
+    g = graph if graph is not None else Graph(GraphType.UNDIRECTED)
+    first, second = _two_passes(progress)
+    with _open_text(filename, first) as f:
+        _add_declared_nodes(g, (node_id for node_id, _ in _iter_json_object(f)), node_attrs)
+    with _open_text(filename, second) as f:
+        for node_id, neighbours in _iter_json_object(f):
+            _add_adjacency(g, node_id, neighbours)
+    return g
+
+
+def _iter_jsonl_records(f) -> Iterator[Tuple[Hashable, Any]]:
+    """(node, neighbours) pairs of a JSON Lines adjacency file, see load_adjacency_jsonl."""
+    for line_no, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if isinstance(record, dict):
+            yield from record.items()
+        elif isinstance(record, list) and len(record) == 2:
+            yield record[0], record[1]
+        else:
+            raise ValueError(f"Line {line_no}: expected an object or a [node, neighbours] pair")
+
+
+def load_adjacency_jsonl(filename: str, graph: Optional[Graph] = None,
+                         node_attrs: Optional[Dict[str, Any]] = None,
+                         progress: Optional[ProgressCallback] = None) -> Graph:
+    """
+    Stream a JSON Lines adjacency file into a graph.
+
+    Every non-empty line is either ``{"node": ["neighbour", ...]}`` or
+    ``["node", ["neighbour", ...]]``. Parameters are the same as for
+    load_adjacency_json.
+    """
+    g = graph if graph is not None else Graph(GraphType.UNDIRECTED)
+    first, second = _two_passes(progress)
+    with _open_text(filename, first) as f:
+        _add_declared_nodes(g, (node_id for node_id, _ in _iter_jsonl_records(f)), node_attrs)
+    with _open_text(filename, second) as f:
+        for node_id, neighbours in _iter_jsonl_records(f):
+            _add_adjacency(g, node_id, neighbours)
+    return g
+
+
+_INT = re.compile(r"[+-]?[0-9]+\Z")
+_FLOAT = re.compile(r"[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?\Z")
+
+
+def _parse_value(text: str) -> Any:
+    """
+    Convert a CSV cell to int or float when it is a plain decimal number.
+    Cells int()/float() would also accept ("1_000", " 5", "nan", "inf") stay strings.
+    """
+    if _INT.match(text):
+        return int(text)
+    if _FLOAT.match(text):
+        return float(text)
+    return text
+
+
+def load_edge_csv(filename: str, graph: Optional[Graph] = None, header: bool = True,
+                  delimiter: str = ",", node_attrs: Optional[Dict[str, Any]] = None,
+                  progress: Optional[ProgressCallback] = None) -> Graph:
+    """
+    Stream an edge-list CSV file (one ``src,dst[,attr...]`` row per edge) into a graph.
+
+    Extra columns become edge attributes, named after the header (or
+    ``col2``, ``col3``, ... without one); numeric cells are converted to numbers.
+    Repeated edges are skipped.
+
+    :param filename: Path to the CSV file.
+    :param graph: Graph to fill, a new undirected Graph by default.
+    :param header: Whether the first row is a header.
+    :param delimiter: CSV field separator.
+    :param node_attrs: Attributes copied to every created node.
+    :param progress: Called as ``progress(bytes_read, total_bytes)`` while reading.
+    :return: The filled graph.
+    """
+    g = graph if graph is not None else Graph(GraphType.UNDIRECTED)
+    with _open_text(filename, progress, newline="") as f:
+        rows = csv.reader(f, delimiter=delimiter)
+        names = next(rows, [])[2:] if header else []
+        batch = []
+        for row in rows:
+            if not row:
+                continue
+            if len(row) < 2:
+                raise ValueError(f"Line {rows.line_num}: expected at least 2 fields (src, dst), got {len(row)}")
+            src_id, dst_id = row[0], row[1]
+            for node_id in (src_id, dst_id):
+                if node_id not in g:
+                    g.add_node(node_id, dict(node_attrs) if node_attrs is not None else None)
+            attrs = {(names[i] if i < len(names) else f"col{i + 2}"): _parse_value(cell)
+                     for i, cell in enumerate(row[2:])}
+            batch.append((src_id, dst_id, attrs))
+            # вставляем пачками, чтобы не держать весь файл в памяти
+            if len(batch) >= 10000:
+                g.add_edges_from(batch, on_duplicate=DuplicatePolicy.SKIP)
+                batch.clear()
+        g.add_edges_from(batch, on_duplicate=DuplicatePolicy.SKIP)
+    return g
+
+
+def load_graph(filename: str, graph: Optional[Graph] = None, **kwargs) -> Graph:
+    """
+    Stream a graph from a file, choosing the loader by extension
+    (.json -> adjacency JSON, .jsonl / .ndjson -> JSON Lines, .csv / .tsv -> edge list).
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == ".json":
+        return load_adjacency_json(filename, graph, **kwargs)
+    if ext in (".jsonl", ".ndjson"):
+        return load_adjacency_jsonl(filename, graph, **kwargs)
+    if ext == ".csv":
+        return load_edge_csv(filename, graph, **kwargs)
+    if ext == ".tsv":
+        kwargs.setdefault("delimiter", "\t")
+        return load_edge_csv(filename, graph, **kwargs)
+    raise ValueError(f"Unknown graph file format: {filename}")
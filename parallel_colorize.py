@@ -0,0 +1,129 @@
+# Параллельная раскраска графа (Jones–Plassmann) на пуле процессов.
+# Смежность в виде CSR лежит в общей памяти (RawArray), её видят все процессы без копирования.
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import RawArray
+from typing import List, Optional, Tuple
+
+from colorize import ColorGraph, check_coloring_conflicts
+from compact import symmetric_csr
+from diktyonphi import Graph
+
+# (offsets, targets, priority, colors) - заполняется в каждом процессе-работнике
+_shared: Optional[tuple] = None
+
+
+def _shared_array(values: array) -> RawArray:
+    """Copy an int64 array into process-shared memory."""
+    raw = RawArray("q", len(values))
+    if len(values):
+        memoryview(raw).cast("B")[:] = memoryview(values).cast("B")
+    return raw
+
+
+def _attach(offsets: RawArray, targets: RawArray, priority: RawArray, colors: RawArray) -> None:
+    """Pool initializer: keep int64 views of the shared arrays in this process."""
+    global _shared
+    _shared = tuple(memoryview(raw).cast("B").cast("q") for raw in (offsets, targets, priority, colors))
+
+
+def _detach() -> None:
+    """Drop the views of the shared arrays (counterpart of _attach)."""
+    global _shared
+    _shared = None
+
+
+def _color_round(start: int, end: int) -> List[Tuple[int, int]]:
+    """
+    One Jones–Plassmann round over nodes ``start..end-1``.
+
+    An uncoloured node is coloured when its priority is higher than the
+    priority of every uncoloured neighbour. Such nodes form an independent set,
+    so they can all be coloured at once from the colours fixed in earlier rounds.
+
+    :return: (node index, colour) for every node coloured in this round.
+    """
+    offsets, targets, priority, colors = _shared
+    result = []
+    for v in range(start, end):
+        if colors[v] >= 0:
+            continue
+        p = priority[v]
+        used = set()
+        for k in range(offsets[v], offsets[v + 1]):
+            u = targets[k]
+            color = colors[u]
+            if color >= 0:
+                used.add(color)
+            elif priority[u] > p:
+                break
+        else:
+            color = 0
+            while color in used:
+                color += 1
+            result.append((v, color))
+    return result
+
+
+def colorize_parallel(g: Graph, workers: Optional[int] = None, seed: Optional[int] = None,
+                      validate: bool = False) -> int:
+    """
+    Colour the graph with the Jones–Plassmann independent-set algorithm on a process pool.
+
+    The symmetric adjacency is built once as CSR and shared with the workers;
+    every round each worker scans its slice of nodes, the main process writes
+    the chosen colours back into the shared colour array. Edge direction is
+    ignored, self-loops are skipped.
+
+    :param g: Graph whose nodes get the "color" attribute.
+    :param workers: Number of processes (default: os.cpu_count()); 1 runs in this process.
+    :param seed: Seed for the random node priorities.
+    :param validate: Check the result with check_coloring_conflicts.
+    :return: Number of colours used.
+    :raises RuntimeError: If validation finds a conflict.
+    """
+    workers = workers or os.cpu_count() or 1
+    ids, offsets, targets = symmetric_csr(g)
+    n = len(ids)
+    # различные случайные приоритеты = случайная перестановка 0..n-1
+    order = list(range(n))
+    random.Random(seed).shuffle(order)
+    shared = (_shared_array(offsets), _shared_array(targets),
+              _shared_array(array("q", order)), _shared_array(array("q", [-1]) * n))
+    colors = memoryview(shared[3]).cast("B").cast("q")
+
+    chunks = max(workers * 4, 1)
+    bounds = [(n * i // chunks, n * (i + 1) // chunks) for i in range(chunks)]
+    starts = [start for start, _ in bounds]
+    ends = [end for _, end in bounds]
+
+    pool = None
+    if workers > 1 and n:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=shared)
+    else:
+        _attach(*shared)
+    try:
+        remaining = n
+        while remaining:
+            rounds = pool.map(_color_round, starts, ends) if pool is not None else map(_color_round, starts, ends)
+            for chosen in rounds:
+                for v, color in chosen:
+                    colors[v] = color
+                remaining -= len(chosen)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        else:
+            # без пула массивы подключались к этому процессу - не держим их до следующего вызова
+            _detach()
+
+    for i, node_id in enumerate(ids):
+        g.node(node_id)["color"] = colors[i]
+    # весь граф раскрашен заново -> для recolor() больше нечего проверять
+    if isinstance(g, ColorGraph):
+        g._dirty.clear()
+    if validate and not check_coloring_conflicts(g):
+        raise RuntimeError("Parallel colouring produced a conflict")
+    return len(set(colors))
@@ -0,0 +1,153 @@
+# Кэш готовых картинок Graphviz: один и тот же граф не рендерится дважды.
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+
+def render_key(dot_digest: str, fmt: str, engine: str) -> str:
+    """Cache key of one rendering: hash of the DOT text + output format + layout engine."""
+    return hashlib.sha256(f"{dot_digest}\0{fmt}\0{engine}".encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    Two-level cache of rendered images keyed by render_key().
+
+    The first level is an in-memory LRU limited by item count and total size.
+    The optional second level is a directory of files, evicted oldest-first
+    (by access time, kept in the file mtime) once it grows over ``max_disk_bytes``.
+    Only files named ``<render_key><SUFFIX>`` belong to the cache; eviction and
+    clear() never touch anything else in the directory.
+    """
+    SUFFIX = ".render"
+
+    def __init__(self, max_items: int = 128, max_memory_bytes: int = 64 << 20,
+                 directory: Optional[str] = None, max_disk_bytes: int = 256 << 20):
+        """
+        :param max_items: Maximum number of images kept in memory.
+        :param max_memory_bytes: Maximum total size of images kept in memory.
+        :param directory: Directory for the on-disk store, None to keep images in memory only.
+        :param max_disk_bytes: Maximum total size of the on-disk store.
+        """
+        self.max_items = max_items
+        self.max_memory_bytes = max_memory_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        # имя файла кэша: 64 hex-символа render_key() + суффикс, остальные файлы чужие
+        self._file_name = re.compile(r"[0-9a-f]{64}" + re.escape(self.SUFFIX) + r"\Z")
+        # текущий размер файлов кэша, чтобы не сканировать каталог при каждом put()
+        self._disk_bytes = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def _disk_entries(self) -> List[Tuple[float, int, str]]:
+        """``(mtime, size, path)`` of every cache file in the directory."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if self._file_name.match(entry.name) and entry.is_file():
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _remember(self, key: str, data: bytes) -> None:
+        # вызывается под self._lock
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        if len(data) > self.max_memory_bytes or self.max_items <= 0:
+            return
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while len(self._memory) > self.max_items or self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached image, or None."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            # mtime = время последнего обращения, по нему вытесняем с диска
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store an image in memory and, if configured, on disk."""
+        with self._lock:
+            self._remember(key, data)
+        if self.directory is None:
+            return
+        # пишем во временный файл и атомарно переименовываем, чтобы читатели не увидели половину
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        try:
+            replaced = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp, path)
+        with self._lock:
+            self._disk_bytes += len(data) - replaced
+            over = self._disk_bytes > self.max_disk_bytes
+        if over:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        # каталог сканируем только когда кэш уже вырос сверх лимита
+        entries = self._disk_entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        with self._lock:
+            self._disk_bytes = total
+
+    def clear(self) -> None:
+        """Drop all cached images (memory and disk)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.directory is not None:
+            for _, _, path in self._disk_entries():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            with self._lock:
+                self._disk_bytes = 0
+
+
+# общий кэш, который по умолчанию используют Graph.render / export_to_png / to_image
+default_cache = RenderCache()
@@ -0,0 +1,251 @@
+# Кратчайшие пути по весам рёбер: Dijkstra, A* и Bellman-Ford.
+# Веса читаются не через Node.to()/Edge, а из плоского CSR-массива, который строится
+# один раз и переиспользуется, пока граф не изменится.
+from array import array
+from heapq import heapify, heappop, heappush
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from compact import MISSING, CompactGraph
+from diktyonphi import Graph
+
+INF = float("inf")
+
+# heuristic(node_id, target_id) -> оценка оставшегося расстояния
+Heuristic = Callable[[Hashable, Hashable], float]
+
+
+def _weighted_csr(g: Graph, weight: str, default: Any) -> tuple:
+    """
+    Return ``(ids, index, offsets, targets, weights, min_weight)`` of the graph:
+    CSR adjacency plus the weight of every stored edge direction as float.
+
+    The arrays are cached on the graph until it is modified (see
+    Graph.mark_modified() for changes made behind its back).
+    """
+    key = (g._version, weight, default)
+    cached = g._weighted_csr_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    if isinstance(g, CompactGraph):
+        # CSR уже есть, остаётся только вынуть веса из колонки
+        ids, index, offsets, targets = g._ids, g._index, g._offsets, g._targets
+        column = g._edge_store.columns.get(weight)
+        if column is None:
+            weights = array("d", [float(default)]) * len(targets)
+        else:
+            weights = array("d", (float(default if column[e] is MISSING else column[e])
+                                  for e in g._edge_ids))
+    else:
+        ids = list(g.node_ids())
+        index = {node_id: i for i, node_id in enumerate(ids)}
+        offsets = array("q", [0])
+        targets = array("q")
+        weights = array("d")
+        for node_id in ids:
+            for dst_id, attrs in g.node(node_id)._neighbors.items():
+                targets.append(index[dst_id])
+                weights.append(float(attrs.get(weight, default)))
+            offsets.append(len(targets))
+    csr = (ids, index, offsets, targets, weights, min(weights, default=0.0))
+    g._weighted_csr_cache = (key, csr)
+    return csr
+
+
+def _indexes(index: Dict[Hashable, int], node_ids: Iterable[Hashable]) -> List[int]:
+    try:
+        return [index[node_id] for node_id in node_ids]
+    except KeyError as e:
+        raise KeyError(f"Node {e.args[0]} is not in the graph") from None
+
+
+def _search(csr: tuple, sources: List[int], target: int = -1,
+            h: Optional[Callable[[int], float]] = None) -> Tuple[Dict[int, float], Dict[int, int]]:
+    """
+    Dijkstra (``h`` is None) or A* over node indexes.
+
+    Only touched nodes get an entry in ``dist``/``pred``, so an early-exit query
+    does not pay for the size of the whole graph.
+    """
+    _, _, offsets, targets, weights, _ = csr
+    dist = {i: 0.0 for i in sources}
+    pred: Dict[int, int] = {}
+    # (приоритет, -расстояние, узел); приоритет = расстояние (+ эвристика для A*),
+    # при равном приоритете первым идёт более дальний узел - A* меньше мечется между равными
+    heap = [(h(i) if h is not None else 0.0, -0.0, i) for i in dist]
+    heapify(heap)
+    while heap:
+        _, d, i = heappop(heap)
+        d = -d
+        if d > dist[i]:
+            # устаревшая запись: узел уже достали с меньшим расстоянием
+            continue
+        if i == target:
+            break
+        for k in range(offsets[i], offsets[i + 1]):
+            j = targets[k]
+            nd = d + weights[k]
+            if nd < dist.get(j, INF):
+                dist[j] = nd
+                pred[j] = i
+                heappush(heap, (nd + h(j) if h is not None else nd, -nd, j))
+    return dist, pred
+
+
+def _to_ids(ids: list, dist: Dict[int, float], pred: Dict[int, int]) -> Tuple[Dict[Hashable, float], Dict[Hashable, Hashable]]:
+    return ({ids[i]: d for i, d in dist.items()},
+            {ids[i]: ids[p] for i, p in pred.items()})
+
+
+def _path(ids: list, pred: Dict[int, int], target: int) -> List[Hashable]:
+    path = [target]
+    while path[-1] in pred:
+        path.append(pred[path[-1]])
+    path.reverse()
+    return [ids[i] for i in path]
+
+
+def _check_non_negative(csr: tuple) -> None:
+    if csr[5] < 0:
+        raise ValueError("Dijkstra/A* need non-negative weights, use bellman_ford()")
+
+
+def multi_source_dijkstra(g: Graph, sources: Iterable[Hashable], target: Optional[Hashable] = None,
+                          weight: str = "weight", default: Any = 1) -> Tuple[Dict[Hashable, float], Dict[Hashable, Hashable]]:
+    """
+    Distances from the nearest of several source nodes (Dijkstra with a binary heap).
+
+    :param g: Graph (or view / CompactGraph) with non-negative edge weights.
+    :param sources: IDs of the start nodes, all at distance 0.
+    :param target: Stop as soon as the distance to this node is final.
+    :param weight: Edge attribute with the weight.
+    :param default: Weight of edges without the attribute.
+    :return: ``(dist, pred)`` - distance of every reached node and its predecessor
+        on a shortest path (sources have no predecessor). With ``target`` only
+        the distance of the target (and of nodes settled before it) is final.
+    :raises ValueError: If some weight is negative.
+    """
+    csr = _weighted_csr(g, weight, default)
+    _check_non_negative(csr)
+    index = csr[1]
+    dist, pred = _search(csr, _indexes(index, sources),
+                         -1 if target is None else _indexes(index, [target])[0])
+    return _to_ids(csr[0], dist, pred)
+
+
+def dijkstra(g: Graph, source: Hashable, target: Optional[Hashable] = None,
+             weight: str = "weight", default: Any = 1) -> Tuple[Dict[Hashable, float], Dict[Hashable, Hashable]]:
+    """Distances from one source node, see multi_source_dijkstra()."""
+    return multi_source_dijkstra(g, [source], target, weight, default)
+
+
+def shortest_path(g: Graph, source: Hashable, target: Hashable, weight: str = "weight",
+                  default: Any = 1, heuristic: Optional[Heuristic] = None) -> Tuple[float, List[Hashable]]:
+    """
+    Shortest path between two nodes; the search stops once the target is reached.
+
+    Uses A* when a heuristic is given, Dijkstra otherwise.
+
+    :param heuristic: Called as ``heuristic(node_id, target)``; must never
+        overestimate the remaining distance (e.g. straight-line distance).
+    :return: ``(length, path)`` where path is the list of node IDs.
+    :raises ValueError: If there is no path or some weight is negative.
+    """
+    csr = _weighted_csr(g, weight, default)
+    _check_non_negative(csr)
+    ids, index = csr[0], csr[1]
+    s, t = _indexes(index, [source, target])
+    h = None
+    if heuristic is not None:
+        estimates: Dict[int, float] = {}
+
+        def h(i: int) -> float:
+            # эвристику зовём один раз на узел
+            est = estimates.get(i)
+            if est is None:
+                est = estimates[i] = heuristic(ids[i], target)
+            return est
+
+    dist, pred = _search(csr, [s], t, h)
+    if t not in dist:
+        raise ValueError(f"No path from {source} to {target}")
+    return dist[t], _path(ids, pred, t)
+
+
+def astar_path(g: Graph, source: Hashable, target: Hashable, heuristic: Heuristic,
+               weight: str = "weight", default: Any = 1) -> Tuple[float, List[Hashable]]:
+    """A* search for a shortest path, see shortest_path()."""
+    return shortest_path(g, source, target, weight, default, heuristic)
+
+
+def _bellman_ford(csr: tuple, sources: List[int]) -> Tuple[Dict[int, float], Dict[int, int], Optional[List[int]]]:
+    """Bellman-Ford over node indexes; returns (dist, pred, negative cycle or None)."""
+    ids, _, offsets, targets, weights, _ = csr
+    n = len(ids)
+    dist = {i: 0.0 for i in sources}
+    pred: Dict[int, int] = {}
+    # в каждом раунде релаксируем только узлы, чьё расстояние изменилось в прошлом
+    active = dict.fromkeys(dist)
+    for _ in range(n):
+        if not active:
+            return dist, pred, None
+        changed: Dict[int, None] = {}
+        for i in active:
+            d = dist[i]
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                nd = d + weights[k]
+                if nd < dist.get(j, INF):
+                    dist[j] = nd
+                    pred[j] = i
+                    changed[j] = None
+        active = changed
+    if not active:
+        return dist, pred, None
+    # расстояния всё ещё уменьшаются после n раундов -> отрицательный цикл;
+    # n шагов по pred гарантированно заводят внутрь цикла
+    for start in active:
+        i = start
+        for _ in range(n):
+            i = pred.get(i, -1)
+            if i < 0:
+                break
+        if i < 0:
+            continue
+        cycle = [i]
+        j = pred[i]
+        while j != i:
+            cycle.append(j)
+            j = pred[j]
+        cycle.reverse()
+        return dist, pred, cycle
+    return dist, pred, None
+
+
+def bellman_ford(g: Graph, source: Hashable, weight: str = "weight",
+                 default: Any = 1) -> Tuple[Dict[Hashable, float], Dict[Hashable, Hashable]]:
+    """
+    Distances from a source node when weights may be negative (Bellman-Ford, O(V * E)).
+
+    Note that in an undirected graph a negative edge is itself a negative cycle.
+
+    :return: ``(dist, pred)`` as in dijkstra().
+    :raises ValueError: If a negative cycle is reachable from the source (the message shows it).
+    """
+    csr = _weighted_csr(g, weight, default)
+    ids = csr[0]
+    dist, pred, cycle = _bellman_ford(csr, _indexes(csr[1], [source]))
+    if cycle is not None:
+        raise ValueError(f"Graph has a negative cycle: {[ids[i] for i in cycle]}")
+    return _to_ids(ids, dist, pred)
+
+
+def find_negative_cycle(g: Graph, weight: str = "weight", default: Any = 1) -> Optional[List[Hashable]]:
+    """
+    Find a cycle with negative total weight anywhere in the graph.
+
+    :return: Nodes of the cycle ``[v0, ..., vk]`` (with an edge vk -> v0), or None.
+    """
+    csr = _weighted_csr(g, weight, default)
+    # все узлы - источники с расстоянием 0 (как фиктивный узел с рёбрами во все)
+    _, _, cycle = _bellman_ford(csr, list(range(len(csr[0]))))
+    return None if cycle is None else [csr[0][i] for i in cycle]
@@ -0,0 +1,54 @@
+# Общие построители графов для тестов: данные у каждого модуля свои, сборка одна.
+import random
+import sys
+
+import pytest
+
+from diktyonphi import Graph, GraphType
+
+
+def _build_graph(edges, type=GraphType.DIRECTED, nodes=None, cls=Graph):
+    """
+    Build a graph from ``nodes`` (``{node_id: attrs}``, added first) and ``edges``
+    (``(src, dst)`` or ``(src, dst, attrs)``). Attribute dicts are copied, so
+    tests may share module-level data.
+    """
+    g = cls(type)
+    for node_id, attrs in (nodes or {}).items():
+        g.add_node(node_id, dict(attrs) if attrs is not None else None)
+    for edge in edges:
+        g.add_edge(edge[0], edge[1], dict(edge[2]) if len(edge) > 2 else None)
+    return g
+
+
+def _random_graph(n, m, type=GraphType.UNDIRECTED, seed=0, cls=Graph, node_attrs=None, loops=True):
+    """Graph with nodes ``0..n-1`` and up to ``m`` random edges (repeated pairs are skipped)."""
+    rnd = random.Random(seed)
+    g = cls(type)
+    g.add_nodes_from(range(n), node_attrs)
+    for _ in range(m):
+        a, b = rnd.randrange(n), rnd.randrange(n)
+        if (loops or a != b) and not g.node(a).is_edge_to(b):
+            g.add_edge(a, b)
+    return g
+
+
+@pytest.fixture
+def build_graph():
+    return _build_graph
+
+
+@pytest.fixture
+def random_graph():
+    return _random_graph
+
+
+@pytest.fixture(params=["numpy", "python"])
+def numpy_mode(request, monkeypatch):
+    """Run the test with NumPy and with the pure-Python fallback."""
+    if request.param == "python":
+        # None в sys.modules - import numpy падает с ImportError
+        monkeypatch.setitem(sys.modules, "numpy", None)
+    else:
+        pytest.importorskip("numpy")
+    return request.param
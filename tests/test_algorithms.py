@@ -0,0 +1,102 @@
+import pytest
+
+from algorithms import (find_cycle, iter_simple_paths, kosaraju_components, strongly_connected_components,
+                        topological_sort)
+from diktyonphi import Graph, GraphType
+from diktyonphii import najdi_vsechny_cesty
+
+
+# a -> c напрямую, через b и через b, d
+EDGES = [("a", "c"), ("a", "b"), ("b", "c"), ("b", "d"), ("d", "c"), ("c", "e")]
+
+
+def test_all_simple_paths(build_graph):
+    g = build_graph(EDGES)
+    assert sorted(iter_simple_paths(g, "a", "c")) == [["a", "b", "c"], ["a", "b", "d", "c"], ["a", "c"]]
+    assert list(iter_simple_paths(g, "c", "a")) == []
+    assert list(iter_simple_paths(g, "a", "a")) == [["a"]]
+
+
+@pytest.mark.parametrize("max_depth, expected", [(0, []), (1, [["a", "c"]]),
+                                                 (2, [["a", "b", "c"], ["a", "c"]])])
+def test_max_depth_counts_edges_of_whole_path(build_graph, max_depth, expected):
+    assert sorted(iter_simple_paths(build_graph(EDGES), "a", "c", max_depth=max_depth)) == expected
+
+
+def test_max_paths_and_cutoff(build_graph):
+    g = build_graph(EDGES)
+    assert len(list(iter_simple_paths(g, "a", "c", max_paths=2))) == 2
+    assert list(iter_simple_paths(g, "a", "c", max_paths=0)) == []
+    # cutoff платит и за последний узел пути
+    seen = []
+    paths = list(iter_simple_paths(g, "a", "c", cutoff=lambda path: seen.append(list(path)) or len(path) > 2))
+    assert paths == [["a", "c"]]
+    assert ["a", "b", "c"] in seen
+
+
+def test_avoid_and_prefix(build_graph):
+    g = build_graph(EDGES)
+    assert sorted(iter_simple_paths(g, "b", "c", avoid=["d"])) == [["b", "c"]]
+    # уже пройденный префикс не может повториться в продолжении
+    assert sorted(najdi_vsechny_cesty(g, "b", "c", path=["a"])) == [["a", "b", "c"], ["a", "b", "d", "c"]]
+
+
+def test_find_cycle(build_graph):
+    g = build_graph(EDGES)
+    assert find_cycle(g) is None
+    g.add_edge("e", "b")
+    cycle = find_cycle(g)
+    assert set(cycle) <= {"b", "c", "d", "e"} and "b" in cycle
+    for src, dst in zip(cycle, cycle[1:] + cycle[:1]):
+        assert g.node(src).is_edge_to(dst)
+
+
+def test_find_cycle_undirected():
+    g = Graph(GraphType.UNDIRECTED)
+    g.add_edge("a", "b")
+    g.add_edge("b", "c")
+    # ребро туда-обратно - не цикл
+    assert find_cycle(g) is None
+    g.add_edge("c", "a")
+    assert sorted(find_cycle(g)) == ["a", "b", "c"]
+    g.add_edge("d", "d")
+    assert find_cycle(g.subgraph_view(nodes=["d"])) == ["d"]
+
+
+def test_find_cycle_deep_chain():
+    # без рекурсии: длинная цепочка не упирается в лимит рекурсии
+    g = Graph(GraphType.DIRECTED)
+    for i in range(20000):
+        g.add_edge(i, i + 1)
+    assert find_cycle(g) is None
+    g.add_edge(20000, 0)
+    assert len(find_cycle(g)) == 20001
+
+
+def test_topological_sort(build_graph):
+    g = build_graph(EDGES)
+    order = topological_sort(g)
+    position = {node_id: i for i, node_id in enumerate(order)}
+    assert len(order) == len(g)
+    assert all(position[src] < position[dst] for src, dst in g.edges())
+    g.add_edge("e", "a")
+    with pytest.raises(ValueError, match="cycle"):
+        topological_sort(g)
+    with pytest.raises(ValueError):
+        topological_sort(Graph(GraphType.UNDIRECTED))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_tarjan_and_kosaraju_agree(random_graph, seed):
+    g = random_graph(60, 90, GraphType.DIRECTED, seed)
+    tarjan = strongly_connected_components(g)
+    kosaraju = kosaraju_components(g)
+    assert sorted(map(sorted, tarjan)) == sorted(map(sorted, kosaraju))
+    assert sorted(node_id for component in tarjan for node_id in component) == list(range(60))
+    # Tarjan: обратный топологический порядок конденсации, Kosaraju: прямой
+    component_of = {node_id: i for i, component in enumerate(tarjan) for node_id in component}
+    for src, dst in g.edges():
+        assert component_of[src] >= component_of[dst]
+    component_of = {node_id: i for i, component in enumerate(kosaraju) for node_id in component}
+    for src, dst in g.edges():
+        assert component_of[src] <= component_of[dst]
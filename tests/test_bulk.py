@@ -0,0 +1,71 @@
+import pytest
+
+from diktyonphi import DuplicatePolicy, Graph, GraphType
+
+
+def test_add_nodes_from_ids_and_pairs():
+    g = Graph(GraphType.DIRECTED)
+    added = g.add_nodes_from(["a", ("b", {"color": 1}), "c"], attrs={"color": None})
+    assert added == 3
+    assert g.node("a")["color"] is None
+    assert g.node("b")["color"] == 1
+    # общий attrs копируется, а не делится между узлами
+    g.node("a")["color"] = 5
+    assert g.node("c")["color"] is None
+
+
+def test_add_nodes_from_raise_leaves_graph_unchanged():
+    g = Graph(GraphType.DIRECTED)
+    g.add_node("b")
+    with pytest.raises(ValueError):
+        g.add_nodes_from(["a", "b"])
+    assert "a" not in g
+    with pytest.raises(ValueError):
+        g.add_nodes_from(["x", "x"])
+    assert "x" not in g
+
+
+def test_add_nodes_from_skip_and_overwrite():
+    g = Graph(GraphType.DIRECTED)
+    g.add_node("a", {"color": 1})
+    assert g.add_nodes_from([("a", {"color": 2}), "b"], on_duplicate=DuplicatePolicy.SKIP) == 1
+    assert g.node("a")["color"] == 1
+    assert g.add_nodes_from([("a", {"color": 3})], on_duplicate=DuplicatePolicy.OVERWRITE) == 0
+    assert g.node("a")["color"] == 3
+    # голый id не затирает атрибуты, и общий attrs достаётся только новым узлам
+    assert g.add_nodes_from(["a", "c"], {"color": 0}, on_duplicate=DuplicatePolicy.OVERWRITE) == 1
+    assert (g.node("a")["color"], g.node("c")["color"]) == (3, 0)
+
+
+@pytest.mark.parametrize("type", list(GraphType))
+def test_add_edges_from_creates_nodes(type):
+    g = Graph(type)
+    assert g.add_edges_from([("a", "b"), ("b", "c", {"weight": 2}), ("c", "c", None)]) == 3
+    assert len(g) == 3
+    assert g.stats.edge_count == 3
+    assert g.node("b").to("c")["weight"] == 2
+    if type == GraphType.UNDIRECTED:
+        assert g.node("c").to("b")["weight"] == 2
+
+
+def test_add_edges_from_raise_leaves_graph_unchanged():
+    g = Graph(GraphType.UNDIRECTED)
+    g.add_edge("a", "b")
+    with pytest.raises(ValueError):
+        g.add_edges_from([("c", "d"), ("b", "a")])
+    assert "c" not in g
+    with pytest.raises(ValueError):
+        g.add_edges_from([("x", "y"), ("y", "x")])
+    assert "x" not in g
+
+
+def test_add_edges_from_skip_and_overwrite():
+    g = Graph(GraphType.DIRECTED)
+    g.add_edge("a", "b", {"weight": 1})
+    assert g.add_edges_from([("a", "b", {"weight": 2}), ("b", "a")], on_duplicate=DuplicatePolicy.SKIP) == 1
+    assert g.node("a").to("b")["weight"] == 1
+    assert g.add_edges_from([("a", "b", {"weight": 3})], on_duplicate=DuplicatePolicy.OVERWRITE) == 0
+    assert g.node("a").to("b")["weight"] == 3
+    assert g.add_edges_from([("a", "b"), ("a", "b", None), ("b", "c")], on_duplicate=DuplicatePolicy.OVERWRITE) == 1
+    assert g.node("a").to("b")["weight"] == 3
+    assert g.stats.edge_count == 3
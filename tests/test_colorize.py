@@ -0,0 +1,141 @@
+import pytest
+
+from colorize import ColorGraph, ColoringStrategy, check_coloring_conflicts, colorize, validate_coloring
+from compact import CompactGraph
+from diktyonphi import GraphType
+
+
+@pytest.mark.parametrize("strategy", list(ColoringStrategy))
+def test_strategies_give_valid_coloring(random_graph, strategy):
+    g = random_graph(150, 600, cls=ColorGraph, node_attrs={"color": None}, loops=False)
+    count = colorize(g, strategy, quiet=True)
+    report = validate_coloring(g)
+    assert report.valid
+    assert count == report.num_colors
+    assert count <= g.stats.max_degree + 1
+
+
+@pytest.mark.parametrize("strategy", list(ColoringStrategy))
+def test_directed_edges_count_both_ways(strategy):
+    g = ColorGraph(GraphType.DIRECTED)
+    # colorize ждёт, что атрибут "color" уже есть у всех узлов
+    g.add_nodes_from(["a", "b", "c"], {"color": None})
+    g.add_edge("a", "b")
+    g.add_edge("c", "b")
+    g.add_edge("c", "a")
+    assert colorize(g, strategy, quiet=True) == 3
+
+
+def test_dsatur_two_colours_on_even_cycle():
+    g = ColorGraph(GraphType.UNDIRECTED)
+    g.add_nodes_from(range(10), {"color": None})
+    for i in range(10):
+        g.add_edge(i, (i + 1) % 10)
+    assert colorize(g, ColoringStrategy.DSATUR, quiet=True) == 2
+
+
+def test_progress_reaches_total(random_graph):
+    g = random_graph(250, 500, cls=ColorGraph, node_attrs={"color": None}, loops=False)
+    calls = []
+    colorize(g, ColoringStrategy.SMALLEST_LAST, quiet=True, progress=lambda done, total: calls.append(done))
+    assert calls[-1] == 250
+    assert calls == sorted(calls)
+
+
+def test_colours_past_palette_are_distinct():
+    names = [ColorGraph.color_name(i) for i in range(200)]
+    assert names[:len(ColorGraph.PALETTE)] == ColorGraph.PALETTE
+    assert len(set(names)) == len(names)
+
+
+def test_dot_fill_colour():
+    g = ColorGraph(GraphType.UNDIRECTED)
+    g.add_node("a", {"color": 1})
+    g.add_node("b", {"color": 9})
+    g.add_node("c", {"color": "black"})
+    assert g.dot_node_attrs(g.node("a"))["fillcolor"] == "red"
+    assert g.dot_node_attrs(g.node("b"))["fillcolor"] == ColorGraph.color_name(9)
+    assert g.dot_node_attrs(g.node("c"))["fillcolor"] == "black"
+
+
+@pytest.fixture
+def coloured_graph(build_graph):
+    """Already coloured ColorGraph (``colors``: node id -> colour) with nothing left to recolour."""
+    def build(colors, edges):
+        g = build_graph(edges, GraphType.UNDIRECTED, {node_id: {"color": color} for node_id, color in colors.items()},
+                        ColorGraph)
+        g._dirty.clear()
+        return g
+    return build
+
+
+def test_recolor_takes_colour_already_in_graph(coloured_graph):
+    # цвет 2 уже есть (треугольник), поэтому соседей новой вершины не трогаем
+    g = coloured_graph({"a": 0, "b": 1, "p": 0, "q": 1, "r": 2},
+                       [("p", "q"), ("q", "r"), ("r", "p")])
+    g.add_node("n", {"color": None})
+    g.add_edge("n", "a")
+    g.add_edge("n", "b")
+    assert g.recolor() == {"n"}
+    assert g.node("n")["color"] == 2
+    assert g.node("a")["color"] == 0
+    assert validate_coloring(g).valid
+
+
+def test_recolor_swaps_kempe_chain_instead_of_new_colour(coloured_graph):
+    g = coloured_graph({"a": 0, "c": 1, "b": 1, "d": 0}, [("a", "c"), ("b", "d")])
+    g.add_node("n", {"color": None})
+    g.add_edge("n", "a")
+    g.add_edge("n", "b")
+    assert g.recolor() == {"n", "a", "c"}
+    assert validate_coloring(g).num_colors == 2
+    assert validate_coloring(g).valid
+
+
+def test_recolor_fixes_conflict_of_new_edge(coloured_graph):
+    g = coloured_graph({"a": 0, "b": 1, "c": 0}, [("a", "b")])
+    g.add_edge("b", "c")
+    g.add_edge("a", "c")
+    changed = g.recolor()
+    assert validate_coloring(g).valid
+    assert changed and changed <= {"a", "b", "c"}
+    assert g.recolor() == set()
+
+
+VALIDATE_COLORS = {"a": 0, "b": 1, "c": 0, "d": 2, "e": None, "f": None}
+VALIDATE_EDGES = [("a", "b"), ("b", "c"), ("c", "a"), ("d", "d"), ("e", "f"), ("a", "d")]
+
+
+def test_validate_reports_conflicts_and_histogram(coloured_graph, numpy_mode):
+    g = coloured_graph(VALIDATE_COLORS, VALIDATE_EDGES)
+    report = validate_coloring(g)
+    assert not report.valid
+    # непокрашенные узлы (None) считаются одним цветом
+    assert sorted(report.conflicts) == [("a", "c"), ("d", "d"), ("e", "f")]
+    assert report.histogram == {0: 2, 1: 1, 2: 1, None: 2}
+    assert report.num_colors == 4
+    assert sorted(validate_coloring(g, ignore_self_loops=True).conflicts) == [("a", "c"), ("e", "f")]
+    first = validate_coloring(g, early_exit=True)
+    assert not first.valid and first.conflicts and set(first.conflicts) <= set(report.conflicts)
+
+
+def test_validate_sees_changes_after_cached_run(coloured_graph, numpy_mode):
+    g = coloured_graph({"a": 0, "b": 1, "c": 0}, [("a", "b"), ("b", "c")])
+    assert validate_coloring(g).valid
+    # смена цвета не меняет структуру - кэш рёбер остаётся, цвета читаются заново
+    g.node("b")["color"] = 0
+    assert sorted(validate_coloring(g).conflicts) == [("a", "b"), ("b", "c")]
+    g.node("b")["color"] = 1
+    g.add_edge("a", "c")
+    assert validate_coloring(g).conflicts == [("a", "c")]
+    g.remove_edge("a", "c")
+    assert validate_coloring(g).valid
+
+
+def test_validate_compact_int_column(coloured_graph, numpy_mode):
+    g = CompactGraph.from_graph(coloured_graph({"a": 0, "b": 1, "c": 0, "d": 2}, [("a", "b"), ("b", "c"), ("c", "a")]))
+    assert g._node_store.columns["color"].typecode == "q"
+    report = validate_coloring(g)
+    assert report.conflicts == [("a", "c")]
+    assert report.histogram == {0: 2, 1: 1, 2: 1}
+    assert check_coloring_conflicts(g) is False
@@ -0,0 +1,58 @@
+import pytest
+
+from compact import CompactGraph
+from diktyonphi import GraphType
+
+
+NODES = {"a": {"color": 1}}
+EDGES = [("a", "c", {"weight": 2}), ("a", "b", {"weight": 1.5}), ("b", "c"), ("c", "c", {"type": "loop"})]
+
+
+def test_csr_layout_directed(build_graph):
+    c = build_graph(EDGES, nodes=NODES).compact()
+    assert list(c._ids) == ["a", "c", "b"]
+    # строки отсортированы по индексу соседа
+    assert list(c._offsets) == [0, 2, 3, 4]
+    assert list(c._targets) == [1, 2, 1, 1]
+
+
+def test_csr_layout_undirected_shares_records(build_graph):
+    c = build_graph(EDGES, GraphType.UNDIRECTED, NODES).compact()
+    # каждое направление лежит в targets, петля - один раз
+    assert len(c._targets) == 2 * 3 + 1
+    assert c._edge_store.size == 4
+    assert c.node("a").to("c")["weight"] == c.node("c").to("a")["weight"] == 2
+
+
+@pytest.mark.parametrize("type", list(GraphType))
+def test_same_api_as_graph(build_graph, type):
+    g = build_graph(EDGES, type, NODES)
+    c = g.compact()
+    assert isinstance(c, CompactGraph)
+    assert len(c) == len(g)
+    assert sorted(c.edges(data="weight"), key=str) == sorted(g.edges(data="weight"), key=str)
+    for node in g:
+        assert set(c.node(node.id).neighbor_ids) == set(node.neighbor_ids)
+        assert set(c.node(node.id).predecessor_ids) == set(node.predecessor_ids)
+    assert c.node("a")["color"] == 1
+    assert c.stats.edge_count == g.stats.edge_count
+
+
+def test_structure_is_read_only_attributes_are_not(build_graph):
+    c = build_graph(EDGES, nodes=NODES).compact()
+    with pytest.raises(TypeError):
+        c.add_edge("a", "b")
+    with pytest.raises(TypeError):
+        c.remove_node("a")
+    c.node("a").to("b")["weight"] = 10
+    assert c.node("a").to("b")["weight"] == 10
+
+
+@pytest.mark.parametrize("type", list(GraphType))
+def test_thaw_round_trip(build_graph, type):
+    g = build_graph(EDGES, type, NODES)
+    back = g.compact().thaw()
+    assert sorted(back.edges(data=True), key=str) == sorted(g.edges(data=True), key=str)
+    assert back.node("a")["color"] == 1
+    back.add_edge("b", "d")
+    assert "d" in back
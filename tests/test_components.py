@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from compact import CompactGraph
+from components import (UnionFind, bfs_distances, bfs_layers, component_labels, connected_components, is_connected,
+                        is_reachable, number_of_components, reachable_from, same_component,
+                        weakly_connected_components)
+from diktyonphi import GraphType
+
+EDGES = [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("e", "f"), ("g", "g")]
+
+
+def _components(g):
+    """Reference: components by a plain DFS with directions ignored."""
+    adjacent = {node_id: set() for node_id in g.node_ids()}
+    for src, dst in g.edges():
+        adjacent[src].add(dst)
+        adjacent[dst].add(src)
+    seen, result = set(), []
+    for node_id in g.node_ids():
+        if node_id in seen:
+            continue
+        seen.add(node_id)
+        stack, component = [node_id], []
+        while stack:
+            u = stack.pop()
+            component.append(u)
+            for v in adjacent[u] - seen:
+                seen.add(v)
+                stack.append(v)
+        result.append(sorted(component))
+    return result
+
+
+def test_union_find():
+    uf = UnionFind(6)
+    assert uf.union(0, 1) and uf.union(2, 3) and uf.union(1, 3)
+    assert not uf.union(0, 2)
+    assert uf.connected(0, 3) and not uf.connected(0, 4)
+    assert (uf.count, len(uf)) == (3, 6)
+
+
+def test_components_in_node_order(build_graph):
+    g = build_graph(EDGES, GraphType.UNDIRECTED)
+    assert connected_components(g) == [["a", "b", "c", "d"], ["e", "f"], ["g"]]
+    assert component_labels(g) == {"a": 0, "b": 0, "c": 0, "d": 0, "e": 1, "f": 1, "g": 2}
+    assert number_of_components(g) == 3 and not is_connected(g)
+    assert same_component(g, "a", "d") and not same_component(g, "a", "e")
+    with pytest.raises(KeyError):
+        same_component(g, "a", "x")
+    with pytest.raises(ValueError):
+        connected_components(build_graph(EDGES))
+
+
+@pytest.mark.parametrize("type", list(GraphType))
+@pytest.mark.parametrize("seed", range(3))
+def test_components_after_removals(random_graph, type, seed):
+    g = random_graph(200, 180, type, seed)
+    rnd = random.Random(seed)
+    assert sorted(map(sorted, weakly_connected_components(g))) == sorted(_components(g))
+    for step in range(40):
+        # метки закэшированы до изменения структуры - каждое удаление должно их сбросить
+        component_labels(g)
+        if step % 4 == 0:
+            g.remove_node(rnd.choice(list(g.node_ids())))
+        else:
+            edges = list(g.edges())
+            if edges:
+                g.remove_edge(*rnd.choice(edges))
+        expected = _components(g)
+        assert sorted(map(sorted, weakly_connected_components(g))) == sorted(expected)
+        assert number_of_components(g) == len(expected)
+    assert sorted(map(sorted, weakly_connected_components(CompactGraph.from_graph(g)))) == sorted(expected)
+
+
+def test_bfs_layers(build_graph):
+    g = build_graph(EDGES)
+    assert list(bfs_layers(g, ["a"])) == [["a"], ["b"], ["c"], ["d"]]
+    assert list(bfs_layers(g, ["d", "e", "d"], reverse=True)) == [["d", "e"], ["c"], ["b"], ["a"]]
+    assert bfs_distances(g, ["a"], max_depth=2) == {"a": 0, "b": 1, "c": 2}
+    assert reachable_from(g, ["c", "e"]) == {"a", "b", "c", "d", "e", "f"}
+    with pytest.raises(KeyError):
+        list(bfs_layers(g, ["x"]))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_reachability_after_changes(random_graph, seed):
+    g = random_graph(60, 70, GraphType.DIRECTED, seed)
+    rnd = random.Random(seed)
+    for step in range(30):
+        src = rnd.choice(list(g.node_ids()))
+        reach = reachable_from(g, [src])
+        assert all(is_reachable(g, src, dst) == (dst in reach) for dst in g.node_ids())
+        # закэшированные множества достижимости должны устареть после изменения
+        a, b = rnd.choice(list(g.node_ids())), rnd.choice(list(g.node_ids()))
+        if g.node(a).is_edge_to(b):
+            g.remove_edge(a, b)
+        else:
+            g.add_edge(a, b)
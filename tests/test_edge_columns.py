@@ -0,0 +1,83 @@
+import pytest
+
+from diiktyonphi import vsechny_zaporne_hrany, zvysit_vahy_hran
+from diktyonphi import GraphType
+
+EDGES = [("a", "b", {"weight": 1}), ("b", "c", {"weight": -2}), ("c", "a", {"weight": 3}), ("c", "c", {"weight": 4})]
+
+
+@pytest.mark.parametrize("type", list(GraphType))
+def test_columns_keep_edge_access(build_graph, type):
+    g = build_graph(EDGES, type)
+    columns = g.edge_columns
+    assert columns.size == 4
+    assert columns["weight"]._column.typecode == "q"
+    g.node("a").to("b")["weight"] = 10
+    assert columns["weight"].values().tolist()[0] == 10
+    if type == GraphType.UNDIRECTED:
+        # у неориентированного ребра одна запись на оба направления
+        assert g.node("b").to("a")["weight"] == 10
+    g.add_edge("b", "d", {"weight": 7})
+    assert columns["weight"].sum() == 10 - 2 + 3 + 4 + 7
+    g.remove_edge("a", "b")
+    # записи в том же направлении, что и edges()
+    assert sorted(columns.edges()) == sorted(g.edges())
+    assert columns.size == 4
+    assert sorted(w for _, _, w in g.edges(data="weight")) == [-2, 3, 4, 7]
+
+
+def test_inplace_arithmetic(build_graph, numpy_mode):
+    g = build_graph(EDGES)
+    weight = g.edge_columns["weight"]
+    version = g._version
+    g.edge_columns["weight"] += 1
+    assert g._version > version
+    assert [w for _, _, w in g.edges(data="weight")] == [2, -1, 4, 5]
+    assert g.edge_columns["weight"]._column.typecode == "q"
+    g.edge_columns["weight"] *= 2
+    g.edge_columns["weight"] -= g.edge_columns["weight"]
+    assert weight.sum() == 0
+    # int-колонка после прибавления float становится float-колонкой
+    g.edge_columns["weight"] += 0.5
+    assert g.edge_columns["weight"]._column.typecode == "d"
+    assert g.node("c").to("c")["weight"] == 0.5
+    g.edge_columns["weight"] /= 2
+    assert [w for _, _, w in g.edges(data="weight")] == [0.25] * 4
+
+
+def test_masks(build_graph, numpy_mode):
+    g = build_graph(EDGES)
+    weight = g.edge_columns["weight"]
+    mask = weight > 1
+    assert weight.edges(mask) == [("c", "a"), ("c", "c")]
+    assert weight.select(mask) == [3, 4]
+    weight.assign(mask, 0)
+    assert [w for _, _, w in g.edges(data="weight")] == [1, -2, 0, 0]
+    assert weight.edges(weight == 0) == [("c", "a"), ("c", "c")]
+    assert (weight.min(), weight.max(), weight.count()) == (-2, 1, 4)
+
+
+def test_missing_values(build_graph, numpy_mode):
+    g = build_graph(EDGES + [("a", "d", {"type": "road"})])
+    weight = g.edge_columns["weight"]
+    # ребро без веса не участвует ни в арифметике, ни в сравнениях
+    weight += 1
+    assert g.node("a").to("d")._attrs.get("weight") is None
+    assert weight.edges(weight > 0) == [("a", "b"), ("c", "a"), ("c", "c")]
+    assert (weight.sum(), weight.count(), weight.mean()) == (10, 4, 2.5)
+    g.edge_columns["type"] = "rail"
+    assert [t for _, _, t in g.edges(data="type")] == ["rail"] * 5
+    del g.edge_columns["type"]
+    assert "type" not in g.node("a").to("d")._attrs
+
+
+@pytest.mark.parametrize("columns", [False, True])
+@pytest.mark.parametrize("type", list(GraphType))
+def test_weight_helpers(build_graph, columns, type):
+    g = build_graph(EDGES + [("a", "d")], type)
+    if columns:
+        g.edge_columns  # переводит атрибуты рёбер в колонки
+    zvysit_vahy_hran(g, 1)
+    assert sorted((w for _, _, w in g.edges(data="weight") if w is not None)) == [-1, 2, 4, 5]
+    assert vsechny_zaporne_hrany(g) == [("b", "c", -1)]
+    assert (g._edge_columns is not None) == columns
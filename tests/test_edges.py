@@ -0,0 +1,53 @@
+import pytest
+
+from diiktyonphi import najdi_hrany_podle_typu, pocet_hran, vsechny_zaporne_hrany, zvysit_vahy_hran
+from diktyonphi import GraphType
+
+EDGES = [("a", "b", {"weight": -1, "type": "road"}), ("b", "c", {"weight": 2}), ("c", "a", {"type": "rail"}),
+         ("c", "c", {"weight": -3, "type": "road"})]
+
+
+@pytest.mark.parametrize("type", list(GraphType))
+def test_each_edge_once(build_graph, type):
+    g = build_graph(EDGES, type)
+    edges = list(g.edges())
+    # неориентированное ребро (и петля) - один раз, с конца, который раньше в порядке узлов
+    if type == GraphType.DIRECTED:
+        assert edges == [("a", "b"), ("b", "c"), ("c", "a"), ("c", "c")]
+    else:
+        assert edges == [("a", "b"), ("a", "c"), ("b", "c"), ("c", "c")]
+    assert len(edges) == pocet_hran(g) == g.stats.edge_count
+
+
+def test_data_variants(build_graph):
+    g = build_graph(EDGES)
+    assert list(g.edges(data="weight")) == [("a", "b", -1), ("b", "c", 2), ("c", "a", None), ("c", "c", -3)]
+    assert [w for _, _, w in g.edges(data="weight", default=0)] == [-1, 2, 0, -3]
+    src, dst, attrs = next(g.edges(data=True))
+    # словарь самого графа, не копия
+    assert attrs is g.node("a")._neighbors["b"]
+
+
+def test_edge_without_attrs_is_read_only_until_written(build_graph):
+    g = build_graph([("a", "b"), ("b", "c")])
+    _, _, attrs = next(g.edges(data=True))
+    with pytest.raises(TypeError):
+        attrs["weight"] = 1
+    g.node("a").to("b")["weight"] = 1
+    assert list(g.edges(data="weight")) == [("a", "b", 1), ("b", "c", None)]
+
+
+@pytest.mark.parametrize("type", list(GraphType))
+def test_edge_helpers(build_graph, type):
+    g = build_graph(EDGES, type)
+    assert sorted(vsechny_zaporne_hrany(g)) == [("a", "b", -1), ("c", "c", -3)]
+    assert sorted(najdi_hrany_podle_typu(g, "road")) == [("a", "b"), ("c", "c")]
+    version = g._version
+    # неориентированное ребро увеличивается один раз, рёбра без веса не трогаем
+    zvysit_vahy_hran(g, 10)
+    assert sorted(w for _, _, w in g.edges(data="weight") if w is not None) == [7, 9, 12]
+    if type == GraphType.UNDIRECTED:
+        assert g.node("b").to("a")["weight"] == 9
+    assert "weight" not in g.node("c").to("a")._attrs
+    assert g._version > version
+    assert vsechny_zaporne_hrany(g) == []
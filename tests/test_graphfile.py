@@ -0,0 +1,84 @@
+import pickle
+
+import pytest
+
+from diktyonphi import GraphType
+from graphfile import MappedGraph, open_graph, save_graph
+
+NODES = {"a": {"label": "A", "size": 1}, "b": {"size": 2}, "c": {"label": None, "size": 3}, "d": None}
+EDGES = [("a", "b", {"weight": 1.5, "type": "road"}), ("b", "c", {"weight": 2.0}), ("c", "a", {"weight": -1.0}),
+         ("c", "c", {"weight": 0.0, "type": ("loop", 1)})]
+
+
+def _dump(g):
+    """Nodes with attributes and edges with attributes as plain data (CSR keeps neighbours in its own order)."""
+    nodes = {node.id: dict(node._attrs) for node in g}
+    edges = sorted(((src, dst, dict(attrs)) for src, dst, attrs in g.edges(data=True)), key=lambda e: e[:2])
+    return nodes, edges
+
+
+@pytest.fixture
+def saved(tmp_path):
+    def save(g):
+        path = str(tmp_path / "graph.bin")
+        save_graph(g, path)
+        return open_graph(path)
+    return save
+
+
+@pytest.mark.parametrize("type", list(GraphType))
+def test_str_ids_round_trip(build_graph, saved, type):
+    g = build_graph(EDGES, type, NODES)
+    m = saved(g)
+    assert isinstance(m, MappedGraph)
+    # "type" и "size" (у "d" нет значения) - не числовые колонки, они лежат в файле пиклом
+    assert m._edge_store.columns["type"].typecode is None
+    assert m._node_store.columns["size"].typecode is None
+    assert m._edge_store.columns["weight"].typecode == "d"
+    assert _dump(m) == _dump(g)
+    assert len(m) == 4 and "d" in m and "x" not in m
+    assert m.stats.edge_count == g.stats.edge_count
+    assert sorted(m.node("a").neighbor_ids) == sorted(g.node("a").neighbor_ids)
+    if type == GraphType.DIRECTED:
+        assert sorted(m.node("c").predecessor_ids) == ["b", "c"]
+    with pytest.raises(KeyError):
+        m.node("x")
+
+
+def test_int_ids_round_trip(random_graph, saved):
+    g = random_graph(300, 900, GraphType.DIRECTED, node_attrs={"color": 0})
+    for i, node in enumerate(g):
+        node["color"] = i % 7
+    m = saved(g)
+    assert _dump(m) == _dump(g)
+    assert list(m.node_ids()) == list(g.node_ids())
+    assert all(sorted(m.node(i).predecessor_ids) == sorted(g.node(i).predecessor_ids) for i in range(300))
+
+
+def test_writes_stay_in_memory(build_graph, saved, tmp_path):
+    m = saved(build_graph(EDGES, GraphType.DIRECTED, NODES))
+    m.node("a")["size"] = 10
+    m.node("b")["label"] = "B"
+    m.node("a").to("b")["weight"] = 9.0
+    assert (m.node("a")["size"], m.node("b")["label"], m.node("a").to("b")["weight"]) == (10, "B", 9.0)
+    # сам файл не меняется
+    again = open_graph(str(tmp_path / "graph.bin"))
+    assert (again.node("a")["size"], again.node("a").to("b")["weight"]) == (1, 1.5)
+    assert "label" not in again.node("b")._attrs
+
+
+def test_pickle_sends_path(build_graph, saved):
+    m = saved(build_graph(EDGES, GraphType.DIRECTED, NODES))
+    data = pickle.dumps(m)
+    assert len(data) < 200
+    assert _dump(pickle.loads(data)) == _dump(m)
+
+
+def test_rejects_bad_input(build_graph, tmp_path):
+    g = build_graph([("a", 1)])
+    with pytest.raises(TypeError):
+        save_graph(g, str(tmp_path / "mixed.bin"))
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        open_graph(str(path))
@@ -0,0 +1,121 @@
+import pytest
+
+from diktyonphi import Graph, GraphType
+from diktyonphii import pocet_hran_typu
+
+
+NODES = {"a": {"color": "red"}, "b": {"color": "blue"}, "c": {"color": "red"}}
+EDGES = [("a", "b", {"type": "critical", "weight": 3}), ("b", "c", {"type": "normal", "weight": 1}),
+         ("c", "a", {"type": "critical", "weight": 2})]
+
+
+def test_node_index_follows_updates(build_graph):
+    g = build_graph(EDGES, nodes=NODES)
+    index = g.create_index("node", "color")
+    assert index.find("red") == ["a", "c"]
+    g.node("a")["color"] = "blue"
+    g.add_node("d", {"color": "red"})
+    assert index.find("red") == ["c", "d"]
+    assert index.count("blue") == 2
+    assert g.create_index("node", "color") is index
+
+
+def test_edge_index_find_and_range(build_graph):
+    g = build_graph(EDGES, nodes=NODES)
+    types = g.create_index("edge", "type")
+    weights = g.create_index("edge", "weight")
+    assert types.find("critical") == [("a", "b"), ("c", "a")]
+    assert weights.range(2, 3) == [("c", "a"), ("a", "b")]
+    assert weights.range(1, 3, inclusive=False) == [("b", "c"), ("c", "a")]
+    g.node("b").to("c")["type"] = "critical"
+    assert types.count("critical") == 3
+
+
+def test_shared_attribute_dict_keeps_edges_apart():
+    # один и тот же словарь у двух рёбер - это всё равно два разных ребра
+    g = Graph(GraphType.DIRECTED)
+    attrs = {"type": "critical"}
+    g.add_edge("a", "b", attrs)
+    g.add_edge("b", "c", attrs)
+    index = g.create_index("edge", "type")
+    assert index.find("critical") == [("a", "b"), ("b", "c")]
+    g.add_edge("c", "d", {"type": "critical"})
+    assert index.count("critical") == 3
+
+
+def test_undirected_edge_counted_once(build_graph):
+    g = build_graph(EDGES, GraphType.UNDIRECTED, NODES)
+    assert pocet_hran_typu(g, "critical") == 2
+    index = g.create_index("edge", "type")
+    assert pocet_hran_typu(g, "critical") == 2
+    # запись через другой конец - то же самое ребро
+    g.node("b").to("a")["type"] = "normal"
+    assert index.find("normal") == [("b", "c"), ("a", "b")]
+    assert index.count("critical") == 1
+
+
+def test_update_through_views(build_graph):
+    g = build_graph(EDGES, nodes=NODES)
+    index = g.create_index("edge", "type")
+    g.reverse_view().node("b").to("a")["type"] = "normal"
+    assert index.find("critical") == [("c", "a")]
+    g.undirected_view().node("a").to("c")["type"] = "normal"
+    assert index.count("normal") == 3
+    assert index.count("critical") == 0
+
+
+def test_removed_edges_and_nodes_leave_index(build_graph):
+    g = build_graph(EDGES, nodes=NODES)
+    types = g.create_index("edge", "type")
+    colors = g.create_index("node", "color")
+    g.remove_edge("a", "b")
+    assert types.find("critical") == [("c", "a")]
+    g.remove_node("c")
+    assert len(types) == 0
+    assert colors.find("red") == ["a"]
+    # новое ребро на месте удалённого индексируется заново
+    g.add_edge("a", "b", {"type": "normal"})
+    assert types.find("normal") == [("a", "b")]
+
+
+def test_index_updated_after_snapshot_copy(build_graph):
+    g = build_graph(EDGES, nodes=NODES)
+    index = g.create_index("edge", "type")
+    snap = g.snapshot()
+    g.node("a").to("b")["type"] = "normal"
+    g.remove_edge("c", "a")
+    assert index.find("normal") == [("b", "c"), ("a", "b")]
+    assert index.count("critical") == 0
+    assert snap.node("a").to("b")["type"] == "critical"
+
+
+def test_unhashable_values_and_drop(build_graph):
+    g = build_graph(EDGES, nodes=NODES)
+    index = g.create_index("node", "color")
+    g.node("a")["color"] = ["red"]
+    assert index.find("red") == ["c"]
+    g.drop_index("node", "color")
+    assert g.get_index("node", "color") is None
+    with pytest.raises(KeyError):
+        g.drop_index("node", "color")
+    with pytest.raises(ValueError):
+        g.create_index("graph", "color")
+
+
+def test_range_skips_none_and_unordered_values():
+    # {"color": None} - обычное начальное состояние перед раскраской
+    g = Graph(GraphType.UNDIRECTED)
+    g.add_nodes_from(["a", "b", "c", "d"], {"color": None})
+    index = g.create_index("node", "color")
+    g.node("a")["color"] = 2
+    g.node("b")["color"] = 0
+    assert index.range(0, 1) == ["b"]
+    assert index.range() == ["b", "a"]
+    g.node("c")["color"] = "red"
+    assert index.range() == ["b", "a"]
+    assert index.find("red") == ["c"] and index.find(None) == ["d"]
+    g.node("d")["color"] = 1
+    g.node("c")["color"] = 3
+    assert index.range(1) == ["d", "a", "c"]
+    with pytest.raises(TypeError):
+        index.range("a", "z")
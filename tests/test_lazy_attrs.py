@@ -0,0 +1,64 @@
+import pytest
+
+from diktyonphi import _NO_ATTRS, Edge, GraphType, Node
+
+EDGES = [("a", "b"), ("b", "c", {"weight": 2}), ("c", "a")]
+
+
+def test_no_instance_dict(build_graph):
+    g = build_graph(EDGES)
+    for obj in (g.node("a"), g.node("a").to("b")):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.color = "red"
+    assert "__dict__" not in Node.__slots__ and "__dict__" not in Edge.__slots__
+
+
+def test_attribute_less_records_share_empty_mapping(build_graph):
+    g = build_graph(EDGES, nodes={"d": {"label": "D"}})
+    assert all(g.node(node_id)._attrs is _NO_ATTRS for node_id in "abc")
+    assert g.node("a")._neighbors["b"] is _NO_ATTRS and g.node("b")._predecessors["a"] is _NO_ATTRS
+    assert g.node("b")._neighbors["c"] is not _NO_ATTRS
+    # чтение работает как у пустого словаря
+    assert len(g.node("a")._attrs) == 0 and "x" not in g.node("a")._attrs
+    with pytest.raises(KeyError):
+        g.node("a")["x"]
+    with pytest.raises(TypeError):
+        _NO_ATTRS["x"] = 1
+
+
+def test_node_write_allocates_own_dict(build_graph):
+    g = build_graph(EDGES)
+    g.node("a")["color"] = 1
+    assert g.node("a")._attrs == {"color": 1}
+    assert g.node("b")._attrs is _NO_ATTRS
+    assert not _NO_ATTRS
+
+
+@pytest.mark.parametrize("type", list(GraphType))
+def test_edge_write_allocates_one_record(build_graph, type):
+    g = build_graph(EDGES, type)
+    g.node("a").to("b")["weight"] = 5
+    own = g.node("a")._neighbors["b"]
+    assert own == {"weight": 5}
+    # тот же словарь на другом конце: в обратном индексе или у неориентированного соседа
+    assert (g.node("b")._predecessors["a"] if type == GraphType.DIRECTED else g.node("b")._neighbors["a"]) is own
+    assert g.node("c")._neighbors["a"] is _NO_ATTRS
+    assert not _NO_ATTRS
+
+
+def test_write_through_views_lands_in_graph(build_graph):
+    g = build_graph(EDGES)
+    # ребро b -> a обращённого view - это ребро a -> b исходного графа
+    g.reverse_view().node("b").to("a")["weight"] = 7
+    assert g.node("a").to("b")["weight"] == 7
+    g.subgraph_view(["a", "c"]).node("c")["label"] = "C"
+    assert g.node("c")["label"] == "C"
+    assert g.node("b")._attrs is _NO_ATTRS
+    assert not _NO_ATTRS
+
+
+def test_thaw_keeps_empty_records_shared(build_graph):
+    g = build_graph(EDGES).compact().thaw()
+    assert g.node("a")._attrs is _NO_ATTRS and g.node("a")._neighbors["b"] is _NO_ATTRS
+    assert g.node("b").to("c")["weight"] == 2
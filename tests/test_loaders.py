@@ -0,0 +1,126 @@
+import io
+import json
+
+import pytest
+
+from colorize import ColorGraph, load_preprocessing
+from diktyonphi import GraphType
+from loaders import (_iter_json_object, _parse_value, load_adjacency_json, load_adjacency_jsonl, load_edge_csv,
+                     load_graph)
+
+NEIGHBOURS = {
+    "Česko": ["Německo", "Polsko", "Rakousko", "Slovensko"],
+    "Německo": ["Česko", "Polsko", "Rakousko"],
+    "Polsko": ["Česko", "Německo", "Slovensko", "Ukrajina"],
+    "Rakousko": ["Česko", "Německo", "Slovensko"],
+    "Slovensko": ["Česko", "Polsko", "Rakousko"],
+}
+
+
+def edge_set(g):
+    return {frozenset(edge) for edge in g.edges()}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1 << 20])
+def test_iter_json_object_across_chunk_boundaries(chunk_size):
+    data = {"a": [1, 2.5, -30], "b": {"nested": [True, None]}, "long key ☃": "x" * 50, "n": 12345678}
+    text = json.dumps(data, ensure_ascii=False, indent=1)
+    assert dict(_iter_json_object(io.StringIO(text), chunk_size)) == data
+
+
+@pytest.mark.parametrize("text", ["[1, 2]", '{"a" 1}', '{"a": 1 "b": 2}'])
+def test_iter_json_object_rejects_malformed(text):
+    with pytest.raises(ValueError):
+        list(_iter_json_object(io.StringIO(text), 3))
+
+
+def test_iter_json_object_empty():
+    assert list(_iter_json_object(io.StringIO(" { } "))) == []
+
+
+def test_adjacency_json_matches_eager_loader(tmp_path):
+    path = tmp_path / "sousede.json"
+    path.write_text(json.dumps(NEIGHBOURS, ensure_ascii=False), encoding="utf-8")
+    g = load_adjacency_json(str(path))
+    data = load_preprocessing(str(path))
+    # Ukrajina не узел файла -> ребро отбрасывается, как в load_preprocessing
+    assert set(g.node_ids()) == set(data)
+    assert edge_set(g) == {frozenset((a, b)) for a, nbrs in data.items() for b in nbrs}
+    assert g.stats.edge_count == 8
+    # узлы в порядке файла, как у make_graph(load_preprocessing(...))
+    assert list(g.node_ids()) == list(data)
+    assert "Ukrajina" not in g
+
+
+def test_adjacency_json_forward_references(tmp_path):
+    # соседи, объявленные позже, и сосед, который так и не объявлен
+    path = tmp_path / "dopredu.json"
+    path.write_text(json.dumps({"a": ["b", "c", "x"], "b": ["c"], "c": []}), encoding="utf-8")
+    g = load_adjacency_json(str(path), node_attrs={"color": None})
+    assert list(g.node_ids()) == ["a", "b", "c"]
+    assert edge_set(g) == {frozenset("ab"), frozenset("ac"), frozenset("bc")}
+    assert all(node["color"] is None for node in g)
+
+
+def test_adjacency_json_fills_given_graph_with_node_attrs(tmp_path):
+    path = tmp_path / "sousede.json"
+    path.write_text(json.dumps(NEIGHBOURS), encoding="utf-8")
+    progress = []
+    g = load_adjacency_json(str(path), ColorGraph(GraphType.UNDIRECTED), {"color": None},
+                            progress=lambda done, total: progress.append((done, total)))
+    assert isinstance(g, ColorGraph)
+    assert all(node["color"] is None for node in g)
+    g.node("Česko")["color"] = 1
+    assert g.node("Polsko")["color"] is None
+    # файл читается дважды (узлы, потом рёбра) -> total вдвое больше размера
+    assert progress and progress[-1][0] == progress[-1][1] == 2 * path.stat().st_size
+    assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+
+
+def test_adjacency_jsonl(tmp_path):
+    path = tmp_path / "sousede.jsonl"
+    lines = [json.dumps({k: v}) if i % 2 else json.dumps([k, v]) for i, (k, v) in enumerate(NEIGHBOURS.items())]
+    path.write_text("\n".join(lines) + "\n\n", encoding="utf-8")
+    assert edge_set(load_adjacency_jsonl(str(path))) == edge_set(load_graph(str(tmp_path / "sousede.jsonl")))
+    assert load_adjacency_jsonl(str(path)).stats.edge_count == 8
+    path.write_text('"just a string"\n', encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_adjacency_jsonl(str(path))
+
+
+def test_edge_csv(tmp_path):
+    path = tmp_path / "hrany.csv"
+    path.write_text("src,dst,weight,type\na,b,1,road\nb,c,2.5,rail\nb,a,7,road\n\n", encoding="utf-8")
+    g = load_edge_csv(str(path))
+    assert g.stats.edge_count == 2
+    # повтор ребра b-a пропускается, остаются первые атрибуты
+    assert g.node("a").to("b")["weight"] == 1
+    assert g.node("b").to("c")["weight"] == 2.5
+    assert g.node("b").to("c")["type"] == "rail"
+
+
+def test_edge_tsv_without_header(tmp_path):
+    path = tmp_path / "hrany.tsv"
+    path.write_text("a\tb\tx\n", encoding="utf-8")
+    g = load_graph(str(path), header=False)
+    assert g.node("a").to("b")["col2"] == "x"
+
+
+def test_load_graph_unknown_extension(tmp_path):
+    with pytest.raises(ValueError):
+        load_graph(str(tmp_path / "graf.xml"))
+
+
+@pytest.mark.parametrize("text, value", [("12", 12), ("-3", -3), ("+4", 4), ("2.5", 2.5), ("1e3", 1000.0),
+                                         (".5", 0.5), ("1_000", "1_000"), (" 5", " 5"), ("5 ", "5 "),
+                                         ("nan", "nan"), ("inf", "inf"), ("0x10", "0x10"), ("", "")])
+def test_parse_value(text, value):
+    assert _parse_value(text) == value
+    assert type(_parse_value(text)) is type(value)
+
+
+def test_edge_csv_short_row(tmp_path):
+    path = tmp_path / "hrany.csv"
+    path.write_text("src,dst\na,b\nc\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="Line 3"):
+        load_edge_csv(str(path))
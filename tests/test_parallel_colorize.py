@@ -0,0 +1,66 @@
+import pytest
+
+import parallel_colorize
+from colorize import ColorGraph, validate_coloring
+from diktyonphi import Graph, GraphType
+from parallel_colorize import colorize_parallel
+
+
+def max_degree(g):
+    # степень без учёта направления и петель
+    return max((len(set(g.node(i).all_neighbor_ids) - {i}) for i in g.node_ids()), default=0)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("type", [GraphType.UNDIRECTED, GraphType.DIRECTED])
+def test_coloring_is_valid(random_graph, workers, type):
+    g = random_graph(200, 800, type)
+    count = colorize_parallel(g, workers=workers, seed=1)
+    report = validate_coloring(g, ignore_self_loops=True)
+    assert report.valid
+    assert count == report.num_colors
+    assert count <= max_degree(g) + 1
+
+
+def test_same_seed_same_result(random_graph):
+    g1 = random_graph(100, 300)
+    g2 = random_graph(100, 300)
+    colorize_parallel(g1, workers=1, seed=7)
+    colorize_parallel(g2, workers=2, seed=7)
+    assert [g1.node(i)["color"] for i in g1.node_ids()] == [g2.node(i)["color"] for i in g2.node_ids()]
+
+
+def test_self_loops_are_skipped():
+    g = Graph(GraphType.DIRECTED)
+    g.add_edge("a", "a")
+    g.add_edge("a", "b")
+    g.add_edge("b", "a")
+    assert colorize_parallel(g, workers=1, seed=0) == 2
+    assert g.node("a")["color"] != g.node("b")["color"]
+
+
+def test_empty_graph():
+    assert colorize_parallel(Graph(GraphType.UNDIRECTED), workers=2) == 0
+
+
+def test_shared_arrays_released_in_process(random_graph, monkeypatch):
+    colorize_parallel(random_graph(50, 100), workers=1, seed=0)
+    assert parallel_colorize._shared is None
+
+    def fail(start, end):
+        raise ValueError("round failed")
+
+    monkeypatch.setattr(parallel_colorize, "_color_round", fail)
+    with pytest.raises(ValueError):
+        colorize_parallel(random_graph(50, 100), workers=1, seed=0)
+    assert parallel_colorize._shared is None
+
+
+def test_color_graph_has_nothing_to_recolor(random_graph):
+    g = random_graph(80, 200, cls=ColorGraph, node_attrs={"color": None}, loops=False)
+    assert g._dirty
+    colorize_parallel(g, workers=1, seed=3)
+    colors = {node_id: g.node(node_id)["color"] for node_id in g.node_ids()}
+    assert not g._dirty
+    assert g.recolor() == set()
+    assert {node_id: g.node(node_id)["color"] for node_id in g.node_ids()} == colors
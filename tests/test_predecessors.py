@@ -0,0 +1,54 @@
+import pytest
+
+from diktyonphi import DuplicatePolicy, GraphType
+
+EDGES = [("a", "b", {"weight": 1}), ("a", "c"), ("b", "c"), ("c", "a"), ("c", "c")]
+# без c -> a: в неориентированном графе это то же ребро, что a - c
+UNDIRECTED_EDGES = [edge for edge in EDGES if edge[:2] != ("c", "a")]
+
+
+def test_in_edges_of_directed_graph(build_graph):
+    g = build_graph(EDGES)
+    assert list(g.node("c").predecessor_ids) == ["a", "b", "c"]
+    assert g.node("c").in_degree == 3
+    assert g.node("a").in_degree == 1
+    assert [node.id for node in g.node("b").predecessor_nodes] == ["a"]
+    # атрибуты входящего ребра - тот же словарь, что у исходящего
+    assert g.node("b")._predecessors["a"] is g.node("a")._neighbors["b"]
+
+
+def test_all_neighbor_ids_once_each(build_graph):
+    g = build_graph(EDGES)
+    # сначала исходящие, потом входящие, которых нет среди исходящих
+    assert list(g.node("a").all_neighbor_ids) == ["b", "c"]
+    assert list(g.node("b").all_neighbor_ids) == ["c", "a"]
+    assert list(g.node("c").all_neighbor_ids) == ["a", "c", "b"]
+
+
+def test_undirected_predecessors_are_neighbours(build_graph):
+    g = build_graph(UNDIRECTED_EDGES, GraphType.UNDIRECTED)
+    node = g.node("c")
+    assert node._predecessors is node._neighbors
+    assert sorted(node.predecessor_ids) == ["a", "b", "c"]
+    assert node.in_degree == node.out_degree == 3
+
+
+def test_index_follows_overwrite_and_removal(build_graph):
+    g = build_graph(EDGES)
+    g.add_edges_from([("a", "b", {"weight": 5})], on_duplicate=DuplicatePolicy.OVERWRITE)
+    assert g.node("b").in_degree == 1
+    assert g.node("b")._predecessors["a"]["weight"] == 5
+    g.remove_edge("a", "c")
+    assert list(g.node("c").predecessor_ids) == ["b", "c"]
+    g.remove_node("c")
+    assert g.node("a").in_degree == 0
+    assert list(g.node("a").all_neighbor_ids) == ["b"]
+
+
+@pytest.mark.parametrize("type", list(GraphType))
+def test_compact_keeps_in_edges(build_graph, type):
+    g = build_graph(EDGES if type == GraphType.DIRECTED else UNDIRECTED_EDGES, type)
+    c = g.compact()
+    for node in g:
+        assert sorted(c.node(node.id).predecessor_ids) == sorted(node.predecessor_ids)
+        assert c.node(node.id).in_degree == node.in_degree
@@ -0,0 +1,89 @@
+import pytest
+
+from diktyonphi import GraphType
+
+
+EDGES = [("a", "b", {"weight": 1}), ("b", "c", {"weight": 2}), ("c", "a", {"weight": 3}),
+         ("b", "b", {"weight": 4})]
+
+
+def test_remove_edge_directed(build_graph):
+    g = build_graph(EDGES)
+    g.remove_edge("a", "b")
+    assert not g.node("a").is_edge_to("b")
+    assert "a" in g and "b" in g
+    assert list(g.node("b").predecessor_ids) == ["b"]
+    assert g.node("b").in_degree == 1
+    assert g.stats.edge_count == 3
+    with pytest.raises(ValueError):
+        g.remove_edge("a", "b")
+    with pytest.raises(ValueError):
+        g.remove_edge("x", "b")
+
+
+def test_remove_edge_undirected_either_end(build_graph):
+    g = build_graph(EDGES, GraphType.UNDIRECTED)
+    g.remove_edge("b", "a")
+    assert not g.node("a").is_edge_to("b")
+    assert not g.node("b").is_edge_to("a")
+    g.remove_edge("b", "b")
+    assert list(g.node("b").neighbor_ids) == ["c"]
+    assert g.stats.edge_count == 2
+    assert sorted(g.stats.loops) == []
+
+
+@pytest.mark.parametrize("type", [GraphType.DIRECTED, GraphType.UNDIRECTED])
+def test_remove_node_drops_all_its_edges(build_graph, type):
+    g = build_graph(EDGES, type)
+    g.remove_node("b")
+    assert "b" not in g
+    assert sorted(g.edges()) in ([("c", "a")], [("a", "c")])
+    assert all("b" not in list(node.neighbor_ids) for node in g)
+    assert all("b" not in list(node.predecessor_ids) for node in g)
+    assert g.stats.edge_count == 1
+    assert g.stats.loops == {}
+    with pytest.raises(KeyError):
+        g.remove_node("b")
+
+
+def test_remove_edges_from(build_graph):
+    g = build_graph(EDGES)
+    assert g.remove_edges_from([("a", "b"), ("c", "a", {"weight": 3})]) == 2
+    assert g.stats.edge_count == 2
+    # ошибка в пачке - граф не меняется
+    with pytest.raises(ValueError):
+        g.remove_edges_from([("b", "c"), ("a", "b")])
+    assert g.node("b").is_edge_to("c")
+    assert g.remove_edges_from([("b", "c"), ("a", "b"), ("b", "c")], missing_ok=True) == 1
+    # можно передать сами g.edges()
+    assert g.remove_edges_from(g.edges()) == 1
+    assert g.stats.edge_count == 0
+
+
+def test_remove_edges_from_undirected_pair_once(build_graph):
+    g = build_graph(EDGES, GraphType.UNDIRECTED)
+    with pytest.raises(ValueError):
+        g.remove_edges_from([("a", "b"), ("b", "a")])
+    assert g.remove_edges_from([("a", "b"), ("b", "a")], missing_ok=True) == 1
+
+
+def test_removal_with_edge_columns(build_graph):
+    g = build_graph(EDGES)
+    g.edge_columns["weight"] += 10
+    g.remove_edge("a", "b")
+    g.remove_node("c")
+    assert g.edge_columns.size == 1
+    assert g.node("b").to("b")["weight"] == 14
+    g.add_edge("a", "b", {"weight": 5})
+    assert g.edge_columns["weight"].sum() == 19
+
+
+def test_stale_edge_after_removal(build_graph):
+    g = build_graph(EDGES)
+    g.edge_columns
+    edge = g.node("a").to("b")
+    g.remove_edge("a", "b")
+    # запись удалённого ребра не должна указывать на чужое ребро
+    with pytest.raises(TypeError):
+        edge["weight"] = 100
+    assert sorted(w for _, _, w in g.edges(data="weight")) == [2, 3, 4]
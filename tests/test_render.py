@@ -0,0 +1,124 @@
+import asyncio
+import io
+import subprocess
+import sys
+
+import pytest
+
+from diktyonphi import Graph
+
+# вместо Graphviz - процесс, который возвращает свой stdin (cat)
+CAT = [sys.executable, "-c", "import sys; sys.stdout.buffer.write(sys.stdin.buffer.read())"]
+FAIL = [sys.executable, "-c", "import sys; sys.stdin.read(); sys.stderr.write('bad input'); sys.exit(3)"]
+# выходит, не прочитав вход
+EXIT = [sys.executable, "-c", "import sys; sys.exit(4)"]
+
+
+class BrokenGraph(Graph):
+    """Graph whose DOT generation fails in the middle."""
+
+    def dot_node_attrs(self, node, label_attr="label"):
+        if node.id == 500:
+            raise ValueError("broken node")
+        return super().dot_node_attrs(node, label_attr)
+
+
+def ring(n=1000):
+    """Edges of a directed cycle over ``0..n-1``."""
+    return [(i, (i + 1) % n, {"weight": i}) for i in range(n)]
+
+
+def test_write_dot_matches_to_dot(build_graph):
+    g = build_graph(ring())
+    out = io.StringIO()
+    g.write_dot(out)
+    assert out.getvalue() == g.to_dot() + "\n"
+    assert out.getvalue().startswith("digraph G {")
+
+
+def test_run_dot_streams_large_graph(build_graph):
+    # вывод больше буфера канала - не должно зависнуть
+    g = build_graph(ring(20000))
+    assert g._run_dot(CAT, capture=True).decode("utf-8") == g.to_dot() + "\n"
+
+
+def test_run_dot_reports_exit_code(build_graph):
+    with pytest.raises(RuntimeError, match="exit code 3: bad input"):
+        build_graph(ring())._run_dot(FAIL, capture=True)
+
+
+def test_run_dot_raises_generation_error(build_graph):
+    # обрезанный DOT не должен выдаваться за готовый результат
+    with pytest.raises(ValueError, match="broken node"):
+        build_graph(ring(), cls=BrokenGraph)._run_dot(CAT, capture=True)
+
+
+@pytest.mark.parametrize("args, cls, error", [(CAT, Graph, None), (EXIT, Graph, RuntimeError),
+                                              (CAT, BrokenGraph, ValueError)])
+def test_run_dot_closes_stdin(build_graph, monkeypatch, args, cls, error):
+    started = []
+    popen = subprocess.Popen
+
+    def record(*a, **kw):
+        started.append(popen(*a, **kw))
+        return started[-1]
+
+    monkeypatch.setattr(subprocess, "Popen", record)
+    g = build_graph(ring(20000), cls=cls)
+    if error is None:
+        g._run_dot(args, capture=True)
+    else:
+        with pytest.raises(error):
+            g._run_dot(args, capture=True)
+    assert started[0].stdin.closed
+
+
+def test_export_to_png_default_name(build_graph, monkeypatch, tmp_path):
+    monkeypatch.setattr(Graph, "render", lambda self, format: b"PNG")
+    monkeypatch.chdir(tmp_path)
+    build_graph(ring(3)).export_to_png()
+    assert (tmp_path / "graph.png").read_bytes() == b"PNG"
+
+
+def run_async(g, args, monkeypatch, timeout=None):
+    """Run g._run_dot_async and also return the started process."""
+    started = []
+    create = asyncio.create_subprocess_exec
+
+    async def record(*a, **kw):
+        process = await create(*a, **kw)
+        started.append(process)
+        return process
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", record)
+    try:
+        return asyncio.run(g._run_dot_async(args, timeout)), started[0]
+    except BaseException as e:
+        e.process = started[0]
+        raise
+
+
+def test_run_dot_async_streams_large_graph(build_graph, monkeypatch):
+    g = build_graph(ring(20000))
+    output, process = run_async(g, CAT, monkeypatch)
+    assert output.decode("utf-8") == g.to_dot() + "\n"
+    assert process.returncode == 0
+
+
+def test_run_dot_async_reports_exit_code(build_graph, monkeypatch):
+    with pytest.raises(RuntimeError, match="exit code 3: bad input"):
+        run_async(build_graph(ring()), FAIL, monkeypatch)
+
+
+def test_run_dot_async_kills_process_on_timeout(build_graph, monkeypatch):
+    sleep = [sys.executable, "-c", "import sys, time; sys.stdin.read(); time.sleep(30)"]
+    with pytest.raises(asyncio.TimeoutError) as info:
+        run_async(build_graph(ring()), sleep, monkeypatch, timeout=0.5)
+    # процесс убит и дождан, а не оставлен висеть
+    assert info.value.process.returncode is not None
+
+
+def test_run_dot_async_kills_process_on_generation_error(build_graph, monkeypatch):
+    with pytest.raises(ValueError, match="broken node") as info:
+        run_async(build_graph(ring(), cls=BrokenGraph), CAT, monkeypatch)
+    assert info.value.process.returncode is not None
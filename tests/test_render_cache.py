@@ -0,0 +1,58 @@
+import os
+
+from render_cache import RenderCache, render_key
+
+
+def key(n):
+    return render_key(f"digest{n}", "svg", "dot")
+
+
+def test_memory_lru_by_count_and_size():
+    cache = RenderCache(max_items=2, max_memory_bytes=100)
+    cache.put(key(1), b"a")
+    cache.put(key(2), b"b")
+    # обращение делает 1 самым свежим -> вытесняется 2
+    assert cache.get(key(1)) == b"a"
+    cache.put(key(3), b"c")
+    assert cache.get(key(2)) is None
+    assert cache.get(key(1)) == b"a"
+    cache.put(key(4), b"x" * 100)
+    assert cache.get(key(1)) is None and cache.get(key(3)) is None
+    # больше лимита в память не попадает совсем
+    cache.put(key(5), b"x" * 101)
+    assert cache.get(key(5)) is None
+    assert cache.get(key(4)) == b"x" * 100
+
+
+def test_disk_level_survives_memory_eviction(tmp_path):
+    cache = RenderCache(max_items=1, directory=str(tmp_path))
+    cache.put(key(1), b"one")
+    cache.put(key(2), b"two")
+    assert cache.get(key(1)) == b"one"
+    # новый кэш над тем же каталогом видит старые файлы
+    assert RenderCache(directory=str(tmp_path)).get(key(2)) == b"two"
+
+
+def test_disk_eviction_oldest_first(tmp_path):
+    cache = RenderCache(max_items=0, directory=str(tmp_path), max_disk_bytes=25)
+    for n in range(3):
+        cache.put(key(n), bytes(10))
+        os.utime(cache._path(key(n)), (1000 + n, 1000 + n))
+    # третий файл не влез -> удалён самый старый
+    assert cache.get(key(0)) is None
+    assert cache.get(key(1)) == bytes(10)
+    assert cache.get(key(2)) == bytes(10)
+    assert cache._disk_bytes == 20
+
+
+def test_foreign_files_are_never_removed(tmp_path):
+    foreign = ["notes.txt", "a" * 64, key(9)[:63] + ".render", "picture.png.tmp"]
+    for name in foreign:
+        (tmp_path / name).write_bytes(bytes(100))
+    cache = RenderCache(max_items=0, directory=str(tmp_path), max_disk_bytes=15)
+    assert cache._disk_bytes == 0
+    cache.put(key(1), bytes(10))
+    cache.put(key(2), bytes(10))
+    cache.clear()
+    assert sorted(os.listdir(tmp_path)) == sorted(foreign)
+    assert cache._disk_bytes == 0
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from compact import CompactGraph
+from diktyonphi import GraphType
+from shortest_paths import (astar_path, bellman_ford, dijkstra, find_negative_cycle, multi_source_dijkstra,
+                            shortest_path)
+
+EDGES = [("a", "b", {"weight": 4}), ("a", "c", {"weight": 1}), ("c", "b", {"weight": 2}),
+         ("b", "d", {"weight": 1}), ("c", "d", {"weight": 6}), ("d", "e"), ("f", "a", {"weight": 1})]
+
+
+def _weighted(random_graph, type, seed):
+    g = random_graph(80, 300, type, seed)
+    rnd = random.Random(seed)
+    for src, dst in list(g.edges()):
+        g.node(src).to(dst)["weight"] = rnd.randint(0, 9)
+    return g
+
+
+def test_known_distances(build_graph):
+    g = build_graph(EDGES)
+    dist, pred = dijkstra(g, "a")
+    # "f" недостижима, у "d" -> "e" вес по умолчанию 1
+    assert dist == {"a": 0, "b": 3, "c": 1, "d": 4, "e": 5}
+    assert pred == {"b": "c", "c": "a", "d": "b", "e": "d"}
+    assert shortest_path(g, "a", "e") == (5, ["a", "c", "b", "d", "e"])
+    assert shortest_path(g, "a", "e", default=10) == (14, ["a", "c", "b", "d", "e"])
+    assert multi_source_dijkstra(g, ["b", "c"])[0] == {"b": 0, "c": 0, "d": 1, "e": 2}
+    with pytest.raises(ValueError):
+        shortest_path(g, "a", "f")
+    with pytest.raises(KeyError):
+        dijkstra(g, "x")
+
+
+@pytest.mark.parametrize("type", list(GraphType))
+@pytest.mark.parametrize("seed", range(3))
+def test_algorithms_agree(random_graph, type, seed):
+    g = _weighted(random_graph, type, seed)
+    dist, _ = dijkstra(g, 0)
+    assert bellman_ford(g, 0)[0] == dist
+    assert dijkstra(CompactGraph.from_graph(g), 0)[0] == dist
+    for target in list(dist)[::7]:
+        length, path = shortest_path(g, 0, target)
+        assert length == dist[target]
+        assert sum(g.node(u).to(v)["weight"] for u, v in zip(path, path[1:])) == length
+        # нулевая эвристика допустима, A* обязан найти ту же длину
+        assert astar_path(g, 0, target, lambda node_id, t: 0)[0] == length
+
+
+def test_weight_change_invalidates_cache(build_graph):
+    g = build_graph(EDGES)
+    assert dijkstra(g, "a", "d")[0]["d"] == 4
+    g.node("a").to("b")["weight"] = 0
+    assert dijkstra(g, "a", "d")[0]["d"] == 1
+
+
+def test_negative_weights(build_graph):
+    g = build_graph(EDGES)
+    g.node("c").to("d")["weight"] = -5
+    with pytest.raises(ValueError):
+        dijkstra(g, "a")
+    with pytest.raises(ValueError):
+        astar_path(g, "a", "d", lambda node_id, t: 0)
+    dist, pred = bellman_ford(g, "a")
+    assert dist["d"] == -4 and pred["d"] == "c"
+    assert find_negative_cycle(g) is None
+
+
+def test_negative_cycle(build_graph):
+    g = build_graph(EDGES)
+    g.add_edge("d", "a", {"weight": -5})
+    cycle = find_negative_cycle(g)
+    assert sorted(cycle) == ["a", "b", "c", "d"]
+    # цикл замкнут: есть ребро из каждого узла в следующий, сумма весов отрицательна
+    assert sum(g.node(u).to(v)["weight"] for u, v in zip(cycle, cycle[1:] + cycle[:1])) < 0
+    with pytest.raises(ValueError, match="negative cycle"):
+        bellman_ford(g, "a")
+    # из "e" цикл недостижим
+    assert bellman_ford(g, "e")[0] == {"e": 0}
+
+
+def test_undirected_negative_edge_is_cycle(build_graph):
+    g = build_graph([("a", "b", {"weight": 1}), ("b", "c", {"weight": -1})], GraphType.UNDIRECTED)
+    assert sorted(find_negative_cycle(g)) == ["b", "c"]
@@ -0,0 +1,146 @@
+import gc
+import threading
+
+import pytest
+
+from diktyonphi import Graph, GraphType
+
+
+NODES = {"a": {"color": "red"}}
+EDGES = [("a", "b", {"weight": 1}), ("b", "c", {"weight": 2}), ("c", "c", {"weight": 3})]
+
+
+def state(g):
+    return ({n.id: dict(n._attrs) for n in g},
+            sorted((s, d, w) for s, d, w in g.edges(data="weight")))
+
+
+@pytest.mark.parametrize("type", [GraphType.DIRECTED, GraphType.UNDIRECTED])
+def test_snapshot_isolated_from_changes(build_graph, type):
+    g = build_graph(EDGES, type, NODES)
+    snap = g.snapshot()
+    before = state(snap)
+    g.node("a")["color"] = "blue"
+    g.node("a").to("b")["weight"] = 10
+    g.add_edge("c", "d", {"weight": 4})
+    g.remove_edge("b", "c")
+    g.add_node("e")
+    assert state(snap) == before
+    assert len(snap) == 3
+    assert g.node("a")["color"] == "blue"
+    assert g.node("a").to("b")["weight"] == 10
+    assert "e" in g and "e" not in snap
+
+
+@pytest.mark.parametrize("type", [GraphType.DIRECTED, GraphType.UNDIRECTED])
+def test_remove_node_with_self_loop_under_snapshot(build_graph, type):
+    g = build_graph(EDGES, type, NODES)
+    snap = g.snapshot()
+    before = state(snap)
+    g.remove_node("c")
+    assert "c" not in g
+    assert sorted(g.edges()) == [("a", "b")]
+    assert g.stats.edge_count == 1
+    assert all("c" not in list(node.predecessor_ids) for node in g)
+    assert state(snap) == before
+    assert snap.node("c").is_edge_to("c")
+
+
+@pytest.mark.parametrize("type", [GraphType.DIRECTED, GraphType.UNDIRECTED])
+def test_shared_attrs_reused_after_snapshot(type):
+    # один и тот же словарь у ребра/узла до снимка и у добавленного после него
+    shared, node_attrs = {"weight": 1}, {"color": "red"}
+    g = Graph(type)
+    g.add_node("a", node_attrs)
+    g.add_edge("a", "b", shared)
+    snap = g.snapshot()
+    before = state(snap)
+    g.add_edge("c", "d", shared)
+    g.add_edges_from([("e", "f", shared)])
+    g.add_node("x", node_attrs)
+    g.add_nodes_from([("y", node_attrs)])
+    g.node("c").to("d")["weight"] = 2
+    g.node("e").to("f")["weight"] = 3
+    g.node("a").to("b")["weight"] = 4
+    g.node("x")["color"] = "blue"
+    g.node("y")["color"] = "green"
+    g.node("a")["color"] = "black"
+    assert state(snap) == before
+    assert [g.node(src).to(dst)["weight"] for src, dst in [("a", "b"), ("c", "d"), ("e", "f")]] == [4, 2, 3]
+    assert [g.node(node_id)["color"] for node_id in "axy"] == ["black", "blue", "green"]
+    if type == GraphType.UNDIRECTED:
+        assert g.node("d").to("c")["weight"] == 2
+
+
+def test_several_snapshots(build_graph):
+    g = build_graph(EDGES, nodes=NODES)
+    s1 = g.snapshot()
+    g.node("a").to("b")["weight"] = 5
+    s2 = g.snapshot()
+    g.node("a").to("b")["weight"] = 6
+    assert s1.node("a").to("b")["weight"] == 1
+    assert s2.node("a").to("b")["weight"] == 5
+    assert g.node("a").to("b")["weight"] == 6
+
+
+def test_snapshot_is_read_only(build_graph):
+    snap = build_graph(EDGES, nodes=NODES).snapshot()
+    with pytest.raises(TypeError):
+        snap.add_node("x")
+    with pytest.raises(TypeError):
+        snap.add_edge("a", "c")
+    with pytest.raises(TypeError):
+        snap.remove_node("a")
+    with pytest.raises(TypeError):
+        snap.node("a")["color"] = "blue"
+    with pytest.raises(TypeError):
+        snap.node("a").to("b")["weight"] = 2
+
+
+def test_copying_stops_when_snapshots_are_gone(build_graph):
+    g = build_graph(EDGES, nodes=NODES)
+    snap = g.snapshot()
+    g.node("a")["color"] = "blue"
+    assert g._cow_active() is not None
+    del snap
+    gc.collect()
+    assert g._cow_active() is None
+    g.node("a")["color"] = "green"
+    assert g.node("a")["color"] == "green"
+
+
+def test_snapshot_refused_with_edge_columns(build_graph):
+    g = build_graph(EDGES, nodes=NODES)
+    g.edge_columns
+    with pytest.raises(TypeError):
+        g.snapshot()
+
+
+def test_readers_in_threads():
+    g = Graph(GraphType.DIRECTED)
+    for i in range(50):
+        g.add_edge(i, i + 1, {"weight": i})
+    snap = g.snapshot()
+    expected = state(snap)
+    errors = []
+
+    def read():
+        try:
+            for _ in range(20):
+                assert state(snap) == expected
+        except BaseException as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for t in readers:
+        t.start()
+    # писатель меняет граф, пока читатели обходят снимок
+    for i in range(50):
+        g.node(i).to(i + 1)["weight"] = -i
+        g.add_edge(i + 1, i)
+        if i % 5 == 0:
+            g.remove_node(i)
+    for t in readers:
+        t.join()
+    assert errors == []
+    assert state(snap) == expected
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from diiktyonphi import uzly_s_nulovym_stupnem, uzly_se_smyckou
+from diktyonphi import DuplicatePolicy, Graph, GraphStats, GraphType
+
+
+def counters(stats):
+    return (stats.edge_count, stats.degree_sum, stats.histogram, set(stats.isolated), set(stats.loops),
+            stats.min_degree, stats.max_degree)
+
+
+def assert_matches_scan(g):
+    assert counters(g.stats) == counters(GraphStats.from_graph(g))
+
+
+def test_undirected_edges_and_self_loops():
+    g = Graph(GraphType.UNDIRECTED)
+    g.add_edge("a", "b")
+    g.add_edge("a", "a")
+    assert g.stats.edge_count == 2
+    # петля считается в степени один раз
+    assert g.stats.histogram == {2: 1, 1: 1}
+    assert list(g.stats.loops) == ["a"]
+    # перезапись существующего ребра (с любого конца) счётчики не меняет
+    g.add_edges_from([("b", "a", {"w": 1}), ("a", "a", {"w": 2})], on_duplicate=DuplicatePolicy.OVERWRITE)
+    assert g.stats.edge_count == 2
+    assert g.node("a").to("b")["w"] == 1
+    assert_matches_scan(g)
+    g.remove_edge("a", "a")
+    assert g.stats.loops == {} and g.stats.edge_count == 1
+    g.remove_edge("b", "a")
+    assert g.stats.edge_count == 0
+    assert g.stats.min_degree == g.stats.max_degree == 0
+    assert_matches_scan(g)
+    g.remove_node("a")
+    g.remove_node("b")
+    assert g.stats.min_degree is None and g.stats.histogram == {}
+
+
+def test_directed_out_degree():
+    g = Graph(GraphType.DIRECTED)
+    g.add_edge("a", "b")
+    g.add_edge("b", "a")
+    g.add_edge("c", "c")
+    assert g.stats.edge_count == 3
+    assert g.stats.degree_sum == 3
+    g.add_node("d")
+    assert list(g.stats.isolated) == ["d"]
+    assert g.stats.average_degree == 0.75
+    assert_matches_scan(g)
+
+
+@pytest.mark.parametrize("type", [GraphType.DIRECTED, GraphType.UNDIRECTED])
+def test_random_changes_match_full_scan(type):
+    rnd = random.Random(1)
+    g = Graph(type)
+    for step in range(600):
+        a, b = rnd.randrange(15), rnd.randrange(15)
+        action = rnd.random()
+        if action < 0.5:
+            g.add_edges_from([(a, b, {"step": step})], on_duplicate=DuplicatePolicy.OVERWRITE)
+        elif action < 0.8 and a in g and g.node(a).is_edge_to(b):
+            g.remove_edge(a, b)
+        elif a in g and action > 0.95:
+            g.remove_node(a)
+        assert_matches_scan(g)
+
+
+def test_helpers_report_node_order():
+    g = Graph(GraphType.DIRECTED)
+    g.add_nodes_from(["a", "b", "c"])
+    g.add_edge("a", "a")
+    g.add_edge("c", "c")
+    g.add_edge("b", "b")
+    g.add_edge("c", "a")
+    # c становится слепым концом раньше, чем a, а петли появляются в порядке a, c, b
+    g.remove_edge("c", "c")
+    g.remove_edge("c", "a")
+    g.remove_edge("a", "a")
+    assert uzly_s_nulovym_stupnem(g) == ["a", "c"]
+    g.add_edge("c", "c")
+    g.add_edge("a", "a")
+    assert uzly_se_smyckou(g) == ["a", "b", "c"]
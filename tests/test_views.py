@@ -0,0 +1,69 @@
+import pytest
+
+from diktyonphi import Graph, GraphType
+from views import GraphView
+
+
+NODES = {"a": {"color": "red"}}
+EDGES = [("a", "b", {"weight": 1}), ("b", "c", {"weight": 2}), ("c", "a", {"weight": 3}), ("a", "c", {"weight": 4})]
+
+
+def test_reverse_view(build_graph):
+    g = build_graph(EDGES, nodes=NODES)
+    r = g.reverse_view()
+    assert sorted(r.edges()) == [("a", "c"), ("b", "a"), ("c", "a"), ("c", "b")]
+    assert r.node("b").to("a")["weight"] == 1
+    assert list(r.node("a").predecessor_ids) == ["b", "c"]
+    # изменения графа сразу видны в представлении
+    g.add_edge("c", "d")
+    assert r.node("d").is_edge_to("c")
+
+
+def test_undirected_view(build_graph):
+    g = build_graph(EDGES, nodes=NODES)
+    u = g.undirected_view()
+    assert u.type == GraphType.UNDIRECTED
+    assert sorted(u.node("a").neighbor_ids) == ["b", "c"]
+    assert sorted(u.node("c").neighbor_ids) == ["a", "b"]
+    # a->c и c->a - одно ребро
+    assert len(list(u.edges())) == 3
+    assert u.stats.edge_count == 3
+
+
+def test_subgraph_view(build_graph):
+    g = build_graph(EDGES, nodes=NODES)
+    s = g.subgraph_view(nodes=["a", "c"], edge_filter=lambda src, dst, attrs: attrs["weight"] > 3)
+    assert "b" not in s
+    assert list(s.edges()) == [("a", "c")]
+    with pytest.raises(KeyError):
+        s.node("b")
+
+
+@pytest.mark.parametrize("make_view", [Graph.reverse_view, Graph.undirected_view,
+                                       Graph.subgraph_view, Graph.snapshot])
+def test_views_are_read_only(build_graph, make_view):
+    g = build_graph(EDGES, nodes=NODES)
+    v = make_view(g)
+    with pytest.raises(TypeError, match="read-only"):
+        v.add_node("x")
+    with pytest.raises(TypeError, match="read-only"):
+        v.add_edge("a", "b")
+    with pytest.raises(TypeError, match="read-only"):
+        v.add_nodes_from(["x", "y"])
+    with pytest.raises(TypeError, match="read-only"):
+        v.add_edges_from([("x", "y")])
+    with pytest.raises(TypeError, match="read-only"):
+        v.remove_edge("a", "b")
+    with pytest.raises(TypeError, match="read-only"):
+        v.remove_node("a")
+    with pytest.raises(TypeError, match="read-only"):
+        v.remove_edges_from([("a", "b")])
+    assert "x" not in g and len(list(g.edges())) == 4
+
+
+def test_view_needs_make_node(build_graph):
+    class NoNodes(GraphView):
+        pass
+
+    with pytest.raises(TypeError):
+        NoNodes(build_graph(EDGES, nodes=NODES))
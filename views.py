@@ -0,0 +1,441 @@
+# Представления (views) графа: обёртки над существующим Graph без копирования узлов,
+# рёбер и атрибутов. Изменения исходного графа сразу видны через view.
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+from diktyonphi import DuplicatePolicy, Graph, GraphStats, GraphType, Node
+
+# node_filter(node_id, attrs) -> bool
+NodeFilter = Callable[[Hashable, Dict[str, Any]], bool]
+# edge_filter(src_id, dst_id, attrs) -> bool
+EdgeFilter = Callable[[Hashable, Hashable, Dict[str, Any]], bool]
+
+
+class _UnionNeighbors(Mapping):
+    """
+    ``Node._neighbors`` of a directed node seen as undirected: successors and
+    predecessors together, each neighbour once (attributes of the outgoing
+    edge win when both directions exist).
+    """
+    __slots__ = ("_out", "_in")
+
+    def __init__(self, out: Mapping, in_: Mapping):
+        self._out = out
+        self._in = in_
+
+    def __getitem__(self, node_id: Hashable) -> Dict[str, Any]:
+        if node_id in self._out:
+            return self._out[node_id]
+        return self._in[node_id]
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._out or node_id in self._in
+
+    def __iter__(self) -> Iterator[Hashable]:
+        yield from self._out
+        for node_id in self._in:
+            if node_id not in self._out:
+                yield node_id
+
+    def __len__(self) -> int:
+        return len(self._out) + sum(1 for node_id in self._in if node_id not in self._out)
+
+
+class _FilteredNeighbors(Mapping):
+    """
+    ``Node._neighbors`` (or ``_predecessors`` when ``reverse``) of a node of
+    SubgraphView: only neighbours inside the view over edges the filter keeps.
+    """
+    __slots__ = ("_view", "_node_id", "_neighbors", "_reverse")
+
+    def __init__(self, view: 'SubgraphView', node_id: Hashable, neighbors: Mapping, reverse: bool):
+        self._view = view
+        self._node_id = node_id
+        self._neighbors = neighbors
+        self._reverse = reverse
+
+    def _keeps(self, node_id: Hashable, attrs: Dict[str, Any]) -> bool:
+        if node_id not in self._view:
+            return False
+        edge_filter = self._view._edge_filter
+        if edge_filter is None:
+            return True
+        if self._reverse:
+            return edge_filter(node_id, self._node_id, attrs)
+        return edge_filter(self._node_id, node_id, attrs)
+
+    def __getitem__(self, node_id: Hashable) -> Dict[str, Any]:
+        attrs = self._neighbors[node_id]
+        if not self._keeps(node_id, attrs):
+            raise KeyError(node_id)
+        return attrs
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._neighbors and self._keeps(node_id, self._neighbors[node_id])
+
+    def __iter__(self) -> Iterator[Hashable]:
+        for node_id, attrs in self._neighbors.items():
+            if self._keeps(node_id, attrs):
+                yield node_id
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class GraphView(Graph, ABC):
+    """
+    Read-only graph backed by another graph (base class of the views below).
+
+    Nodes are throwaway Node objects that share attribute dicts with the
+    underlying graph, so ``view.node(x)["color"] = 1`` changes the original.
+    Neighbour mappings are computed on the fly instead of being copied. The
+    structure can only be changed through the underlying graph.
+    """
+
+    def __init__(self, graph: Graph, type: Optional[GraphType] = None):
+        """
+        :param graph: The underlying graph (may be another view or a CompactGraph).
+        :param type: Graph type of the view, the type of ``graph`` by default.
+        """
+        # Graph.__init__ не вызываем: своих узлов и счётчиков версий у view нет
+        self.type = type if type is not None else graph.type
+        self._graph = graph
+        self._dot_cache: Optional[tuple] = None
+        self._init_caches()
+        # статистика view считается обходом (см. stats)
+        self._stats_cache: Optional[tuple] = None
+
+    # версии берём у исходного графа, так кэши DOT/картинок видят его изменения
+    @property
+    def _version(self) -> int:
+        return self._graph._version
+
+    @_version.setter
+    def _version(self, value: int) -> None:
+        self._graph._version = value
+
+    @property
+    def _structure_version(self) -> int:
+        return self._graph._structure_version
+
+    # индексы живут у исходного графа: Node/Edge.__setitem__ через view обновляют их там
+    @property
+    def _indexes(self) -> Dict[Tuple[str, str], Any]:
+        return self._graph._indexes
+
+    def create_index(self, kind: str, attr: str):
+        raise TypeError(f"{type(self).__name__} has no indexes of its own, use the underlying graph")
+
+    def get_index(self, kind: str, attr: str):
+        # индексы исходного графа не знают о фильтрах и направлении view
+        return None
+
+    def mark_modified(self) -> None:
+        self._graph.mark_modified()
+
+    @property
+    def _cow(self):
+        return self._graph._cow
+
+    # свой словарь атрибутов выделяет исходный граф, у узлов view он общий с ним
+    def _own_node_attrs(self, node: Node) -> Dict[str, Any]:
+        attrs = self._graph._own_node_attrs(self._graph.node(node.id))
+        # узел view одноразовый, ему можно просто подменить словарь
+        node._attrs = attrs
+        return attrs
+
+    def _base_edge(self, src_id: Hashable, dst_id: Hashable) -> Tuple[Hashable, Hashable]:
+        """The edge of the underlying graph that is the view's edge src -> dst."""
+        return src_id, dst_id
+
+    def _own_edge_attrs(self, src_id: Hashable, dst_id: Hashable) -> Dict[str, Any]:
+        return self._graph._own_edge_attrs(*self._base_edge(src_id, dst_id))
+
+    def _update_edge_index(self, src_id: Hashable, dst_id: Hashable, attr: str, val: Any) -> None:
+        # индексы исходного графа знают рёбра в его направлении
+        src_id, dst_id = self._base_edge(src_id, dst_id)
+        self._graph._update_edge_index(src_id, dst_id, attr, val)
+
+    @property
+    def stats(self) -> GraphStats:
+        """Statistics of the view; unlike Graph.stats they are counted by a scan, then reused until the graph changes."""
+        cached = self._stats_cache
+        if cached is None or cached[0] != self._structure_version:
+            cached = self._stats_cache = (self._structure_version, GraphStats.from_graph(self))
+        return cached[1]
+
+    @property
+    def edge_columns(self):
+        raise TypeError(f"{type(self).__name__} has no edge columns, use the underlying graph")
+
+    @property
+    def _edge_columns(self):
+        return None
+
+    @abstractmethod
+    def _make_node(self, base: Node) -> Node:
+        """Create the view's Node for a node of the underlying graph."""
+
+    def __contains__(self, node_id: Hashable) -> bool:
+        return node_id in self._graph
+
+    def __len__(self) -> int:
+        return len(self._graph)
+
+    def __iter__(self) -> Iterator[Node]:
+        return (self._make_node(self._graph.node(node_id)) for node_id in self.node_ids())
+
+    def node_ids(self) -> Iterator[Hashable]:
+        return self._graph.node_ids()
+
+    def node(self, node_id: Hashable) -> Node:
+        if node_id not in self:
+            raise KeyError(node_id)
+        return self._make_node(self._graph.node(node_id))
+
+    def edges(self, data: bool | str = False, default: Any = None) -> Iterator[tuple]:
+        """Iterate over all edges of the view, see Graph.edges()."""
+        done = set() if self.type == GraphType.UNDIRECTED else None
+        for node in self:
+            for dst_id, attrs in node._neighbors.items():
+                if done is not None and dst_id in done:
+                    continue
+                if data is False:
+                    yield (node.id, dst_id)
+                elif data is True:
+                    yield (node.id, dst_id, attrs)
+                else:
+                    yield (node.id, dst_id, attrs.get(data, default))
+            if done is not None:
+                done.add(node.id)
+
+    def dot_node_attrs(self, node: Node, label_attr: str = "label") -> Dict[str, Any]:
+        # стиль узлов как у исходного графа (например, заливка ColorGraph)
+        return self._graph.dot_node_attrs(node, label_attr)
+
+    def snapshot(self) -> Graph:
+        raise TypeError(f"{type(self).__name__} cannot be snapshotted, take a snapshot of the underlying graph")
+
+    def _read_only(self):
+        return TypeError(f"{type(self).__name__} is read-only, change the underlying graph instead")
+
+    def add_node(self, node_id: Hashable, attrs: Optional[Dict[str, Any]] = None) -> Node:
+        raise self._read_only()
+
+    def add_edge(self, src_id: Hashable, dst_id: Hashable, attrs: Optional[Dict[str, Any]] = None):
+        raise self._read_only()
+
+    def add_nodes_from(self, nodes: Iterable, attrs: Optional[Dict[str, Any]] = None,
+                       on_duplicate: DuplicatePolicy = DuplicatePolicy.RAISE) -> int:
+        raise self._read_only()
+
+    def add_edges_from(self, edges: Iterable[Tuple], on_duplicate: DuplicatePolicy = DuplicatePolicy.RAISE) -> int:
+        raise self._read_only()
+
+    def _create_node(self, node_id: Hashable, attrs: Optional[Dict[str, Any]] = None) -> Node:
+        raise self._read_only()
+
+    def _set_edge(self, src_id: Hashable, target_id: Hashable, attrs: Dict[str, Any]) -> None:
+        raise self._read_only()
+
+    def _put_edge(self, src_id: Hashable, target_id: Hashable, attrs: Dict[str, Any]) -> None:
+        raise self._read_only()
+
+    def remove_edge(self, src_id: Hashable, dst_id: Hashable) -> None:
+        raise self._read_only()
+
+    def remove_node(self, node_id: Hashable) -> None:
+        raise self._read_only()
+
+    def remove_edges_from(self, edges: Iterable[Tuple], missing_ok: bool = False) -> int:
+        raise self._read_only()
+
+    def _drop_edge(self, src_id: Hashable, target_id: Hashable) -> None:
+        raise self._read_only()
+
+    def _drop_node(self, node_id: Hashable) -> None:
+        raise self._read_only()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.type}, of {self._graph!r})"
+
+
+class ReversedView(GraphView):
+    """
+    The graph with every edge reversed (the transpose), in O(1) memory.
+
+    Successors of a node are the predecessors in the underlying graph and vice
+    versa. An undirected graph is its own reverse.
+    """
+
+    def _make_node(self, base: Node) -> Node:
+        node = Node(self, base.id, base._attrs)
+        node._neighbors = base._predecessors
+        node._predecessors = base._neighbors
+        return node
+
+    def _base_edge(self, src_id: Hashable, dst_id: Hashable) -> Tuple[Hashable, Hashable]:
+        # ребро view src -> dst - это ребро dst -> src исходного графа
+        return dst_id, src_id
+
+
+class UndirectedView(GraphView):
+    """
+    The graph with edge directions ignored.
+
+    For a directed graph the neighbours of a node are its successors and
+    predecessors; edges A->B and B->A become one edge (with the attributes of
+    the one seen from the first node in node order).
+    """
+
+    def __init__(self, graph: Graph):
+        super().__init__(graph, GraphType.UNDIRECTED)
+
+    def _make_node(self, base: Node) -> Node:
+        node = Node(self, base.id, base._attrs)
+        if base._predecessors is base._neighbors:
+            node._neighbors = base._neighbors
+        else:
+            node._neighbors = _UnionNeighbors(base._neighbors, base._predecessors)
+        node._predecessors = node._neighbors
+        return node
+
+    def _base_edge(self, src_id: Hashable, dst_id: Hashable) -> Tuple[Hashable, Hashable]:
+        # атрибуты берутся у исходящего ребра, если оно есть (см. _UnionNeighbors)
+        if self._graph.node(src_id).is_edge_to(dst_id):
+            return src_id, dst_id
+        return dst_id, src_id
+
+
+class SubgraphView(GraphView):
+    """
+    Part of the graph restricted to some nodes and/or edges.
+
+    A node belongs to the view if it is in ``nodes`` (when given) and passes
+    ``node_filter`` (when given); an edge belongs to it if both ends do and it
+    passes ``edge_filter``. Filters are evaluated on every access, so they see
+    the current attributes; keep them cheap. For an undirected graph
+    ``edge_filter`` may get the two ends in either order.
+    """
+
+    def __init__(self, graph: Graph, nodes: Optional[Iterable[Hashable]] = None,
+                 node_filter: Optional[NodeFilter] = None, edge_filter: Optional[EdgeFilter] = None):
+        """
+        :param graph: The underlying graph.
+        :param nodes: IDs of the nodes to keep (all nodes if None).
+        :param node_filter: Called as ``node_filter(node_id, attrs)``, False hides the node.
+        :param edge_filter: Called as ``edge_filter(src_id, dst_id, attrs)``, False hides the edge.
+        """
+        super().__init__(graph)
+        self._nodes_kept = None if nodes is None else set(nodes)
+        self._node_filter = node_filter
+        self._edge_filter = edge_filter
+
+    @property
+    def _structure_version(self) -> int:
+        # фильтры могут смотреть на атрибуты -> состав view меняется при любом изменении графа
+        return self._graph._version
+
+    def __contains__(self, node_id: Hashable) -> bool:
+        if self._nodes_kept is not None and node_id not in self._nodes_kept:
+            return False
+        if node_id not in self._graph:
+            return False
+        return self._node_filter is None or self._node_filter(node_id, self._graph.node(node_id)._attrs)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.node_ids())
+
+    def node_ids(self) -> Iterator[Hashable]:
+        ids = self._graph.node_ids() if self._nodes_kept is None else (
+            node_id for node_id in self._graph.node_ids() if node_id in self._nodes_kept)
+        if self._node_filter is None:
+            return ids
+        return (node_id for node_id in ids if self._node_filter(node_id, self._graph.node(node_id)._attrs))
+
+    def _make_node(self, base: Node) -> Node:
+        node = Node(self, base.id, base._attrs)
+        node._neighbors = _FilteredNeighbors(self, base.id, base._neighbors, False)
+        if base._predecessors is base._neighbors:
+            node._predecessors = node._neighbors
+        else:
+            node._predecessors = _FilteredNeighbors(self, base.id, base._predecessors, True)
+        return node
+
+
+class GraphSnapshot(GraphView):
+    """
+    Immutable state of a graph at the moment of ``Graph.snapshot()``.
+
+    Holds the graph's node dict and Node objects of that moment; the graph
+    copies whatever it changes afterwards instead of changing it in place, so
+    the snapshot can be read from any thread without locking. Nodes are
+    throwaway Node objects over the snapshot's dicts. Everything is read-only,
+    including attributes.
+    """
+
+    def __init__(self, graph: Graph):
+        """:param graph: The graph (use ``graph.snapshot()`` rather than this constructor)."""
+        super().__init__(graph)
+        self._frozen: Dict[Hashable, Node] = graph._nodes
+        self._frozen_version = graph._version
+        self._frozen_structure_version = graph._structure_version
+        self._edge_count = graph._stats.edge_count
+
+    @property
+    def _version(self) -> int:
+        return self._frozen_version
+
+    @property
+    def _structure_version(self) -> int:
+        return self._frozen_structure_version
+
+    @property
+    def _indexes(self) -> Dict[Tuple[str, str], Any]:
+        return {}
+
+    @property
+    def _cow(self):
+        # любая запись идёт через _own_*_attrs, а они запрещены
+        return True
+
+    def _own_node_attrs(self, node: Node) -> Dict[str, Any]:
+        raise self._read_only()
+
+    def _own_edge_attrs(self, src_id: Hashable, dst_id: Hashable) -> Dict[str, Any]:
+        raise self._read_only()
+
+    def mark_modified(self) -> None:
+        raise self._read_only()
+
+    def snapshot(self) -> Graph:
+        return self
+
+    def _read_only(self):
+        return TypeError("GraphSnapshot is read-only, change the graph and take a new snapshot")
+
+    def _make_node(self, base: Node) -> Node:
+        node = Node(self, base.id, base._attrs)
+        node._neighbors = base._neighbors
+        node._predecessors = base._predecessors
+        return node
+
+    def __contains__(self, node_id: Hashable) -> bool:
+        return node_id in self._frozen
+
+    def __len__(self) -> int:
+        return len(self._frozen)
+
+    def __iter__(self) -> Iterator[Node]:
+        return map(self._make_node, self._frozen.values())
+
+    def node_ids(self) -> Iterator[Hashable]:
+        return iter(self._frozen)
+
+    def node(self, node_id: Hashable) -> Node:
+        return self._make_node(self._frozen[node_id])
+
+    def __repr__(self):
+        return (f"GraphSnapshot({self.type}, nodes: {len(self._frozen)}, edges: {self._edge_count}, "
+                f"version: {self._frozen_version})")